@@ -11,6 +11,7 @@ This is the implementation of the OGN node defined in OgnCloth.ogn
 
 # Array or tuple values are accessed as numpy arrays so you probably need this import
 import math
+import hashlib
 
 import numpy as np
 import warp as wp
@@ -20,49 +21,100 @@ import omni.timeline
 
 from pxr import Usd, UsdGeom, Gf, Sdf
 
+# node modules may be imported before the extension starts up, init is a no-op if already initialized
+wp.init()
 
-# helper to get the transform from a bundle prim
-def read_transform_bundle(bundle):
 
-    timeline =  omni.timeline.get_timeline_interface()
-    time = timeline.get_current_time()*timeline.get_time_codes_per_seconds()
+# helper to get the transform from a bundle prim, the timeline interface
+# and the Xformable for each source prim path are cached on the node state
+def read_transform_bundle(context, bundle):
 
-    stage = omni.usd.get_context().get_stage()
     prim_path = bundle.attribute_by_name("sourcePrimPath").value
-    prim = UsdGeom.Xformable(stage.GetPrimAtPath(prim_path))
+    prim = context.xformables.get(prim_path)
+
+    if prim is None:
+        stage = omni.usd.get_context().get_stage()
+        prim = UsdGeom.Xformable(stage.GetPrimAtPath(prim_path))
+        context.xformables[prim_path] = prim
+
+    timeline = context.timeline
+    time = timeline.get_current_time()*timeline.get_time_codes_per_seconds()
 
     return prim.ComputeLocalToWorldTransform(time)
 
-# helper to read points from a bundle prim
+# helper to read points from a bundle prim, returns an (N,3) float32 ndarray
+# that aliases the attribute memory whenever the source is already float32
 def read_points_bundle(bundle):
-    return bundle.attribute_by_name("points").value
+    return np.asarray(bundle.attribute_by_name("points").value, dtype=np.float32).reshape(-1, 3)
 
 # helper to read indices from a bundle prim
 def read_indices_bundle(bundle):
     return bundle.attribute_by_name("faceVertexIndices").value
 
-# transform points from local space to world space given a mat44
+# helper to transform an array of points by a USD xform, note that
+# USD uses row-vectors so points are post-multiplied by the matrix,
+# computed in float32 to match the precision of the simulation
+def transform_points_host(xform, points):
+
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+
+    homog = np.empty((len(points), 4), dtype=np.float32)
+    homog[:,:3] = points
+    homog[:,3] = 1.0
+
+    world = homog@np.asarray(xform, dtype=np.float32)
+
+    # return a contiguous (N,3) array so it can be memcpy'd directly into Warp arrays
+    return np.ascontiguousarray(world[:,:3])
+
+# cloths with fewer particles than this are transformed back to local space on 
+# the host, where at small sizes a NumPy product is cheaper than a kernel launch
+host_transform_threshold = 2048
+
+# helper to compute the key a finalized sim model is cached under from its source geometry
+def hash_model_inputs(cloth_points, cloth_indices, collider_points, collider_indices, density):
+
+    h = hashlib.sha256()
+
+    for a in (cloth_points, cloth_indices, collider_points, collider_indices):
+        if (a is not None):
+            a = np.ascontiguousarray(a)
+            h.update(bytes(f"{a.dtype}{a.shape}", 'utf-8'))
+            h.update(a)
+        else:
+            h.update(b"None")
+
+    h.update(bytes(f"{density}", 'utf-8'))
+
+    return h.digest()
+
+# transform points by an affine xform stored as the top three rows of its matrix,
+# the xform is read from device memory so that launches can be replayed from a graph
 @wp.kernel
 def transform_points(src: wp.array(dtype=wp.vec3),
                      dest: wp.array(dtype=wp.vec3),
-                     xform: wp.mat44):
+                     xform: wp.array(dtype=wp.vec4)):
 
     tid = wp.tid()
 
+    r0 = xform[0]
+    r1 = xform[1]
+    r2 = xform[2]
+
     p = src[tid]
-    m = wp.transform_point(xform, p)
+    h = wp.vec4(p[0], p[1], p[2], 1.0)
 
-    dest[tid] = m
+    dest[tid] = wp.vec3(wp.dot(r0, h), wp.dot(r1, h), wp.dot(r2, h))
 
 
 
 # update mesh data given two sets of collider positions
-# computes velocities and transforms points to world-space
+# computes velocities and transforms points to world-space,
+# xforms[0:3] are the rows of the current affine transform, xforms[3:6] the previous
 @wp.kernel
 def transform_mesh(collider_current: wp.array(dtype=wp.vec3),
                    collider_previous: wp.array(dtype=wp.vec3),
-                   xform_current: wp.mat44,
-                   xform_previous: wp.mat44,
+                   xforms: wp.array(dtype=wp.vec4),
                    mesh_points: wp.array(dtype=wp.vec3),
                    mesh_velocities: wp.array(dtype=wp.vec3),
                    dt: float,
@@ -73,8 +125,11 @@ def transform_mesh(collider_current: wp.array(dtype=wp.vec3),
     local_p1 = collider_current[tid]
     local_p0 = collider_previous[tid]
 
-    world_p1 = wp.transform_point(xform_current, local_p1)
-    world_p0 = wp.transform_point(xform_previous, local_p0)
+    h1 = wp.vec4(local_p1[0], local_p1[1], local_p1[2], 1.0)
+    h0 = wp.vec4(local_p0[0], local_p0[1], local_p0[2], 1.0)
+
+    world_p1 = wp.vec3(wp.dot(xforms[0], h1), wp.dot(xforms[1], h1), wp.dot(xforms[2], h1))
+    world_p0 = wp.vec3(wp.dot(xforms[3], h0), wp.dot(xforms[4], h0), wp.dot(xforms[5], h0))
 
     p = world_p1*alpha + world_p0*(1.0-alpha)
     v = (world_p1-world_p0)/dt
@@ -83,33 +138,207 @@ def transform_mesh(collider_current: wp.array(dtype=wp.vec3),
     mesh_velocities[tid] = v
 
 
+# update collider world-space points and velocities and refit the BVH, all
+# launches read their inputs from device memory so this may be captured into a CUDA graph
+def update_collider(context, device):
+
+    alpha = 1.0#(i+1)/sim_substeps
+
+    wp.launch(
+        kernel=transform_mesh, 
+        dim=context.n_collider_verts, 
+        inputs=[context.collider_positions_current,
+                context.collider_positions_previous,
+                context.collider_xforms_device,
+                context.mesh.mesh.points,
+                context.mesh.mesh.velocities,
+                1.0/60.0,
+                alpha],
+                device=device)
+
+    # refit bvh
+    context.mesh.mesh.refit()
+
+
+# advance the simulation by one frame: collision detection, integration,
+# and transform back to local space, as above this may be captured into a CUDA graph
+def simulate(context, sim_substeps, device):
+
+    sim_dt = (1.0/60)/sim_substeps
+
+    # run collision detection once per-frame
+    wp.sim.collide(context.model, context.state_0)
+
+    for i in range(sim_substeps):
+
+        context.state_0.clear_forces()
+
+        context.integrator.simulate(
+            context.model, 
+            context.state_0, 
+            context.state_1, 
+            sim_dt)
+
+        (context.state_0, context.state_1) = (context.state_1, context.state_0)
+
+    # a replayed graph always reads the state it was captured with, so after an odd number 
+    # of substeps copy the result back into that state instead of leaving the states swapped
+    if (sim_substeps%2 == 1):
+
+        wp.copy(context.state_1.particle_q, context.state_0.particle_q)
+        wp.copy(context.state_1.particle_qd, context.state_0.particle_qd)
+
+        (context.state_0, context.state_1) = (context.state_1, context.state_0)
+
+    # transform cloth positions back to local space, small cloths do this on the host after readback
+    if (not context.host_transform):
+
+        wp.launch(kernel=transform_points, 
+                  dim=context.n_particles, 
+                  inputs=[context.state_0.particle_q, 
+                          context.positions_device, 
+                          context.cloth_xform_device],
+                  device=device)
+
+
+# graph variants of the above, records the step on first use and replays it after
+def update_collider_graph(context, device):
+
+    if (context.capture_collider == None):
+
+        wp.capture_begin()
+        update_collider(context, device)
+        context.capture_collider = wp.capture_end()
+
+    wp.capture_launch(context.capture_collider)
+
+
+def simulate_graph(context, sim_substeps, device):
+
+    if (context.capture == None):
+
+        wp.capture_begin()
+        simulate(context, sim_substeps, device)
+        context.capture = wp.capture_end()
+
+    wp.capture_launch(context.capture)
+
+
+# select the step functions once at import, graph capture requires a CUDA device
+if (wp.is_cuda_available()):
+    step_collider = update_collider_graph
+    step_simulation = simulate_graph
+else:
+    step_collider = update_collider
+    step_simulation = simulate
+
+
 class OgnClothState:
 
+    # fixed attribute layout, state is accessed many times per-frame so avoid per-instance dict lookups
+    __slots__ = ("timeline",
+                 "model",
+                 "state_0",
+                 "state_1",
+                 "mesh",
+                 "n_particles",
+                 "n_collider_verts",
+                 "integrator",
+                 "model_cache",
+                 "xformables",
+                 "collider_positions_current",
+                 "collider_positions_previous",
+                 "collider_points_host",
+                 "collider_points_host_np",
+                 "collider_xform",
+                 "collider_xforms_host",
+                 "collider_xforms_host_np",
+                 "collider_xforms_device",
+                 "cloth_xform_host",
+                 "cloth_xform_host_np",
+                 "cloth_xform_device",
+                 "positions_host",
+                 "positions_host_np",
+                 "positions_device",
+                 "host_transform",
+                 "positions_homog",
+                 "collider_points_synced",
+                 "collider_at_rest",
+                 "params",
+                 "time",
+                 "capture",
+                 "capture_collider")
+
     def __init__(self):
+        self.timeline = omni.timeline.get_timeline_interface()
+
+        # the integrator is stateless, and the last finalized (key, model, mesh) 
+        # is kept so that they may be re-used across resets
+        self.integrator = wp.sim.SemiImplicitIntegrator()
+        self.model_cache = None
+
         self.reset()
 
     def reset(self):
+
+        # release any recorded graphs, the slots are not yet set when called from __init__()
+        for capture in (getattr(self, "capture", None), getattr(self, "capture_collider", None)):
+            if (capture):
+                wp.capture_destroy(capture)
+
         self.model = None
         self.state_0 = None
         self.state_1 = None
         self.mesh = None
 
-        self.integrator = None
+        self.n_particles = 0
+        self.n_collider_verts = 0
+
+        # map from source prim path to UsdGeom.Xformable, reset since the stage may change
+        self.xformables = {}
         
         # local space copy of collider positions and velocities on the device
         self.collider_positions_current = None
         self.collider_positions_previous = None
 
+        # persistent host buffer (and ndarray view) the collider points are staged through
+        self.collider_points_host = None
+        self.collider_points_host_np = None
+
+        # collider xforms (current, previous) and cloth inverse xform stored as the
+        # top three matrix rows each, uploaded once per-frame from host staging buffers
+        self.collider_xform = None
+        self.collider_xforms_host = None
+        self.collider_xforms_host_np = None
+        self.collider_xforms_device = None
+
+        self.cloth_xform_host = None
+        self.cloth_xform_host_np = None
+        self.cloth_xform_device = None
+
+        # host copy of the local space cloth positions used to write outputs
+        self.positions_host = None
+        self.positions_host_np = None
+        self.positions_device = None
+
+        # whether cloth positions are transformed back to local space on the host
+        self.host_transform = False
+        self.positions_homog = None
+
+        # true when the collider's current and previous local space points match on the device
+        self.collider_points_synced = False
+
+        # true when the collider's current and previous positions match on the device,
+        # i.e.: its velocities are zero and it does not need updating until it moves again
+        self.collider_at_rest = False
+
+        # last applied node inputs, used to detect parameter changes
+        self.params = None
+
         self.time = 0.0
         
         self.capture = None
-
-    # swap current / prev collider positions
-    def swap(self):
-        
-        t = self.collider_positions_current
-        self.collider_positions_current = self.collider_positions_previous
-        self.collider_positions_previous = t
+        self.capture_collider = None
 
 class OgnCloth:
 
@@ -124,8 +353,8 @@ class OgnCloth:
     def compute(db) -> bool:
         """Run simulation"""
 
-        timeline =  omni.timeline.get_timeline_interface()
         context = db.internal_state
+        timeline = context.timeline
         device = "cuda"
 
         with wp.ScopedCudaGuard():
@@ -138,9 +367,13 @@ class OgnCloth:
             if (timeline.is_playing()):
             
                 if context.model is None:
-                    
-                    # build cloth
-                    builder = wp.sim.ModelBuilder()
+
+                    cloth_world = None
+                    cloth_indices = None
+                    density = db.inputs.density
+
+                    collider_world = None
+                    collider_indices = None
 
                     # cloth
                     with wp.ScopedTimer("Create Cloth", detailed=False):
@@ -148,51 +381,71 @@ class OgnCloth:
                         if (db.inputs.cloth.valid):
 
                             # transform cloth points to world-space
-                            cloth_xform = read_transform_bundle(db.inputs.cloth)
+                            cloth_xform = read_transform_bundle(context, db.inputs.cloth)
                             cloth_positions = read_points_bundle(db.inputs.cloth)
                             cloth_indices = read_indices_bundle(db.inputs.cloth)
 
-                            density = db.inputs.density
-
                             # transform particles to world space
-                            world_positions = []
-                            for i in range(len(cloth_positions)):
-                                world_positions.append(cloth_xform.Transform(Gf.Vec3f(tuple(cloth_positions[i]))))
-                        
+                            cloth_world = transform_points_host(cloth_xform, cloth_positions)
+
+                    # collision shape
+                    with wp.ScopedTimer("Create Collider"):
+
+                        if (db.inputs.collider.valid):
+
+                            collider_xform = read_transform_bundle(context, db.inputs.collider)
+                            collider_positions = read_points_bundle(db.inputs.collider)
+                            collider_indices = read_indices_bundle(db.inputs.collider)
+
+                            # host staging buffer for per-frame collider point updates
+                            context.collider_points_host = wp.zeros(len(collider_positions), dtype=wp.vec3, device="cpu")
+                            context.collider_points_host_np = context.collider_points_host.numpy()
+
+                            np.copyto(context.collider_points_host_np, collider_positions)
+
+                            # save local copy, one upload from the staging buffer then a device side clone
+                            context.collider_positions_current = wp.zeros(len(collider_positions), dtype=wp.vec3, device=device)
+                            wp.copy(context.collider_positions_current, context.collider_points_host)
+
+                            context.collider_positions_previous = wp.clone(context.collider_positions_current)
+                            context.collider_points_synced = True
+
+                            collider_world = transform_points_host(collider_xform, collider_positions)
+
+                    # the finalized model only depends on the world space geometry and density,
+                    # so it is re-used across Stop/Play as long as these have not changed
+                    model_key = hash_model_inputs(cloth_world, cloth_indices, collider_world, collider_indices, density)
+
+                    if (context.model_cache and context.model_cache[0] == model_key):
+
+                        (model_key, model, context.mesh) = context.model_cache
+                    
+                    else:
+
+                        # release the previous model before building a new one
+                        context.model_cache = None
+
+                        builder = wp.sim.ModelBuilder()
+
+                        if (cloth_world is not None):
+
                             builder.add_cloth_mesh(pos=(0.0, 0.0, 0.0),
                                                    rot=(0.0, 0.0, 0.0, 1.0),
                                                    scale=1.0,
                                                    vel=(0.0, 0.0, 0.0),
-                                                   vertices=world_positions,
+                                                   vertices=cloth_world,
                                                    indices=cloth_indices,
                                                    density=density)
 
-
                             avg_mass = np.mean(builder.particle_mass)
 
                             # set uniform mass to average mass to avoid large mass ratios
-                            builder.particle_mass = np.array([avg_mass]*len(builder.particle_mass))
-
-
-                    # collision shape
-                    with wp.ScopedTimer("Create Collider"):
-
-                        if (db.inputs.collider.valid):
-
-                            collider_xform = read_transform_bundle(db.inputs.collider)
-                            collider_positions = read_points_bundle(db.inputs.collider)
-                            collider_indices = read_indices_bundle(db.inputs.collider)
+                            builder.particle_mass = np.full(len(builder.particle_mass), avg_mass, dtype=np.float32)
 
-                            # save local copy
-                            context.collider_positions_current = wp.array(collider_positions, dtype=wp.vec3, device=device)
-                            context.collider_positions_previous = wp.array(collider_positions, dtype=wp.vec3, device=device)
-
-                            world_positions = []
-                            for i in range(len(collider_positions)):
-                                world_positions.append(collider_xform.Transform(Gf.Vec3f(tuple(collider_positions[i]))))
+                        if (collider_world is not None):
 
                             context.mesh = wp.sim.Mesh(
-                                world_positions,
+                                collider_world,
                                 collider_indices,
                                 compute_inertia=False)
 
@@ -203,157 +456,191 @@ class OgnCloth:
                                 rot=(0.0, 0.0, 0.0, 1.0),
                                 scale=(1.0, 1.0, 1.0))
 
-                    # finalize sim model
-                    model = builder.finalize(device)
-                    
-                    # create integrator
-                    context.integrator = wp.sim.SemiImplicitIntegrator()
+                        # finalize sim model
+                        model = builder.finalize(device)
 
+                        context.model_cache = (model_key, model, context.mesh)
+                    
                     # save model and state
                     context.model = model
+
+                    # launch dimensions
+                    context.n_particles = model.particle_count
+                    context.n_collider_verts = len(context.mesh.vertices) if context.mesh else 0
+                    context.host_transform = context.n_particles < host_transform_threshold
+
                     context.state_0 = model.state()
                     context.state_1 = model.state()
 
                     context.positions_host = wp.zeros(model.particle_count, dtype=wp.vec3, device="cpu")
                     context.positions_device = wp.zeros(model.particle_count, dtype=wp.vec3, device=device)
 
-                    context.collider_xform = read_transform_bundle(db.inputs.collider)
+                    # persistent ndarray view of the host buffer, avoids re-wrapping it on each frame
+                    context.positions_host_np = context.positions_host.numpy()
+
+                    # homogeneous coordinates for the host side transform
+                    if (context.host_transform):
+                        context.positions_homog = np.ones((context.n_particles, 4), dtype=np.float32)
+
+                    context.collider_xform = read_transform_bundle(context, db.inputs.collider)
+
+                    context.collider_xforms_host = wp.zeros(6, dtype=wp.vec4, device="cpu")
+                    context.collider_xforms_host_np = context.collider_xforms_host.numpy()
+                    context.collider_xforms_host_np[0:3].T[...] = np.asarray(context.collider_xform)[:,0:3]
+                    context.collider_xforms_device = wp.zeros(6, dtype=wp.vec4, device=device)
+
+                    context.cloth_xform_host = wp.zeros(3, dtype=wp.vec4, device="cpu")
+                    context.cloth_xform_host_np = context.cloth_xform_host.numpy()
+                    context.cloth_xform_device = wp.zeros(3, dtype=wp.vec4, device=device)
+
+
+                # update dynamic properties, inputs are fetched once and only applied when they 
+                # change, since scalar kernel parameters are baked into the graph when it is captured
+                inputs = db.inputs
+
+                params = (inputs.ground,
+                          tuple(inputs.ground_plane),
+                          inputs.k_tri_elastic,
+                          inputs.k_tri_area,
+                          inputs.k_tri_damp,
+                          tuple(inputs.gravity),
+                          inputs.k_edge_bend,
+                          inputs.k_edge_damp,
+                          inputs.k_contact_elastic,
+                          inputs.k_contact_damp,
+                          inputs.k_contact_friction,
+                          inputs.k_contact_mu,
+                          inputs.collider_offset,
+                          inputs.num_substeps)
+
+                if (params != context.params):
+
+                    (ground, 
+                     ground_plane, 
+                     k_tri_elastic, 
+                     k_tri_area, 
+                     k_tri_damp, 
+                     gravity, 
+                     k_edge_bend, 
+                     k_edge_damp, 
+                     k_contact_elastic, 
+                     k_contact_damp, 
+                     k_contact_friction, 
+                     k_contact_mu, 
+                     collider_offset,
+                     num_substeps) = params
+
+                    model = context.model
+
+                    model.ground = ground
+                    model.ground_plane = np.array((ground_plane[0], ground_plane[1], ground_plane[2], 0.0))
+
+                    # stretch properties
+                    model.tri_ke = k_tri_elastic
+                    model.tri_ka = k_tri_area
+                    model.tri_kd = k_tri_damp
+                    model.gravity = np.array(gravity)
+                    
+                    # bending properties
+                    model.edge_ke = k_edge_bend
+                    model.edge_kd = k_edge_damp
 
+                    # contact properties
+                    model.soft_contact_ke = k_contact_elastic
+                    model.soft_contact_kd = k_contact_damp
+                    model.soft_contact_kf = k_contact_friction
+                    model.soft_contact_mu = k_contact_mu
+                    model.soft_contact_distance = collider_offset
+                    model.soft_contact_margin = collider_offset*10.0
 
-                # update dynamic properties
-                context.model.ground = db.inputs.ground
-                context.model.ground_plane = np.array((db.inputs.ground_plane[0], db.inputs.ground_plane[1], db.inputs.ground_plane[2], 0.0))
+                    context.params = params
 
-                # stretch properties
-                context.model.tri_ke = db.inputs.k_tri_elastic
-                context.model.tri_ka = db.inputs.k_tri_area
-                context.model.tri_kd = db.inputs.k_tri_damp
-                context.model.gravity = db.inputs.gravity
-                
-                # bending properties
-                context.model.edge_ke = db.inputs.k_edge_bend
-                context.model.edge_kd = db.inputs.k_edge_damp
-
-                # contact properties
-                context.model.soft_contact_ke = db.inputs.k_contact_elastic
-                context.model.soft_contact_kd = db.inputs.k_contact_damp
-                context.model.soft_contact_kf = db.inputs.k_contact_friction
-                context.model.soft_contact_mu = db.inputs.k_contact_mu
-                context.model.soft_contact_distance = db.inputs.collider_offset
-                context.model.soft_contact_margin = db.inputs.collider_offset*10.0
+                    # re-record the simulation with the new parameters
+                    if (context.capture):
+                        wp.capture_destroy(context.capture)
+                        context.capture = None
 
                 # update collider positions
                 with wp.ScopedTimer("Refit", active=False):
                     
                     if (context.mesh):
-                        
-                        # swap prev/curr mesh positions
-                        context.swap()
 
-                        # update current, todo: make this zero alloc and memcpy directly from numpy memory
+                        collider_points = read_points_bundle(db.inputs.collider)
+                        current_xform = read_transform_bundle(context, db.inputs.collider)
 
-                        collider_points_host = wp.array(read_points_bundle(db.inputs.collider), dtype=wp.vec3, copy=False, device="cpu")
-                        wp.copy(context.collider_positions_current, collider_points_host)
+                        points_changed = not np.array_equal(collider_points, context.collider_points_host_np)
+                        moved = points_changed or current_xform != context.collider_xform
 
-                        alpha = 1.0#(i+1)/sim_substeps
-
-                        previous_xform = context.collider_xform
-                        current_xform = read_transform_bundle(db.inputs.collider)
+                        # static colliders skip the upload and refit entirely, once it 
+                        # stops moving one more update is needed to zero its velocities
+                        if (moved or not context.collider_at_rest):
+                        
+                            if (points_changed):
 
-                        wp.launch(
-                            kernel=transform_mesh, 
-                            dim=len(context.mesh.vertices), 
-                            inputs=[context.collider_positions_current,
-                                    context.collider_positions_previous,
-                                    np.array(current_xform).T,
-                                    np.array(previous_xform).T,
-                                    context.mesh.mesh.points,
-                                    context.mesh.mesh.velocities,
-                                    1.0/60.0,
-                                    alpha],
-                                    device=device)
+                                # copy current to previous mesh positions, the buffers can't simply be 
+                                # swapped since their addresses are baked into the captured graph
+                                wp.copy(context.collider_positions_previous, context.collider_positions_current)
 
-                        context.collider_xform = current_xform
+                                # update current, memcpy into the persistent host buffer then upload
+                                np.copyto(context.collider_points_host_np, collider_points)
+                                wp.copy(context.collider_positions_current, context.collider_points_host)
 
-                        # refit bvh
-                        context.mesh.mesh.refit()
+                                context.collider_points_synced = False
 
-                use_graph = True
-                if (use_graph):
-                    if (context.capture == None):
-                        
-                        wp.capture_begin()
+                            elif (not context.collider_points_synced):
 
-                        # simulate
-                        sim_substeps = db.inputs.num_substeps
-                        sim_dt = (1.0/60)/sim_substeps
+                                # local points stopped changing (e.g.: a rigidly animated collider), previous
+                                # catches up with current on the device and only the xforms are uploaded
+                                wp.copy(context.collider_positions_previous, context.collider_positions_current)
+                                context.collider_points_synced = True
 
-                        # run collision detection once per-frame
-                        wp.sim.collide(context.model, context.state_0)
+                            # last frame's xform becomes previous, USD matrices use row-vectors so the
+                            # first three columns written through a transposed view give the affine rows
+                            xforms = context.collider_xforms_host_np
+                            xforms[3:6] = xforms[0:3]
+                            xforms[0:3].T[...] = np.asarray(current_xform)[:,0:3]
 
-                        for i in range(sim_substeps):
+                            wp.copy(context.collider_xforms_device, context.collider_xforms_host)
 
-                            context.state_0.clear_forces()
+                            context.collider_xform = current_xform
+                            context.collider_at_rest = not moved
 
-                            context.integrator.simulate(
-                                context.model, 
-                                context.state_0, 
-                                context.state_1, 
-                                sim_dt)
+                            step_collider(context, device)
 
-                            (context.state_0, context.state_1) = (context.state_1, context.state_0)
+                # upload cloth world to local space transform
+                cloth_xform_inv = read_transform_bundle(context, db.inputs.cloth).GetInverse()
 
-                        context.capture = wp.capture_end()
+                if (not context.host_transform):
+                    context.cloth_xform_host_np.T[...] = np.asarray(cloth_xform_inv)[:,0:3]
+                    wp.copy(context.cloth_xform_device, context.cloth_xform_host)
 
                 # step simulation
                 with wp.ScopedTimer("Simulate", active=False):
-                    
-                    if (use_graph):
-                        wp.capture_launch(context.capture)
-                    else:
-                        
-                        # simulate
-                        sim_substeps = db.inputs.num_substeps
-                        sim_dt = (1.0/60)/sim_substeps
-
-                        # run collision detection once per-frame
-                        wp.sim.collide(context.model, context.state_0)
-
-                        for i in range(sim_substeps):
+                    step_simulation(context, inputs.num_substeps, device)
 
-                            context.state_0.clear_forces()
-
-                            context.integrator.simulate(
-                                context.model,  
-                                context.state_0, 
-                                context.state_1, 
-                                sim_dt)
-
-                            (context.state_0, context.state_1) = (context.state_1, context.state_0)
+                with wp.ScopedTimer("Synchronize", active=False):
 
+                    # back to host for OG outputs
+                    if (context.host_transform):
+                        wp.copy(context.positions_host, context.state_0.particle_q)
+                    else:
+                        wp.copy(context.positions_host, context.positions_device)
 
-                # transform cloth positions back to local space
-                with wp.ScopedTimer("Transform", active=False):
-                    
-                    cloth_xform_inv = read_transform_bundle(db.inputs.cloth).GetInverse()
+                    wp.synchronize()
 
-                    wp.launch(kernel=transform_points, 
-                              dim=context.model.particle_count, 
-                              inputs=[context.state_0.particle_q, 
-                                      context.positions_device, 
-                                      np.array(cloth_xform_inv).T],
-                              device=device)
+                if (context.host_transform):
+                    with wp.ScopedTimer("Transform", active=False):
 
-                with wp.ScopedTimer("Synchronize", active=False):
+                        # USD row-vector convention, so post-multiply by the first three columns
+                        homog = context.positions_homog
+                        homog[:,0:3] = context.positions_host_np
 
-                    # back to host for OG outputs
-                    wp.copy(context.positions_host, context.positions_device)
-                    wp.synchronize()
+                        np.matmul(homog, np.asarray(cloth_xform_inv, dtype=np.float32)[:,0:3], out=context.positions_host_np)
 
                 with wp.ScopedTimer("Write", active=False):
 
-                    db.outputs.positions_size = len(context.positions_host)
-                    db.outputs.positions[:] = context.positions_host.numpy()
+                    db.outputs.positions_size = context.n_particles
+                    db.outputs.positions[:] = context.positions_host_np
 
             else:
                 
@@ -365,3 +652,7 @@ class OgnCloth:
 
 
         return True
+
+
+# compile the node's kernels at import time so the first frame after Play doesn't stall on it
+wp.load_module()
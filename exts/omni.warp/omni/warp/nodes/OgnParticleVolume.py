@@ -46,20 +46,22 @@ def read_bounds_bundle(bundle):
 def triangulate(counts, indices):
 
     # triangulate
-    num_tris = np.sum(np.subtract(counts, 2))
-    num_tri_vtx = num_tris * 3
-    tri_indices = np.zeros(num_tri_vtx, dtype=int)
-    ctr = 0
-    wedgeIdx = 0
-    for nb in counts:
-        for i in range(nb-2):
-            tri_indices[ctr] = indices[wedgeIdx]
-            tri_indices[ctr + 1] = indices[wedgeIdx + i + 1]
-            tri_indices[ctr + 2] = indices[wedgeIdx + i + 2]
-            ctr+=3
-        wedgeIdx+=nb
-
-    return tri_indices
+    counts = np.asarray(counts, dtype=int)
+    indices = np.asarray(indices, dtype=int)
+
+    # each face is split into a fan of (count - 2) triangles around its first vertex
+    tris_per_face = counts - 2
+    face_starts = np.cumsum(counts) - counts
+
+    # offset of the first vertex of each triangle's face, and position of the triangle within the fan
+    tri_starts = np.repeat(face_starts, tris_per_face)
+    tri_fan = np.arange(len(tri_starts)) - np.repeat(np.cumsum(tris_per_face) - tris_per_face, tris_per_face)
+
+    tri_indices = np.stack((indices[tri_starts],
+                            indices[tri_starts + tri_fan + 1],
+                            indices[tri_starts + tri_fan + 2]), axis=1)
+
+    return tri_indices.flatten()
 
 
 def add_bundle_data(bundle, name, data, type):
@@ -5,7 +5,7 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
-from . context import add_builtin
+from . context import add_builtin, add_builtin_overloads
 
 from warp.types import *
 
@@ -18,37 +18,38 @@ from typing import Callable
 #---------------------------------
 # Scalar Math
 
-add_builtin("min", input_types={"x": int, "y": int}, value_type=int, doc="Return the minimum of two integers.", group="Scalar Math")
-add_builtin("min", input_types={"x": float, "y": float}, value_type=float, doc="Return the minimum of two floats.", group="Scalar Math")
-
-add_builtin("max", input_types={"x": int, "y": int}, value_type=int, doc="Return the maximum of two integers.", group="Scalar Math")
-add_builtin("max", input_types={"x": float, "y": float}, value_type=float, doc="Return the maximum of two floats.", group="Scalar Math")
-
-add_builtin("clamp", input_types={"x": int, "a": int, "b": int}, value_type=int, doc="Clamp the value of x to the range [a, b].", group="Scalar Math")
-add_builtin("clamp", input_types={"x": float, "a": float, "b": float}, value_type=float, doc="Clamp the value of x to the range [a, b].", group="Scalar Math")
-
-add_builtin("abs", input_types={"x": int}, value_type=int, doc="Return the absolute value of x.", group="Scalar Math")
-add_builtin("abs", input_types={"x": float}, value_type=float, doc="Return the absolute value of x.", group="Scalar Math")
-add_builtin("sign", input_types={"x": int}, value_type=int, doc="Return -1 if x < 0, return 1 otherwise.", group="Scalar Math")
-add_builtin("sign", input_types={"x": float}, value_type=float, doc="Return -1.0 if x < 0.0, return 1.0 otherwise.", group="Scalar Math")
-
-add_builtin("step", input_types={"x": float}, value_type=float, doc="Return 1.0 if x < 0.0, return 0.0 otherwise.", group="Scalar Math")
-add_builtin("nonzero", input_types={"x": float}, value_type=float, doc="Return 1.0 if x is not equal to zero, return 0.0 otherwise.", group="Scalar Math")
-add_builtin("sin", input_types={"x": float}, value_type=float, doc="Return the sine of x in radians.", group="Scalar Math")
-add_builtin("cos", input_types={"x": float}, value_type=float, doc="Return the cosine of x in radians.", group="Scalar Math")
-add_builtin("acos", input_types={"x": float}, value_type=float, doc="Return arccos of x in radians. Inputs are automatically clamped to [-1.0, 1.0].", group="Scalar Math")
-add_builtin("asin", input_types={"x": float}, value_type=float, doc="Return arcsin of x in radians. Inputs are automatically clamped to [-1.0, 1.0].", group="Scalar Math")
-add_builtin("sqrt", input_types={"x": float}, value_type=float, doc="Return the sqrt of x, where x is positive.", group="Scalar Math")
-add_builtin("tan", input_types={"x": float}, value_type=float, doc="Return tangent of x in radians.", group="Scalar Math")
-add_builtin("atan", input_types={"x": float}, value_type=float, doc="Return arctan of x.", group="Scalar Math")
-add_builtin("atan2", input_types={"y": float, "x": float}, value_type=float, doc="Return atan2 of x.", group="Scalar Math")
-add_builtin("sinh", input_types={"x": float}, value_type=float, doc="Return the sinh of x.", group="Scalar Math")
-add_builtin("cosh", input_types={"x": float}, value_type=float, doc="Return the cosh of x.", group="Scalar Math")
-add_builtin("tanh", input_types={"x": float}, value_type=float, doc="Return the tanh of x.", group="Scalar Math")
-
-add_builtin("log", input_types={"x": float}, value_type=float, doc="Return the natural log (base-e) of x, where x is positive.", group="Scalar Math")
-add_builtin("exp", input_types={"x": float}, value_type=float, doc="Return base-e exponential, e^x.", group="Scalar Math")
-add_builtin("pow", input_types={"x": float, "y": float}, value_type=float, doc="Return the result of x raised to power of y.", group="Scalar Math")
+# int and float overloads share one registration loop, the native side provides a matching overload for each
+for t, type_name in ((int, "integers"), (float, "floats")):
+
+    add_builtin("min", input_types={"x": t, "y": t}, value_type=t, doc=f"Return the minimum of two {type_name}.", group="Scalar Math")
+    add_builtin("max", input_types={"x": t, "y": t}, value_type=t, doc=f"Return the maximum of two {type_name}.", group="Scalar Math")
+    add_builtin("clamp", input_types={"x": t, "a": t, "b": t}, value_type=t, doc="Clamp the value of x to the range [a, b].", group="Scalar Math")
+    add_builtin("abs", input_types={"x": t}, value_type=t, doc="Return the absolute value of x.", group="Scalar Math")
+    add_builtin("sign", input_types={"x": t}, value_type=t, doc=f"Return {-t(1)} if x < {t(0)}, return {t(1)} otherwise.", group="Scalar Math")
+
+# single overload float functions, listed in one table and registered by the loop below
+_scalar_math_funcs = (
+    ("step",    {"x": float},             float, "Return 1.0 if x < 0.0, return 0.0 otherwise."),
+    ("nonzero", {"x": float},             float, "Return 1.0 if x is not equal to zero, return 0.0 otherwise."),
+    ("sin",     {"x": float},             float, "Return the sine of x in radians."),
+    ("cos",     {"x": float},             float, "Return the cosine of x in radians."),
+    ("acos",    {"x": float},             float, "Return arccos of x in radians. Inputs are automatically clamped to [-1.0, 1.0]."),
+    ("asin",    {"x": float},             float, "Return arcsin of x in radians. Inputs are automatically clamped to [-1.0, 1.0]."),
+    ("sqrt",    {"x": float},             float, "Return the sqrt of x, where x is positive."),
+    ("tan",     {"x": float},             float, "Return tangent of x in radians."),
+    ("atan",    {"x": float},             float, "Return arctan of x."),
+    ("atan2",   {"y": float, "x": float}, float, "Return atan2 of x."),
+    ("sinh",    {"x": float},             float, "Return the sinh of x."),
+    ("cosh",    {"x": float},             float, "Return the cosh of x."),
+    ("tanh",    {"x": float},             float, "Return the tanh of x."),
+
+    ("log",     {"x": float},             float, "Return the natural log (base-e) of x, where x is positive."),
+    ("exp",     {"x": float},             float, "Return base-e exponential, e^x."),
+    ("pow",     {"x": float, "y": float}, float, "Return the result of x raised to power of y."),
+)
+
+for key, input_types, value_type, doc in _scalar_math_funcs:
+    add_builtin(key, input_types=input_types, value_type=value_type, doc=doc, group="Scalar Math")
 
 add_builtin("round", input_types={"x": float}, value_type=float, group="Scalar Math",
     doc="""Calculate the nearest integer value, rounding halfway cases away from zero.
@@ -109,34 +110,25 @@ add_builtin("normalize", input_types={"x": vec4}, value_type=vec4, group="Vector
 add_builtin("normalize", input_types={"x": quat}, value_type=quat, group="Vector Math",
     doc="Compute the normalized value of x, if length(x) is 0 then the zero quat is returned.")
 
-add_builtin("transpose", input_types={"m": mat22}, value_type=mat22, group="Vector Math",
-    doc="Return the transpose of the matrix m")
-add_builtin("transpose", input_types={"m": mat33}, value_type=mat33, group="Vector Math",
-    doc="Return the transpose of the matrix m")
-add_builtin("transpose", input_types={"m": mat44}, value_type=mat44, group="Vector Math",
-    doc="Return the transpose of the matrix m")
-add_builtin("transpose", input_types={"m": spatial_matrix}, value_type=spatial_matrix, group="Vector Math",
+add_builtin_overloads("transpose", (({"m": mat22}, mat22),
+                                     ({"m": mat33}, mat33),
+                                     ({"m": mat44}, mat44),
+                                     ({"m": spatial_matrix}, spatial_matrix)), group="Vector Math",
     doc="Return the transpose of the matrix m")
 
-add_builtin("inverse", input_types={"m": mat22}, value_type=mat22, group="Vector Math",
-    doc="Return the inverse of the matrix m")
-add_builtin("inverse", input_types={"m": mat33}, value_type=mat33, group="Vector Math",
-    doc="Return the inverse of the matrix m")
-add_builtin("inverse", input_types={"m": mat44}, value_type=mat44, group="Vector Math",
+add_builtin_overloads("inverse", (({"m": mat22}, mat22),
+                                   ({"m": mat33}, mat33),
+                                   ({"m": mat44}, mat44)), group="Vector Math",
     doc="Return the inverse of the matrix m")
 
-add_builtin("determinant", input_types={"m": mat22}, value_type=float, group="Vector Math",
-    doc="Return the determinant of the matrix m")
-add_builtin("determinant", input_types={"m": mat33}, value_type=float, group="Vector Math",
-    doc="Return the determinant of the matrix m")
-add_builtin("determinant", input_types={"m": mat44}, value_type=float, group="Vector Math",
+add_builtin_overloads("determinant", (({"m": mat22}, float),
+                                       ({"m": mat33}, float),
+                                       ({"m": mat44}, float)), group="Vector Math",
     doc="Return the determinant of the matrix m")
 
-add_builtin("diag", input_types={"d": vec2}, value_type=mat22, group="Vector Math",
-    doc="Returns a matrix with the components of the vector d on the diagonal")
-add_builtin("diag", input_types={"d": vec3}, value_type=mat33, group="Vector Math",
-    doc="Returns a matrix with the components of the vector d on the diagonal")
-add_builtin("diag", input_types={"d": vec4}, value_type=mat44, group="Vector Math",
+add_builtin_overloads("diag", (({"d": vec2}, mat22),
+                                ({"d": vec3}, mat33),
+                                ({"d": vec4}, mat44)), group="Vector Math",
     doc="Returns a matrix with the components of the vector d on the diagonal")
 
 add_builtin("cw_mul", input_types={"x": vec2, "y": vec2}, value_type=vec2, group="Vector Math",
@@ -152,15 +144,13 @@ add_builtin("cw_div", input_types={"x": vec3, "y": vec3}, value_type=vec3, group
 add_builtin("cw_div", input_types={"x": vec4, "y": vec4}, value_type=vec3, group="Vector Math",
     doc="Component wise division of two 4d vectors.")
 
-# type construtors for compute types (int, float)
+# type construtors for compute types (int, float) from storage types, and vice versa
 for t in scalar_types:
     add_builtin("int", input_types={"x": t}, value_type=int, doc="Construct an 32-bit signed integer variable, larger precision types will be truncated.", hidden=True, group="Scalar Math")
     add_builtin("float", input_types={"x": t}, value_type=float, doc="Construct a 32-bit floating point variable, larger precision types will be truncated.", hidden=True, group="Scalar Math")
 
-# type construtors for storage types 
-for t in scalar_types:
-    add_builtin(t.__name__, input_types={"x": int}, value_type=t, doc="", hidden=True, group="Scalar Math")
-    add_builtin(t.__name__, input_types={"x": float}, value_type=t, doc="", hidden=True, group="Scalar Math")
+    for src in (int, float):
+        add_builtin(t.__name__, input_types={"x": src}, value_type=t, doc="", hidden=True, group="Scalar Math")
 
 add_builtin("vec2", input_types={}, value_type=vec2, doc="Construct a zero-initialized 2d vector.", group="Vector Math")
 add_builtin("vec2", input_types={"x": float, "y": float }, value_type=vec2, doc="Construct a 2d vector with compontents x, y.", group="Vector Math")
@@ -424,6 +414,14 @@ add_builtin("hash_grid_point_id", input_types={"id": uint64, "index": int}, valu
 add_builtin("intersect_tri_tri", input_types={"v0": vec3, "v1": vec3, "v2": vec3, "u0": vec3, "u1": vec3, "u2": vec3}, value_type=int, group="Geometry", 
     doc="Tests for intersection between two triangles (v0, v1, v2) and (u0, u1, u2) using Möller's method. Returns > 0 if triangles intersect.")
 
+add_builtin("pack_triangle", input_types={"v0": vec3, "v1": vec3, "v2": vec3}, value_type=rt_triangle_t, group="Geometry",
+    doc="""Pack the triangle (v0, v1, v2) into a compressed 24 byte ``rt_triangle_t``, the base vertex ``v0`` is stored at full precision
+   and the edges ``v1-v0``, ``v2-v0`` as float16. Arrays of ``rt_triangle_t`` need a third less memory traffic than three ``vec3``
+   vertices, at the cost of edge precision.""")
+
+add_builtin("intersect_tri_tri", input_types={"a": rt_triangle_t, "b": rt_triangle_t}, value_type=int, group="Geometry",
+    doc="Tests for intersection between two compressed triangles using Möller's method. Returns > 0 if triangles intersect.")
+
 #---------------------------------
 # Ranges
 
@@ -491,6 +489,21 @@ add_builtin("randf", input_types={"state": uint32, "min": float, "max": float},
 add_builtin("randn", input_types={"state": uint32}, value_type=float, group="Random", 
     doc="Sample a normal distribution")
 
+add_builtin("rand_init_philox", input_types={"seed": int, "offset": int}, value_type=philox_state_t, group="Random",
+    doc="""Initialize a counter-based Philox-4x32-10 generator given a user-defined seed and an offset, e.g.: ``r = rand_init_philox(seed, tid)``.
+   Unlike ``rand_init()`` the returned state is never advanced, each value is a pure function of the state and a counter,
+   so threads may draw different numbers of values, or skip ahead, without any sequential dependency.""")
+add_builtin("randf4_philox", input_types={"state": philox_state_t, "counter": int}, value_type=vec4, group="Random",
+    doc="Return four independent random floats between [0.0, 1.0) for the given counter value")
+add_builtin("randn_philox", input_types={"state": philox_state_t, "counter": int}, value_type=float, group="Random",
+    doc="Sample a normal distribution for the given counter value")
+
+add_builtin("rand_init_taus", input_types={"seed": int, "offset": int}, value_type=taus_state_t, group="Random",
+    doc="""Initialize a combined Tausworthe generator given a user-defined seed and an offset, e.g.: ``r = rand_init_taus(seed, tid)``.
+   The state is four words per thread, with a much longer period than ``rand_init()``.""")
+add_builtin("randf_taus", input_types={"state": taus_state_t}, value_type=float, group="Random",
+    doc="Return a random float between [0.0, 1.0) and advance the Tausworthe state")
+
 add_builtin("noise", input_types={"state": uint32, "x": float}, value_type=float, group="Random",
     doc="Non-periodic Perlin-style noise in 1d.")
 add_builtin("noise", input_types={"state": uint32, "xy": vec2}, value_type=float, group="Random",
@@ -509,6 +522,12 @@ add_builtin("pnoise", input_types={"state": uint32, "xyz": vec3, "px": int, "py"
 add_builtin("pnoise", input_types={"state": uint32, "xyzt": vec4, "px": int, "py": int, "pz": int, "pt": int}, value_type=float, group="Random",
     doc="Periodic Perlin-style noise in 4d.")
 
+add_builtin("noise4", input_types={"state": uint32, "x": vec4}, value_type=vec4, group="Random",
+    doc="""Four independent samples of non-periodic Perlin-style noise in 1d, one per component of ``x``.
+   Equivalent to evaluating ``noise(state, x[i])`` for each component, but keeps the four evaluations independent so they can be interleaved.""")
+add_builtin("pnoise4", input_types={"state": uint32, "x": vec4, "px": int}, value_type=vec4, group="Random",
+    doc="""Four independent samples of periodic Perlin-style noise in 1d with period ``px``, one per component of ``x``.""")
+
 add_builtin("curlnoise", input_types={"state": uint32, "xy": vec2}, value_type=vec2, group="Random",
     doc="Divergence-free vector field based on the gradient of a Perlin noise function.")
 add_builtin("curlnoise", input_types={"state": uint32, "xyz": vec3}, value_type=vec3, group="Random",
@@ -540,13 +559,26 @@ add_builtin("tid", input_types={}, value_type=[int, int, int, int], group="Utili
 add_builtin("copy", variadic=True, hidden=True, group="Utility")
 add_builtin("select", input_types={"cond": bool, "arg1": Any, "arg2": Any}, value_func=lambda args: args[1].type, doc="Select between two arguments, if cond is false then return ``arg1``, otherwise return ``arg2``", group="Utility")
 
+# integer types accepted as array indices
+array_index_types = frozenset((int, int8, uint8, int16, uint16, int32, uint32, int64, uint64))
+
+# checks the target is an array and the indices are integers, shared by load(), view(), store() and atomic ops
+def check_array_access(op, target, indices):
+
+    if (type(target.type) != array):
+        raise RuntimeError(f"{op} argument 0 must be an array")
+
+    for a in indices:
+        if a.type not in array_index_types:
+            raise RuntimeError(f"{op} index arguments must be of integer type, got index of type {a.type}")
+
 # does argument checking and type progagation for load()
 def load_value_func(args):
 
-    if (type(args[0].type) != array):
-        raise RuntimeError("load() argument 0 must be an array")
+    indices = args[1:]
+    check_array_access("load()", args[0], indices)
 
-    num_indices = len(args[1:])
+    num_indices = len(indices)
     num_dims = args[0].type.ndim
 
     if num_indices < num_dims:
@@ -555,31 +587,23 @@ def load_value_func(args):
     if num_indices > num_dims:
         raise RuntimeError(f"Num indices > num dimensions for array load, received {num_indices}, but array only has {num_dims}")
 
-    # check index types
-    for a in args[1:]:
-        if type_is_int(a.type) == False:
-            raise RuntimeError(f"load() index arguments must be of integer type, got index of type {a.type}")
-
     return args[0].type.dtype
 
 # does argument checking and type progagation for view()
 def view_value_func(args):
-    if (type(args[0].type) != array):
-        raise RuntimeError("view() argument 0 must be an array")
+
+    indices = args[1:]
+    check_array_access("view()", args[0], indices)
 
     # check array dim big enough to support view
-    num_indices = len(args[1:])
+    num_indices = len(indices)
     num_dims = args[0].type.ndim
 
     if num_indices >= num_dims:
         raise RuntimeError(f"Trying to create an array view with {num_indices} indices, but array only has {num_dims} dimensions.")
 
-    # check index types
-    for a in args[1:]:
-        if type_is_int(a.type) == False:
-            raise RuntimeError(f"view() index arguments must be of integer type, got index of type {a.type}")
-
-    # create an array view with leading dimensions removed
+    # create an array view with leading dimensions removed, imported locally
+    # since names imported here are re-exported through the warp namespace
     import copy
     view_type = copy.copy(args[0].type)
     view_type.ndim -= num_indices
@@ -588,11 +612,11 @@ def view_value_func(args):
 
 # does argument checking and type progagation for store()
 def store_value_func(args):
-    # check target type
-    if (type(args[0].type) != array):
-        raise RuntimeError("store() argument 0 must be an array")
+
+    indices = args[1:-1]
+    check_array_access("store()", args[0], indices)
     
-    num_indices = len(args[1:-1])
+    num_indices = len(indices)
     num_dims = args[0].type.ndim
 
     # if this happens we should have generated a view instead of a load during code gen
@@ -602,14 +626,9 @@ def store_value_func(args):
     if num_indices > num_dims:
         raise RuntimeError(f"Num indices > num dimensions for array store, received {num_indices}, but array only has {num_dims}")
 
-    # check index types
-    for a in args[1:-1]:
-        if type_is_int(a.type) == False:
-            raise RuntimeError(f"store() index arguments must be of integer type, got index of type {a.type}")
-
     # check value type
     if (args[-1].type != args[0].type.dtype):
-        raise RuntimeError(f"store() value argument type ({args[2].type}) must be of the same type as the array ({args[0].type.dtype})")
+        raise RuntimeError(f"store() value argument type ({args[-1].type}) must be of the same type as the array ({args[0].type.dtype})")
 
     return None
 
@@ -618,13 +637,35 @@ add_builtin("load", variadic=True, hidden=True, value_func=load_value_func, grou
 add_builtin("view", variadic=True, hidden=True, value_func=view_value_func, group="Utility")
 add_builtin("store", variadic=True, hidden=True, value_func=store_value_func, skip_replay=True, group="Utility")
 
+# struct-of-arrays access, vectors are stored as a 2d float array of shape (components, n)
+def soa_value_func(op, value_type):
+
+    def value_func(args):
+
+        check_array_access(op, args[0], args[1:2])
+
+        if (args[0].type.ndim != 2 or not types_equal(args[0].type.dtype, float32)):
+            raise RuntimeError(f"{op} argument 0 must be a 2d array of floats with one row per vector component")
+
+        return value_type
+
+    return value_func
+
+for soa_type, soa_key in ((vec2, "load_soa_vec2"), (vec3, "load_soa_vec3"), (vec4, "load_soa_vec4")):
+
+    add_builtin(soa_key, input_types={"a": array(dtype=float), "i": int}, value_func=soa_value_func(f"{soa_key}()", soa_type), group="Utility",
+        doc=f"""Load the {soa_type.__name__} at column ``i`` of a struct-of-arrays ``a`` with shape ({type_length(soa_type)}, n), each component is
+   read from its own row so that neighboring threads access contiguous memory.""")
+
+    add_builtin("store_soa", input_types={"a": array(dtype=float), "i": int, "value": soa_type}, value_func=soa_value_func("store_soa()", None), skip_replay=True, group="Utility",
+        doc=f"""Store ``value`` at column ``i`` of a struct-of-arrays ``a`` with shape ({type_length(soa_type)}, n).""")
+
 def atomic_op_value_type(args):
 
-    # check target type
-    if (type(args[0].type) != array):
-        raise RuntimeError("atomic() operation argument 0 must be an array")
+    indices = args[1:-1]
+    check_array_access("atomic() operation", args[0], indices)
     
-    num_indices = len(args[1:-1])
+    num_indices = len(indices)
     num_dims = args[0].type.ndim
 
     # if this happens we should have generated a view instead of a load during code gen
@@ -634,11 +675,6 @@ def atomic_op_value_type(args):
     if num_indices > num_dims:
         raise RuntimeError(f"Num indices > num dimensions for atomic array operation, received {num_indices}, but array only has {num_dims}")
 
-    # check index types
-    for a in args[1:-1]:
-        if type_is_int(a.type) == False:
-            raise RuntimeError(f"atomic() operation index arguments must be of integer type, got index of type {a.type}")
-
     if (args[-1].type != args[0].type.dtype):
         raise RuntimeError(f"atomic() value argument ({args[-1].type}) must be of the same type as the array ({args[0].type.dtype})")
 
@@ -650,6 +686,12 @@ add_builtin("atomic_add", input_types={"a": array(dtype=Any), "i": int, "j": int
 add_builtin("atomic_add", input_types={"a": array(dtype=Any), "i": int, "j": int, "k": int, "value": Any}, value_func=atomic_op_value_type, doc="Atomically add ``value`` onto the array at location given by indices.", group="Utility", skip_replay=True)
 add_builtin("atomic_add", input_types={"a": array(dtype=Any), "i": int, "j": int, "k": int, "l": int, "value": Any}, value_type=atomic_op_value_type, doc="Atomically add ``value`` onto the array at location given by indices.", group="Utility", skip_replay=True)
 
+add_builtin("atomic_add_aggregated", input_types={"a": array(dtype=float), "i": int, "value": float}, value_func=atomic_op_value_type, group="Utility", skip_replay=True,
+    doc="""Atomically add ``value`` onto the array at location given by index, threads of a warp that target the same
+   location first combine their values so that a single atomic is issued per location. Use in place of ``atomic_add()``
+   when many threads scatter onto few locations. The aggregated path is currently disabled and this behaves as a regular
+   ``atomic_add()`` on all devices.""")
+
 add_builtin("atomic_sub", input_types={"a": array(dtype=Any), "i": int, "value": Any}, value_func=atomic_op_value_type, doc="Atomically subtract ``value`` onto the array at location given by index.", group="Utility", skip_replay=True)
 add_builtin("atomic_sub", input_types={"a": array(dtype=Any), "i": int, "j": int, "value": Any}, value_func=atomic_op_value_type, doc="Atomically subtract ``value`` onto the array at location given by indices.", group="Utility", skip_replay=True)
 add_builtin("atomic_sub", input_types={"a": array(dtype=Any), "i": int, "j": int, "k":int, "value": Any}, value_func=atomic_op_value_type, doc="Atomically subtract ``value`` onto the array at location given by indices.", group="Utility", skip_replay=True)
@@ -659,83 +701,70 @@ add_builtin("atomic_sub", input_types={"a": array(dtype=Any), "i": int, "j": int
 # used to index into builtin types, i.e.: y = vec3[1]
 add_builtin("index", variadic=True, hidden=True, value_type=float, group="Utility")
 
-for t in scalar_types + vector_types:
-    add_builtin("expect_eq", input_types={"arg1": t, "arg2": t}, value_type=None, doc="Prints an error to stdout if arg1 and arg2 are not equal", group="Utility")
+def expect_eq_value_func(args):
+    
+    if not any(types_equal(args[0].type, t) for t in scalar_types + vector_types):
+        raise RuntimeError(f"expect_eq() argument must be a scalar or vector type, got {args[0].type}")
+
+    if not types_equal(args[0].type, args[1].type):
+        raise RuntimeError(f"expect_eq() argument types do not match, got {args[0].type} and {args[1].type}")
+
+    return None
+
+add_builtin("expect_eq", input_types={"arg1": Any, "arg2": Any}, value_func=expect_eq_value_func, doc="Prints an error to stdout if arg1 and arg2 are not equal, compiled out when the ``enable_expect`` module option is False", group="Utility", debug_only=True)
 
 # fuzzy compare for float values
-add_builtin("expect_near", input_types={"arg1": float, "arg2": float, "tolerance": float}, value_type=None, doc="Prints an error to stdout if arg1 and arg2 are not closer than tolerance in magnitude", group="Utility")
-add_builtin("expect_near", input_types={"arg1": vec3, "arg2": vec3, "tolerance": float}, value_type=None, doc="Prints an error to stdout if any element of arg1 and arg2 are not closer than tolerance in magnitude", group="Utility")
+add_builtin("expect_near", input_types={"arg1": float, "arg2": float, "tolerance": float}, value_type=None, doc="Prints an error to stdout if arg1 and arg2 are not closer than tolerance in magnitude, compiled out when the ``enable_expect`` module option is False", group="Utility", debug_only=True)
+add_builtin("expect_near", input_types={"arg1": vec3, "arg2": vec3, "tolerance": float}, value_type=None, doc="Prints an error to stdout if any element of arg1 and arg2 are not closer than tolerance in magnitude, compiled out when the ``enable_expect`` module option is False", group="Utility", debug_only=True)
 
 #---------------------------------
 # Operators
 
-add_builtin("add", input_types={"x": int, "y": int}, value_type=int, doc="", group="Operators")
-add_builtin("add", input_types={"x": float, "y": float}, value_type=float, doc="", group="Operators")
-add_builtin("add", input_types={"x": vec2, "y": vec2}, value_type=vec2, doc="", group="Operators")
-add_builtin("add", input_types={"x": vec3, "y": vec3}, value_type=vec3, doc="", group="Operators")
-add_builtin("add", input_types={"x": vec4, "y": vec4}, value_type=vec4, doc="", group="Operators")
-add_builtin("add", input_types={"x": quat, "y": quat}, value_type=quat, doc="", group="Operators")
-add_builtin("add", input_types={"x": mat22, "y": mat22}, value_type=mat22, doc="", group="Operators")
-add_builtin("add", input_types={"x": mat33, "y": mat33}, value_type=mat33, doc="", group="Operators")
-add_builtin("add", input_types={"x": mat44, "y": mat44}, value_type=mat44, doc="", group="Operators")
-add_builtin("add", input_types={"x": spatial_vector, "y": spatial_vector}, value_type=spatial_vector, doc="", group="Operators")
-add_builtin("add", input_types={"x": spatial_matrix, "y": spatial_matrix}, value_type=spatial_matrix, doc="", group="Operators")
-
-add_builtin("sub", input_types={"x": int, "y": int}, value_type=int, doc="", group="Operators")
-add_builtin("sub", input_types={"x": float, "y": float}, value_type=float, doc="", group="Operators")
-add_builtin("sub", input_types={"x": vec2, "y": vec2}, value_type=vec2, doc="", group="Operators")
-add_builtin("sub", input_types={"x": vec3, "y": vec3}, value_type=vec3, doc="", group="Operators")
-add_builtin("sub", input_types={"x": vec4, "y": vec4}, value_type=vec4, doc="", group="Operators")
-add_builtin("sub", input_types={"x": mat22, "y": mat22}, value_type=mat22, doc="", group="Operators")
-add_builtin("sub", input_types={"x": mat33, "y": mat33}, value_type=mat33, doc="", group="Operators")
-add_builtin("sub", input_types={"x": mat44, "y": mat44}, value_type=mat44, doc="", group="Operators")
-add_builtin("sub", input_types={"x": spatial_vector, "y": spatial_vector}, value_type=spatial_vector, doc="", group="Operators")
-add_builtin("sub", input_types={"x": spatial_matrix, "y": spatial_matrix}, value_type=spatial_matrix, doc="", group="Operators")
-
-add_builtin("mul", input_types={"x": int, "y": int}, value_type=int, doc="", group="Operators")
-add_builtin("mul", input_types={"x": float, "y": float}, value_type=float, doc="", group="Operators")
-add_builtin("mul", input_types={"x": float, "y": vec2}, value_type=vec2, doc="", group="Operators")
-add_builtin("mul", input_types={"x": float, "y": vec3}, value_type=vec3, doc="", group="Operators")
-add_builtin("mul", input_types={"x": float, "y": vec4}, value_type=vec4, doc="", group="Operators")
-add_builtin("mul", input_types={"x": float, "y": quat}, value_type=quat, doc="", group="Operators")
-add_builtin("mul", input_types={"x": vec2, "y": float}, value_type=vec2, doc="", group="Operators")
-add_builtin("mul", input_types={"x": vec3, "y": float}, value_type=vec3, doc="", group="Operators")
-add_builtin("mul", input_types={"x": vec4, "y": float}, value_type=vec4, doc="", group="Operators")
-add_builtin("mul", input_types={"x": quat, "y": float}, value_type=quat, doc="", group="Operators")
-add_builtin("mul", input_types={"x": quat, "y": quat}, value_type=quat, doc="", group="Operators")
-add_builtin("mul", input_types={"x": mat22, "y": float}, value_type=mat22, doc="", group="Operators")
-add_builtin("mul", input_types={"x": mat22, "y": vec2}, value_type=vec2, doc="", group="Operators")
-add_builtin("mul", input_types={"x": mat22, "y": mat22}, value_type=mat22, doc="", group="Operators")
-add_builtin("mul", input_types={"x": mat33, "y": float}, value_type=mat33, doc="", group="Operators")
-add_builtin("mul", input_types={"x": mat33, "y": vec3}, value_type=vec3, doc="", group="Operators")
-add_builtin("mul", input_types={"x": mat33, "y": mat33}, value_type=mat33, doc="", group="Operators")
-add_builtin("mul", input_types={"x": mat44, "y": float}, value_type=mat44, doc="", group="Operators")
-add_builtin("mul", input_types={"x": mat44, "y": vec4}, value_type=vec4, doc="", group="Operators")
-add_builtin("mul", input_types={"x": mat44, "y": mat44}, value_type=mat44, doc="", group="Operators")
-add_builtin("mul", input_types={"x": spatial_vector, "y": float}, value_type=spatial_vector, doc="", group="Operators")
-add_builtin("mul", input_types={"x": spatial_matrix, "y": spatial_matrix}, value_type=spatial_matrix, doc="", group="Operators")
-add_builtin("mul", input_types={"x": spatial_matrix, "y": spatial_vector}, value_type=spatial_vector, doc="", group="Operators")
-add_builtin("mul", input_types={"x": transform, "y": transform}, value_type=transform, doc="", group="Operators")
-
-add_builtin("mod", input_types={"x": int, "y": int}, value_type=int, doc="", group="Operators")
-add_builtin("mod", input_types={"x": float, "y": float}, value_type=float, doc="", group="operators")
-
-add_builtin("div", input_types={"x": int, "y": int}, value_type=int, doc="", group="Operators")
-add_builtin("div", input_types={"x": float, "y": float}, value_type=float, doc="", group="Operators")
-add_builtin("div", input_types={"x": vec2, "y": float}, value_type=vec2, doc="", group="Operators")
-add_builtin("div", input_types={"x": vec3, "y": float}, value_type=vec3, doc="", group="Operators")
-add_builtin("div", input_types={"x": vec4, "y": float}, value_type=vec4, doc="", group="Operators")
-
-add_builtin("floordiv", input_types={"x": int, "y": int}, value_type=int, doc="", group="Operators")
-add_builtin("floordiv", input_types={"x": float, "y": float}, value_type=float, doc="", group="Operators")
-
-add_builtin("neg", input_types={"x": int}, value_type=int, doc="", group="Operators")
-add_builtin("neg", input_types={"x": float}, value_type=float, doc="", group="Operators")
-add_builtin("neg", input_types={"x": vec2}, value_type=vec2, doc="", group="Operators")
-add_builtin("neg", input_types={"x": vec3}, value_type=vec3, doc="", group="Operators")
-add_builtin("neg", input_types={"x": vec4}, value_type=vec4, doc="", group="Operators")
-add_builtin("neg", input_types={"x": quat}, value_type=quat, doc="", group="Operators")
-add_builtin("neg", input_types={"x": mat33}, value_type=mat33, doc="", group="Operators")
-add_builtin("neg", input_types={"x": mat44}, value_type=mat44, doc="", group="Operators")
+# binary operators, each overload is given as an (x, y, return) type triple
+for key, signatures in (
+
+    ("add", [(t, t, t) for t in (int, float, vec2, vec3, vec4, quat, mat22, mat33, mat44, spatial_vector, spatial_matrix)]),
+    ("sub", [(t, t, t) for t in (int, float, vec2, vec3, vec4, mat22, mat33, mat44, spatial_vector, spatial_matrix)]),
+
+    ("mul", [(int, int, int),
+             (float, float, float),
+             (float, vec2, vec2),
+             (float, vec3, vec3),
+             (float, vec4, vec4),
+             (float, quat, quat),
+             (vec2, float, vec2),
+             (vec3, float, vec3),
+             (vec4, float, vec4),
+             (quat, float, quat),
+             (quat, quat, quat),
+             (mat22, float, mat22),
+             (mat22, vec2, vec2),
+             (mat22, mat22, mat22),
+             (mat33, float, mat33),
+             (mat33, vec3, vec3),
+             (mat33, mat33, mat33),
+             (mat44, float, mat44),
+             (mat44, vec4, vec4),
+             (mat44, mat44, mat44),
+             (spatial_vector, float, spatial_vector),
+             (spatial_matrix, spatial_matrix, spatial_matrix),
+             (spatial_matrix, spatial_vector, spatial_vector),
+             (transform, transform, transform)]),
+
+    ("mod", [(int, int, int),
+             (float, float, float)]),
+
+    ("div", [(int, int, int),
+             (float, float, float),
+             (vec2, float, vec2),
+             (vec3, float, vec3),
+             (vec4, float, vec4)]),
+
+    ("floordiv", [(int, int, int),
+                  (float, float, float)])):
+
+    add_builtin_overloads(key, [({"x": x, "y": y}, value_type) for x, y, value_type in signatures], doc="", group="Operators")
+
+add_builtin_overloads("neg", [({"x": t}, t) for t in (int, float, vec2, vec3, vec4, quat, mat33, mat44)], doc="", group="Operators")
 
 add_builtin("unot", input_types={"b": bool}, value_type=bool, doc="", group="Operators")
@@ -51,6 +51,13 @@ builtin_operators[ast.LtE] = "<="
 builtin_operators[ast.Eq] = "=="
 builtin_operators[ast.NotEq] = "!="
 
+# integer operators that may be folded when evaluating compile-time loop bounds, division and modulo
+# are left out since Python rounds towards negative infinity whereas the generated C++ truncates
+constant_ops = {}
+constant_ops[ast.Add] = lambda a, b: a + b
+constant_ops[ast.Sub] = lambda a, b: a - b
+constant_ops[ast.Mult] = lambda a, b: a * b
+
 
 class Var:
     def __init__(self, label, type, requires_grad=False, constant=None):
@@ -96,6 +103,75 @@ class Block:
        
 
 
+# canonical type used to key overload resolution, mirrors the equivalence in types_equal()
+def overload_type(t):
+
+    if isinstance(t, array):
+        return array
+    elif t == float:
+        return float32
+    elif t == int:
+        return int32
+    else:
+        return t
+
+
+# resolved builtin overloads keyed on (name, argument types), overloads are only ever appended
+# and the first match wins, so a cached resolution stays valid if more builtins are registered
+builtin_overload_cache = {}
+
+def resolve_overload(func, inputs, min_outputs):
+
+    for f in func:
+        match = True
+
+        # skip type checking for variadic functions
+        if not f.variadic:
+
+            # check argument counts match (todo: default arguments?)
+            if len(f.input_types) != len(inputs):
+                match = False
+                continue
+
+            # check argument types equal
+            for i, a in enumerate(f.input_types.values()):
+                
+                # if arg type registered as Any, treat as 
+                # template allowing any type to match
+                if a == Any:
+                    continue
+
+                # handle function refs as a special case
+                if a == Callable and type(inputs[i]) is warp.context.Function:
+                    continue
+
+                # otherwise check arg type matches input variable type
+                if not types_equal(a, inputs[i].type):
+                    match = False
+                    break
+
+        # check output dimensions match expectations
+        if min_outputs:
+
+            try:
+                value_type = f.value_func(inputs)
+                if len(value_type) != min_outputs:
+                    match = False
+                    continue
+            except Exception as e:
+                
+                # value func may fail if the user has given 
+                # incorrect args, so we need to catch this
+                match = False
+                continue
+
+        # found a match, use it
+        if (match):
+            return f
+
+    return None
+
+
 class Adjoint:
 
 
@@ -268,61 +344,29 @@ class Adjoint:
 
     def add_call(adj, func, inputs, min_outputs=None):
 
+        # builtins are passed as their list of overloads, user functions as a single Function
+        cache_key = None
+
         # promote func to list
         if isinstance(func, list) == False:
             func = [func,]
 
+        elif min_outputs == None and all(isinstance(x, Var) for x in inputs):
+            cache_key = (func[0].key, tuple(overload_type(x.type) for x in inputs))
+
         # if func is overloaded then perform overload resolution here
-        # we validate argument types before they go to generated native code
+        # we validate argument types before they go to generated native code,
+        # exact signatures are indexed at registration, others are cached on first use
         resolved_func = None
 
-        for f in func:
-            match = True
-
-            # skip type checking for variadic functions
-            if not f.variadic:
-
-                # check argument counts match (todo: default arguments?)
-                if len(f.input_types) != len(inputs):
-                    match = False
-                    continue
+        if cache_key:
+            resolved_func = warp.context.builtin_index.get(cache_key) or builtin_overload_cache.get(cache_key)
 
-                # check argument types equal
-                for i, a in enumerate(f.input_types.values()):
-                    
-                    # if arg type registered as Any, treat as 
-                    # template allowing any type to match
-                    if a == Any:
-                        continue
-
-                    # handle function refs as a special case
-                    if a == Callable and type(inputs[i]) is warp.context.Function:
-                        continue
-
-                    # otherwise check arg type matches input variable type
-                    if not types_equal(a, inputs[i].type):
-                        match = False
-                        break
-
-            # check output dimensions match expectations
-            if min_outputs:
-
-                try:
-                    value_type = f.value_func(inputs)
-                    if len(value_type) != min_outputs:
-                        match = False
-                        continue
-                except Exception as e:
-                    
-                    # value func may fail if the user has given 
-                    # incorrect args, so we need to catch this
-                    match = False
-                    continue
+        if resolved_func == None:
+            resolved_func = resolve_overload(func, inputs, min_outputs)
 
-            # found a match, use it
-            if (match):
-                resolved_func = f
-                break
+            if resolved_func and cache_key:
+                builtin_overload_cache[cache_key] = resolved_func
 
         if resolved_func == None:
             
@@ -343,6 +387,10 @@ class Adjoint:
 
         value_type = func.value_func(inputs)
 
+        # debug checks, e.g.: expect_eq(), emit no code when disabled for the module
+        if func.debug_only and not adj.options["enable_expect"]:
+            return None
+
         # handle expression (zero output), e.g.: void do_something();
         if (value_type == None):
 
@@ -803,53 +851,72 @@ class Adjoint:
 
             elif (isinstance(node, ast.For)):
 
-                def is_num(a):
-                    return isinstance(a, ast.Num) or (
-                        isinstance(a, ast.UnaryOp) and
-                        isinstance(a.op, ast.USub) and isinstance(a.operand, ast.Num))
+                # folds integer literals, constant symbols, warp.constant() values and simple arithmetic
+                # on them, e.g.: range(0, 3*2) or range(N) with N = wp.constant(8), returns None
+                # if the expression is not a compile-time integer
+                def eval_constant(a):
 
-                def eval_num(a):
                     if isinstance(a, ast.Num):
-                        return a.n
-                    if (isinstance(a, ast.UnaryOp) and
-                        isinstance(a.op, ast.USub) and isinstance(a.operand, ast.Num)):
-                        return -a.operand.n
+                        if isinstance(a.n, int) and not isinstance(a.n, bool):
+                            return a.n
+
+                    elif isinstance(a, ast.UnaryOp) and isinstance(a.op, ast.USub):
+                        v = eval_constant(a.operand)
+                        if v is not None:
+                            return -v
+
+                    elif isinstance(a, ast.BinOp) and type(a.op) in constant_ops:
+                        l = eval_constant(a.left)
+                        r = eval_constant(a.right)
+                        if l is not None and r is not None:
+                            return constant_ops[type(a.op)](l, r)
+
+                    elif isinstance(a, ast.Name):
+                        # symbols that were bound to a constant (including warp.constant() values that have
+                        # already been referenced), otherwise fall back to the function's globals
+                        if a.id in adj.symbols:
+                            v = getattr(adj.symbols[a.id], "constant", None)
+                        else:
+                            obj = adj.func.__globals__.get(a.id)
+                            v = obj.val if isinstance(obj, warp.constant) else None
+
+                        if isinstance(v, int) and not isinstance(v, bool):
+                            return v
+
                     return None
 
                 # try and unroll simple range() statements that use constant args
                 unrolled = False
 
-                if isinstance(node.iter, ast.Call) and node.iter.func.id == "range":
+                if isinstance(node.iter, ast.Call) and isinstance(node.iter.func, ast.Name) and node.iter.func.id == "range":
                     
-                    is_constant = True
-                    for a in node.iter.args:
+                    # if all range() arguments are compile-time integers we will unroll
+                    range_args = [eval_constant(a) for a in node.iter.args]
+                    is_constant = len(range_args) > 0 and all(a is not None for a in range_args)
 
-                        # if all range() arguments are numeric constants we will unroll
-                        # note that this only handles trivial constants, it will not unroll
-                        # constant compile-time expressions e.g.: range(0, 3*2)
-                        if not is_num(a):
-                            is_constant = False
-                            break
+                    # range() with a zero step raises, leave that to the dynamic loop
+                    if is_constant and len(range_args) == 3 and range_args[2] == 0:
+                        is_constant = False
 
                     if (is_constant):
 
                         # range(end)
-                        if len(node.iter.args) == 1:
+                        if len(range_args) == 1:
                             start = 0
-                            end = eval_num(node.iter.args[0])
+                            end = range_args[0]
                             step = 1
 
                         # range(start, end)
-                        elif len(node.iter.args) == 2:
-                            start = eval_num(node.iter.args[0])
-                            end = eval_num(node.iter.args[1])
+                        elif len(range_args) == 2:
+                            start = range_args[0]
+                            end = range_args[1]
                             step = 1
 
                         # range(start, end, step)
-                        elif len(node.iter.args) == 3:
-                            start = eval_num(node.iter.args[0])
-                            end = eval_num(node.iter.args[1])
-                            step = eval_num(node.iter.args[2])
+                        elif len(range_args) == 3:
+                            start = range_args[0]
+                            end = range_args[1]
+                            step = range_args[2]
 
                         # test if we're above max unroll count
                         max_iters = abs(end-start)//abs(step)
@@ -18,6 +18,8 @@ print_launches = False  # if true will print out launch information
 
 enable_backward = False # disable code gen of backwards pass
 
+enable_expect = True    # default for the enable_expect module option, if false expect_eq() / expect_near() calls are compiled out of kernels
+
 mode = "release"
 verbose = False
 
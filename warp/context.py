@@ -8,9 +8,10 @@
 import math
 import os
 import sys
-import inspect
 import hashlib
 import ctypes
+import functools
+import concurrent.futures
 
 from typing import Tuple
 from typing import List
@@ -39,7 +40,8 @@ class Function:
                  doc="",
                  group="",
                  hidden=False,
-                 skip_replay=False):
+                 skip_replay=False,
+                 debug_only=False):
         
         self.func = func   # points to Python function decorated with @wp.func, may be None for builtins
         self.key = key
@@ -52,6 +54,7 @@ class Function:
         self.variadic = variadic        # function can take arbitrary number of inputs, e.g.: printf()
         self.hidden = hidden            # function will not be listed in docs
         self.skip_replay = skip_replay  # whether or not operation will be performed during the forward replay in the backward pass
+        self.debug_only = debug_only    # call is only emitted when the module has the enable_expect option set, e.g.: expect_eq()
 
         if (func):
             self.adj = warp.codegen.Adjoint(func)
@@ -64,6 +67,16 @@ class Function:
         if (module):
             module.register_function(self)
 
+# wrap the arg_type (which is an ctypes.Array) in a structure to ensure parameter is passed
+# to the .dll by value rather than reference, created once per type and shared by all kernels
+@functools.lru_cache(maxsize=None)
+def _value_arg_struct(arg_type):
+
+    class ValueArg(ctypes.Structure):
+        _fields_ = [ ('value', arg_type)]
+
+    return ValueArg
+
 # caches source and compiled entry points for a kernel (will be populated after module loads)
 class Kernel:
     
@@ -79,11 +92,125 @@ class Kernel:
         self.forward_cuda = None
         self.backward_cuda = None
 
-        self.adj = warp.codegen.Adjoint(func)
+        # parsed on first use, i.e.: when the module is hashed or built, so that
+        # importing a file of kernels that are never launched does not parse them
+        self._adj = None
+
+        # launch argument packers, built on first launch
+        self._arg_packers = None
 
         if (module):
             module.register_kernel(self)
 
+    @property
+    def adj(self):
+
+        if self._adj is None:
+            self._adj = warp.codegen.Adjoint(self.func)
+
+        return self._adj
+
+    # returns one function per kernel argument that converts a launch argument to the ctype the kernel expects,
+    # the type dispatch happens once here rather than for every argument of every launch
+    def get_arg_packers(self):
+
+        if self._arg_packers is None:
+            self._arg_packers = [self.make_arg_packer(arg) for arg in self.adj.args]
+
+        return self._arg_packers
+
+    def make_arg_packer(self, arg):
+
+        arg_type = arg.type
+        arg_name = arg.label
+
+        if (isinstance(arg_type, warp.types.array)):
+
+            dtype = arg_type.dtype
+            ndim = arg_type.ndim
+
+            def pack_array(a, device):
+
+                if (a is None):
+                    
+                    # allow for NULL arrays
+                    return warp.types.array_t()
+
+                # check for array value
+                if (isinstance(a, warp.types.array) == False):
+                    raise RuntimeError(f"Error launching kernel '{self.key}', argument '{arg_name}' expects an array, but passed value has type {type(a)}.")
+                
+                # check subtype
+                if (a.dtype != dtype):
+                    raise RuntimeError(f"Error launching kernel '{self.key}', argument '{arg_name}' expects an array with dtype={dtype} but passed array has dtype={a.dtype}.")
+
+                # check dimensions
+                if (a.ndim != ndim):
+                    raise RuntimeError(f"Error launching kernel '{self.key}', argument '{arg_name}' expects an array with dimensions {ndim} but the passed array has dimensions {a.ndim}.")
+
+                # check device
+                if (a.device != device):
+                    raise RuntimeError(f"Error launching kernel '{self.key}', trying to launch on device='{device}', but input array for argument '{arg_name}' is on device={a.device}.")
+                
+                return a.__ctype__()
+
+            return pack_array
+
+        # try to convert to a value type (vec3, mat33, etc)
+        elif issubclass(arg_type, ctypes.Array):
+
+            length = arg_type._length_
+
+            ValueArg = _value_arg_struct(arg_type)
+
+            def pack_value(a, device):
+
+                x = ValueArg()
+
+                try:
+                    # values that are already flat sequences of scalars (wp.vec3, tuple, list, Gf.Vec3)
+                    # are written straight into the ctypes array without going through numpy
+                    if len(a) != length:
+                        raise TypeError()
+
+                    x.value[:] = a
+
+                except Exception:
+
+                    # otherwise flatten through numpy, e.g.: nested lists or 2D arrays for matrices
+                    v = np.ravel(a)
+                    if (len(v) != length):
+                        raise RuntimeError(f"Error launching kernel '{self.key}', parameter for argument '{arg_name}' has length {len(v)}, but expected {length}. Could not convert parameter to {arg_type}.")
+
+                    x.value[:] = v.tolist()
+
+                return x
+
+            return pack_value
+
+        elif (arg_type == warp.types.float16):
+
+            def pack_half(a, device):
+
+                # pass the raw bits of the half precision value
+                return arg_type._type_(np.float16(a).view(np.uint16))
+
+            return pack_half
+
+        else:
+
+            scalar_type = arg_type._type_
+
+            def pack_scalar(a, device):
+
+                try:
+                    # try to pack as a scalar type
+                    return scalar_type(a)
+                except:
+                    raise RuntimeError(f"Error launching kernel, unable to pack kernel parameter type {type(a)} for param {arg_name}, expected {arg_type}")
+
+            return pack_scalar
+
     # lookup and cache entry points based on name, called after compilation / module load
     def hook(self):
 
@@ -92,10 +219,10 @@ class Kernel:
 
         if (dll):
 
-            try:
-                self.forward_cpu = eval("dll." + self.key + "_cpu_forward")
-                self.backward_cpu = eval("dll." + self.key + "_cpu_backward")
-            except:
+            self.forward_cpu = getattr(dll, self.key + "_cpu_forward", None)
+            self.backward_cpu = getattr(dll, self.key + "_cpu_backward", None)
+
+            if self.forward_cpu is None or self.backward_cpu is None:
                 print(f"Could not load CPU methods for kernel {self.key}")
 
         if (cuda):
@@ -128,35 +255,139 @@ def kernel(f):
 
 builtin_functions = {}
 
-def add_builtin(key, input_types={}, value_type=None, value_func=None, doc="", namespace="wp::", variadic=False, group="Other", hidden=False, skip_replay=False):
+# exact-signature index of the builtin overloads, keyed on (name, canonical argument types) the same way
+# as the codegen overload cache, so the first call with a given signature does not need to scan the overloads
+builtin_index = {}
+
+def index_builtin(func):
+
+    if func.variadic or any(t == Any or t == Callable for t in func.input_types.values()):
+        return
+
+    signature = list(func.input_types.values())
+    key = (func.key, tuple(warp.codegen.overload_type(t) for t in signature))
+
+    if key in builtin_index:
+        return
+
+    # overload resolution returns the first match, so an earlier variadic or Any overload shadows this one
+    for f in builtin_functions[func.key]:
+        if f.variadic or (len(f.input_types) == len(signature) and
+                          all(a == Any or types_equal(a, t) for a, t in zip(f.input_types.values(), signature))):
+            builtin_index[key] = f
+            return
+
+# value_func() wrappers for builtins with a fixed return type, shared between all builtins returning that type
+builtin_value_funcs = {}
+
+def builtin_value_func(value_type):
+
+    def value_func(args):
+        return value_type
+
+    # multiple return values are given as a list, which cannot be used as a key
+    if isinstance(value_type, list):
+        return value_func
+
+    return builtin_value_funcs.setdefault(value_type, value_func)
+
+
+def create_builtin(key, input_types={}, value_type=None, value_func=None, doc="", namespace="wp::", variadic=False, group="Other", hidden=False, skip_replay=False, debug_only=False):
 
     # wrap simple single-type functions with a value_func()
     if value_func == None:
-        def value_func(args):
-            return value_type
-        
-    func = Function(func=None,
-                    key=key,
+        value_func = builtin_value_func(value_type)
+
+    return Function(func=None,
+                    key=sys.intern(key),
                     namespace=namespace,
                     input_types=input_types,
                     value_func=value_func,
                     variadic=variadic,
                     doc=doc,
-                    group=group,
+                    group=sys.intern(group),
                     hidden=hidden,
-                    skip_replay=skip_replay)
+                    skip_replay=skip_replay,
+                    debug_only=debug_only)
 
-    if key in builtin_functions:
-        # if key exists we add overload
-        builtin_functions[key].append(func)
-    else:
-        # insert into dict
-        builtin_functions[key] = [func]
+
+def add_builtin(key, input_types={}, value_type=None, value_func=None, doc="", namespace="wp::", variadic=False, group="Other", hidden=False, skip_replay=False, debug_only=False):
+
+    func = create_builtin(key,
+                          input_types=input_types,
+                          value_type=value_type,
+                          value_func=value_func,
+                          doc=doc,
+                          namespace=namespace,
+                          variadic=variadic,
+                          group=group,
+                          hidden=hidden,
+                          skip_replay=skip_replay,
+                          debug_only=debug_only)
+
+    # if key exists we add overload
+    builtin_functions.setdefault(key, []).append(func)
+    index_builtin(func)
+
+
+# registers all overloads of a builtin at once, overloads is a sequence of (input_types, value_type) pairs
+# that share the remaining arguments, the overload list for the key is only looked up once
+def add_builtin_overloads(key, overloads, **kwargs):
+
+    funcs = [create_builtin(key, input_types=input_types, value_type=value_type, **kwargs) for input_types, value_type in overloads]
+
+    builtin_functions.setdefault(key, []).extend(funcs)
+
+    for func in funcs:
+        index_builtin(func)
+
+
+# hash of the builtin signatures, of the native headers that generated code is compiled against
+# and of the build environment (Warp version, CUDA device, host compiler), included in every module
+# hash so that cached kernels are rebuilt whenever any of them changes
+builtins_hash = None
+
+def get_builtins_hash():
+
+    global builtins_hash
+
+    if builtins_hash is None:
+
+        h = hashlib.sha256()
+
+        # builtin signatures
+        for key, funcs in builtin_functions.items():
+            for f in funcs:
+                args = ", ".join(f"{k}: {type_str(v)}" for k, v in f.input_types.items())
+                h.update(bytes(f"{f.namespace}{key}({args})", 'utf-8'))
+
+        # native headers
+        native_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), "native")
+
+        for name in sorted(os.listdir(native_dir)):
+            if name.endswith(".h"):
+                with open(os.path.join(native_dir, name), 'rb') as f:
+                    h.update(f.read())
+
+        # build environment, the device name determines the architecture PTX is compiled for
+        h.update(bytes(warp.config.version, 'utf-8'))
+        h.update(runtime.core.cuda_get_device_name() or b"")
+        h.update(bytes(str(warp.config.host_compiler), 'utf-8'))
+
+        builtins_hash = h.digest()
+
+    return builtins_hash
 
 
 # global dictionary of modules
 user_modules = {}
 
+# loaded (dll, cuda module) pairs keyed on module hash, shared by all modules in the process
+module_binaries = {}
+
+# modules that may need loading, keyed on name, so force_load() does not need to scan every module
+unloaded_modules = {}
+
 def get_module(m):
 
     if (m not in user_modules):
@@ -184,45 +415,55 @@ class Module:
         self.loaded = False
         self.build_failed = False
 
+        unloaded_modules[self.name] = self
+
+        # running hash of the function and kernel sources, invalidated when either
+        # is registered, options and constants may change at any time so are hashed on each call
+        self.source_hash = None
+
         self.options = {"max_unroll": 16,
-                        "mode": warp.config.mode}
+                        "mode": warp.config.mode,
+                        "enable_expect": warp.config.enable_expect}
 
     def register_kernel(self, kernel):
 
         if kernel.key in self.kernels:
             
             # if kernel is replacing an old one then assume it has changed and 
-            # force a rebuild / reload of the dynamic library 
-            if (self.dll):
-                warp.build.unload_dll(self.dll)
-
-            if (self.cuda):
-                runtime.core.cuda_unload_module(self.cuda)
-                
+            # force a rebuild / reload of the dynamic library, the old binaries
+            # stay loaded in module_binaries in case the module hash returns to them
             self.dll = None
             self.cuda = None
             self.loaded = False
 
+            unloaded_modules[self.name] = self
+
         # register new kernel
         self.kernels[kernel.key] = kernel
+        self.source_hash = None
 
 
     def register_function(self, func):
         self.functions[func.key] = func
+        self.source_hash = None
 
     def hash_module(self):
         
-        h = hashlib.sha256()
+        if self.source_hash is None:
 
-        # functions source
-        for func in self.functions.values():
-            s = func.adj.source
-            h.update(bytes(s, 'utf-8'))
-            
-        # kernel source
-        for kernel in self.kernels.values():       
-            s = kernel.adj.source
-            h.update(bytes(s, 'utf-8'))
+            self.source_hash = hashlib.sha256()
+
+            # functions source
+            for func in self.functions.values():
+                s = func.adj.source
+                self.source_hash.update(bytes(s, 'utf-8'))
+                
+            # kernel source
+            for kernel in self.kernels.values():       
+                s = kernel.adj.source
+                self.source_hash.update(bytes(s, 'utf-8'))
+
+        h = self.source_hash.copy()
 
         # configuration parameters
         for k in sorted(self.options.keys()):
@@ -232,6 +473,9 @@ class Module:
         # compile-time constants (global)
         h.update(constant.get_hash())
 
+        # builtins and native headers (global)
+        h.update(get_builtins_hash())
+
         return h.digest()
 
     def load(self):
@@ -250,8 +494,20 @@ class Module:
             build_path = warp.build.kernel_bin_dir
             gen_path = warp.build.kernel_gen_dir
 
-            hash_path = os.path.join(build_path, module_name + ".hash")
-            module_path = os.path.join(build_path, module_name)
+            # test cache
+            module_hash = self.hash_module()
+
+            # binaries already loaded by this process
+            if warp.config.cache_kernels and module_hash in module_binaries:
+                
+                self.dll, self.cuda = module_binaries[module_hash]
+                self.unhook_kernels()
+                self.loaded = True
+                return True
+
+            # binaries are content addressed so that different versions of a module never share a path,
+            # a path that exists always holds a complete build since builds are moved into place on success
+            module_path = os.path.join(build_path, module_name + "_" + module_hash.hex()[:16])
 
             ptx_path = module_path + ".ptx"
 
@@ -260,38 +516,30 @@ class Module:
             else:
                 dll_path = module_path + ".so"
 
-            if (os.path.exists(build_path) == False):
-                os.mkdir(build_path)
-
-            # test cache
-            module_hash = self.hash_module()
+            os.makedirs(build_path, exist_ok=True)
 
             build_cpu = enable_cpu
             build_cuda = enable_cuda
 
-            if warp.config.cache_kernels and os.path.exists(hash_path):
+            if warp.config.cache_kernels:
 
-                f = open(hash_path, 'rb')
-                cache_hash = f.read()
-                f.close()
+                if enable_cpu and os.path.isfile(dll_path):
+                    self.dll = warp.build.load_dll(dll_path)
+                    if self.dll is not None:
+                        build_cpu = False
 
-                if cache_hash == module_hash:
-                    
-                    if enable_cpu and os.path.isfile(dll_path):
-                        self.dll = warp.build.load_dll(dll_path)
-                        if self.dll is not None:
-                            build_cpu = False
-
-                    if enable_cuda and os.path.isfile(ptx_path):
-                        self.cuda = warp.build.load_cuda(ptx_path)
-                        if self.cuda is not None:
-                            build_cuda = False
-
-                    if not build_cuda and not build_cpu:
-                        if warp.config.verbose:
-                            print("Warp: Using cached kernels for module {}".format(self.name))
-                        self.loaded = True
-                        return True
+                if enable_cuda and os.path.isfile(ptx_path):
+                    self.cuda = warp.build.load_cuda(ptx_path)
+                    if self.cuda is not None:
+                        build_cuda = False
+
+                if not build_cuda and not build_cpu:
+                    if warp.config.verbose:
+                        print("Warp: Using cached kernels for module {}".format(self.name))
+                    module_binaries[module_hash] = (self.dll, self.cuda)
+                    self.unhook_kernels()
+                    self.loaded = True
+                    return True
 
             if warp.config.verbose:
                 print("Warp: Rebuilding kernels for module {}".format(self.name))
@@ -299,11 +547,11 @@ class Module:
             # generate kernel source
             if build_cpu:
                 cpp_path = os.path.join(gen_path, module_name + ".cpp")
-                cpp_source = warp.codegen.cpu_module_header
+                cpp_source = [warp.codegen.cpu_module_header]
             
             if build_cuda:
                 cu_path = os.path.join(gen_path, module_name + ".cu")
-                cu_source = warp.codegen.cuda_module_header
+                cu_source = [warp.codegen.cuda_module_header]
 
             # kernels
             entry_points = []
@@ -314,10 +562,10 @@ class Module:
                 func.adj.build(builtin_functions, self.functions, self.options)
                 
                 if build_cpu:
-                    cpp_source += warp.codegen.codegen_func(func.adj, device="cpu")
+                    cpp_source.append(warp.codegen.codegen_func(func.adj, device="cpu"))
 
                 if build_cuda:
-                    cu_source += warp.codegen.codegen_func(func.adj, device="cuda")
+                    cu_source.append(warp.codegen.codegen_func(func.adj, device="cuda"))
 
                 # complete the function return type after we have analyzed it (inferred from return statement in ast)
                 def wrap(adj):
@@ -342,42 +590,58 @@ class Module:
                     entry_points.append(kernel.func.__name__ + "_cpu_forward")
                     entry_points.append(kernel.func.__name__ + "_cpu_backward")
 
-                    cpp_source += warp.codegen.codegen_kernel(kernel, device="cpu")
-                    cpp_source += warp.codegen.codegen_module(kernel, device="cpu")
+                    cpp_source.append(warp.codegen.codegen_kernel(kernel, device="cpu"))
+                    cpp_source.append(warp.codegen.codegen_module(kernel, device="cpu"))
 
                 if build_cuda:
                     entry_points.append(kernel.func.__name__ + "_cuda_forward")
                     entry_points.append(kernel.func.__name__ + "_cuda_backward")
 
-                    cu_source += warp.codegen.codegen_kernel(kernel, device="cuda")
-                    cu_source += warp.codegen.codegen_module(kernel, device="cuda")
+                    cu_source.append(warp.codegen.codegen_kernel(kernel, device="cuda"))
+                    cu_source.append(warp.codegen.codegen_module(kernel, device="cuda"))
 
 
             # write cpp sources
             if build_cpu:
                 cpp_file = open(cpp_path, "w")
-                cpp_file.write(cpp_source)
+                cpp_file.writelines(cpp_source)
                 cpp_file.close()
 
             # write cuda sources
             if build_cuda:
                 cu_file = open(cu_path, "w")
-                cu_file.write(cu_source)
+                cu_file.writelines(cu_source)
                 cu_file.close()
         
             try:
-                if build_cpu:
+                # build to a process-local path first, a concurrent or interrupted
+                # build must never leave a partial binary at the content-addressed path
+                tmp_ext = f".{os.getpid()}.tmp"
+
+                def compile_cpu():
                     with ScopedTimer("Compile x86", active=warp.config.verbose):
-                        warp.build.build_dll(cpp_path, None, dll_path, config=self.options["mode"])
+                        warp.build.build_dll(cpp_path, None, dll_path + tmp_ext, config=self.options["mode"])
+                        os.replace(dll_path + tmp_ext, dll_path)
 
-                if build_cuda:
+                def compile_cuda():
                     with ScopedTimer("Compile CUDA", active=warp.config.verbose):
-                        warp.build.build_cuda(cu_path, ptx_path, config=self.options["mode"])
+                        warp.build.build_cuda(cu_path, ptx_path + tmp_ext, config=self.options["mode"])
+                        os.replace(ptx_path + tmp_ext, ptx_path)
+
+                if build_cpu and build_cuda:
 
-                # update cached output
-                f = open(hash_path, 'wb')
-                f.write(module_hash)
-                f.close()
+                    # the host compiler runs as a subprocess and NVRTC releases the GIL, so
+                    # overlap the two builds, CUDA stays on this thread which owns the context
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                        cpu_build = executor.submit(compile_cpu)
+                        compile_cuda()
+                        cpu_build.result()
+
+                elif build_cpu:
+                    compile_cpu()
+
+                elif build_cuda:
+                    compile_cuda()
 
             except Exception as e:
                 self.build_failed = True
@@ -396,9 +660,22 @@ class Module:
             if enable_cuda and self.cuda is None:
                 raise Exception("Failed to load CUDA module")
 
+            module_binaries[module_hash] = (self.dll, self.cuda)
+            self.unhook_kernels()
+
             self.loaded = True
             return True
 
+    # the module may have switched to the binaries of another version, so kernels
+    # look up their entry points again on the next launch
+    def unhook_kernels(self):
+
+        for kernel in self.kernels.values():
+            kernel.forward_cpu = None
+            kernel.backward_cpu = None
+            kernel.forward_cuda = None
+            kernel.backward_cuda = None
+
 #-------------------------------------------
 # exectution context
 
@@ -406,6 +683,10 @@ class Module:
 # on size to avoid hitting the system allocator
 class Allocator:
 
+    # maximum number of free allocs cached per size, and in total bytes
+    max_pool_allocs = 32
+    max_pool_bytes = 32*1024*1024
+
     def __init__(self, alloc_func, free_func):
 
         # map from sizes to array of allocs
@@ -414,30 +695,65 @@ class Allocator:
 
         # map from size->list[allocs]
         self.pool = {}
+        self.pool_bytes = 0
+
+        # map from addr->pooled size for live allocs made by this allocator, pointers
+        # passed in from elsewhere are not in here and are always freed directly
+        self.sizes = {}
 
     def __del__(self):
-        self.clear()       
+        
+        # may run during interpreter shutdown after ctypes has been torn down,
+        # in which case the OS reclaims the cached allocs
+        try:
+            self.clear()
+        except Exception:
+            pass
+
+    # rounds up to 256 bytes, then to one of 4 steps between consecutive powers of two,
+    # so that similar sizes share a pool while over-allocating by at most 25%
+    @staticmethod
+    def pool_size(size_in_bytes):
+
+        if size_in_bytes <= 256:
+            return 256
+
+        step = 1 << max((size_in_bytes - 1).bit_length() - 3, 8)
+        return (size_in_bytes + step - 1) // step * step
 
     def alloc(self, size_in_bytes):
         
-        p = self.alloc_func(size_in_bytes)
-        return p
+        size = Allocator.pool_size(size_in_bytes)
+
+        allocs = self.pool.get(size)
+
+        if allocs:
+            p = allocs.pop()
+            self.pool_bytes -= size
+        else:
+            p = self.alloc_func(size)
 
-        # if size_in_bytes in self.pool and len(self.pool[size_in_bytes]) > 0:            
-        #     return self.pool[size_in_bytes].pop()
-        # else:
-        #     return self.alloc_func(size_in_bytes)
+            # memory pressure, release cached allocs and try again
+            if not p and self.pool_bytes > 0:
+                self.clear()
+                p = self.alloc_func(size)
+
+        if p:
+            self.sizes[p] = size
+
+        return p
 
     def free(self, addr, size_in_bytes):
 
-        addr = ctypes.cast(addr, ctypes.c_void_p)
-        self.free_func(addr)
-        return
+        size = self.sizes.pop(addr, None)
+
+        if size is None or len(self.pool.get(size, ())) >= Allocator.max_pool_allocs or self.pool_bytes + size > Allocator.max_pool_bytes:
+            addr = ctypes.cast(addr, ctypes.c_void_p)
+            self.free_func(addr)
+            return
 
-        # if size_in_bytes not in self.pool:
-        #     self.pool[size_in_bytes] = [addr,]
-        # else:
-        #     self.pool[size_in_bytes].append(addr)
+        self.pool.setdefault(size, []).append(addr)
+        self.pool_bytes += size
 
     def print(self):
         
@@ -451,11 +767,84 @@ class Allocator:
 
 
     def clear(self):
+        """Release all cached free allocations back to the system allocator.
+
+        Live allocations are not affected. Can be called directly to trim the cache, e.g.:
+        ``wp.context.runtime.device_allocator.clear()``
+        """
+
         for s in self.pool.values():
             for a in s:
-                self.free_func(a)
+                self.free_func(ctypes.cast(a, ctypes.c_void_p))
         
         self.pool = {}
+        self.pool_bytes = 0
+
+# ctypes signatures of the warp.dll entry points, name -> (argtypes, restype)
+_core_signatures = {
+    "init": ([], ctypes.c_int),
+    "synchronize": ([], None),
+
+    "alloc_host": ([ctypes.c_size_t], ctypes.c_void_p),
+    "alloc_device": ([ctypes.c_size_t], ctypes.c_void_p),
+    "free_host": ([ctypes.c_void_p], None),
+    "free_device": ([ctypes.c_void_p], None),
+
+    "memset_host": ([ctypes.c_void_p, ctypes.c_int, ctypes.c_size_t], None),
+    "memset_device": ([ctypes.c_void_p, ctypes.c_int, ctypes.c_size_t], None),
+
+    "memcpy_h2h": ([ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t], None),
+    "memcpy_h2d": ([ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t], None),
+    "memcpy_d2h": ([ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t], None),
+    "memcpy_d2d": ([ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t], None),
+
+    "mesh_create_host": ([ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int], ctypes.c_uint64),
+    "mesh_create_device": ([ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int], ctypes.c_uint64),
+    "mesh_destroy_host": ([ctypes.c_uint64], None),
+    "mesh_destroy_device": ([ctypes.c_uint64], None),
+    "mesh_refit_host": ([ctypes.c_uint64], None),
+    "mesh_refit_device": ([ctypes.c_uint64], None),
+
+    "hash_grid_create_host": ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_uint64),
+    "hash_grid_destroy_host": ([ctypes.c_uint64], None),
+    "hash_grid_update_host": ([ctypes.c_uint64, ctypes.c_float, ctypes.c_void_p, ctypes.c_int], None),
+    "hash_grid_reserve_host": ([ctypes.c_uint64, ctypes.c_int], None),
+
+    "hash_grid_create_device": ([ctypes.c_int, ctypes.c_int, ctypes.c_int], ctypes.c_uint64),
+    "hash_grid_destroy_device": ([ctypes.c_uint64], None),
+    "hash_grid_update_device": ([ctypes.c_uint64, ctypes.c_float, ctypes.c_void_p, ctypes.c_int], None),
+    "hash_grid_reserve_device": ([ctypes.c_uint64, ctypes.c_int], None),
+
+    "volume_create_host": ([ctypes.c_void_p, ctypes.c_uint64], ctypes.c_uint64),
+    "volume_get_buffer_info_host": ([ctypes.c_uint64, ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_uint64)], None),
+    "volume_destroy_host": ([ctypes.c_uint64], None),
+
+    "volume_create_device": ([ctypes.c_void_p, ctypes.c_uint64], ctypes.c_uint64),
+    "volume_get_buffer_info_device": ([ctypes.c_uint64, ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_uint64)], None),
+    "volume_destroy_device": ([ctypes.c_uint64], None),
+
+    # CUDA entry points, stubbed when built without CUDA
+    "cuda_check_device": ([], ctypes.c_uint64),
+    "cuda_get_context": ([], ctypes.c_void_p),
+    "cuda_get_stream": ([], ctypes.c_void_p),
+    "cuda_get_device_name": ([], ctypes.c_char_p),
+    "cuda_report_error": ([ctypes.c_int, ctypes.c_char_p, ctypes.c_int], None),
+
+    "cuda_acquire_context": ([], None),
+    "cuda_restore_context": ([], None),
+    "cuda_set_context": ([ctypes.c_void_p], None),
+
+    "cuda_graph_begin_capture": ([], None),
+    "cuda_graph_end_capture": ([], ctypes.c_void_p),
+    "cuda_graph_launch": ([ctypes.c_void_p], None),
+    "cuda_graph_destroy": ([ctypes.c_void_p], None),
+
+    "cuda_compile_program": ([ctypes.c_char_p, ctypes.c_char_p, ctypes.c_bool, ctypes.c_bool, ctypes.c_char_p], ctypes.c_size_t),
+    "cuda_load_module": ([ctypes.c_char_p], ctypes.c_void_p),
+    "cuda_unload_module": ([ctypes.c_void_p], None),
+    "cuda_get_kernel": ([ctypes.c_void_p, ctypes.c_char_p], ctypes.c_void_p),
+    "cuda_launch_kernel": ([ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_void_p)], ctypes.c_size_t),
+}
 
 class Runtime:
 
@@ -490,65 +879,10 @@ class Runtime:
             self.core = warp.build.load_dll(warp_lib)
 
         # setup c-types for warp.dll
-        self.core.alloc_host.restype = ctypes.c_void_p
-        self.core.alloc_device.restype = ctypes.c_void_p
-        
-        self.core.mesh_create_host.restype = ctypes.c_uint64
-        self.core.mesh_create_host.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
-
-        self.core.mesh_create_device.restype = ctypes.c_uint64
-        self.core.mesh_create_device.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
-
-        self.core.mesh_destroy_host.argtypes = [ctypes.c_uint64]
-        self.core.mesh_destroy_device.argtypes = [ctypes.c_uint64]
-
-        self.core.mesh_refit_host.argtypes = [ctypes.c_uint64]
-        self.core.mesh_refit_device.argtypes = [ctypes.c_uint64]
-
-        self.core.hash_grid_create_host.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
-        self.core.hash_grid_create_host.restype = ctypes.c_uint64
-        self.core.hash_grid_destroy_host.argtypes = [ctypes.c_uint64]
-        self.core.hash_grid_update_host.argtypes = [ctypes.c_uint64, ctypes.c_float, ctypes.c_void_p, ctypes.c_int]
-        self.core.hash_grid_reserve_host.argtypes = [ctypes.c_uint64, ctypes.c_int]
-
-        self.core.hash_grid_create_device.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
-        self.core.hash_grid_create_device.restype = ctypes.c_uint64
-        self.core.hash_grid_destroy_device.argtypes = [ctypes.c_uint64]
-        self.core.hash_grid_update_device.argtypes = [ctypes.c_uint64, ctypes.c_float, ctypes.c_void_p, ctypes.c_int]
-        self.core.hash_grid_reserve_device.argtypes = [ctypes.c_uint64, ctypes.c_int]
-
-        self.core.volume_create_host.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
-        self.core.volume_create_host.restype = ctypes.c_uint64
-        self.core.volume_get_buffer_info_host.argtypes = [ctypes.c_uint64, ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_uint64)]
-        self.core.volume_destroy_host.argtypes = [ctypes.c_uint64]
-
-        self.core.volume_create_device.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
-        self.core.volume_create_device.restype = ctypes.c_uint64
-        self.core.volume_get_buffer_info_device.argtypes = [ctypes.c_uint64, ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_uint64)]
-        self.core.volume_destroy_device.argtypes = [ctypes.c_uint64]
-
-        # load CUDA entry points on supported platforms
-        self.core.cuda_check_device.restype = ctypes.c_uint64
-        self.core.cuda_get_context.restype = ctypes.c_void_p
-        self.core.cuda_get_stream.restype = ctypes.c_void_p
-        self.core.cuda_graph_end_capture.restype = ctypes.c_void_p
-        self.core.cuda_get_device_name.restype = ctypes.c_char_p
-
-        self.core.cuda_compile_program.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_bool, ctypes.c_bool, ctypes.c_char_p]
-        self.core.cuda_compile_program.restype = ctypes.c_size_t
-
-        self.core.cuda_load_module.argtypes = [ctypes.c_char_p]
-        self.core.cuda_load_module.restype = ctypes.c_void_p
-
-        self.core.cuda_unload_module.argtypes = [ctypes.c_void_p]
-
-        self.core.cuda_get_kernel.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
-        self.core.cuda_get_kernel.restype = ctypes.c_void_p
-        
-        self.core.cuda_launch_kernel.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_void_p)]
-        self.core.cuda_launch_kernel.restype = ctypes.c_size_t
-
-        self.core.init.restype = ctypes.c_int
+        for name, (argtypes, restype) in _core_signatures.items():
+            func = getattr(self.core, name)
+            func.argtypes = argtypes
+            func.restype = restype
         
         error = self.core.init()
 
@@ -558,14 +892,14 @@ class Runtime:
         # allocation functions, these are function local to 
         # force other classes to go through the allocator objects
         def alloc_host(num_bytes):
-            ptr = self.core.alloc_host(num_bytes)       
+            ptr = self.core.alloc_host(num_bytes)
             return ptr
 
         def free_host(ptr):
-            self.core.free_host(ctypes.cast(ptr, ctypes.POINTER(ctypes.c_int)))
+            self.core.free_host(ptr)
 
         def alloc_device(num_bytes):
-            ptr = self.core.alloc_device(ctypes.c_size_t(num_bytes))
+            ptr = self.core.alloc_device(num_bytes)
             return ptr
 
         def free_device(ptr):
@@ -577,6 +911,13 @@ class Runtime:
         self.host_allocator = Allocator(alloc_host, free_host)
         self.device_allocator = Allocator(alloc_device, free_device)
 
+        # memcpy entry points keyed on (src device, dest device)
+        self.memcpy_funcs = {
+            ("cpu", "cuda"): self.core.memcpy_h2d,
+            ("cuda", "cpu"): self.core.memcpy_d2h,
+            ("cpu", "cpu"): self.core.memcpy_h2h,
+            ("cuda", "cuda"): self.core.memcpy_d2d }
+
         # save context
         self.cuda_device = self.core.cuda_get_context()
         self.cuda_stream = self.core.cuda_get_stream()
@@ -685,11 +1026,11 @@ def zeros(shape: Tuple=None, dtype=float, device: str="cpu", requires_grad: bool
 
     if device == "cpu":
         ptr = runtime.host_allocator.alloc(num_bytes) 
-        runtime.core.memset_host(ctypes.cast(ptr,ctypes.POINTER(ctypes.c_int)), ctypes.c_int(0), ctypes.c_size_t(num_bytes))
+        runtime.core.memset_host(ptr, 0, num_bytes)
 
     elif device == "cuda":
         ptr = runtime.device_allocator.alloc(num_bytes)
-        runtime.core.memset_device(ctypes.cast(ptr,ctypes.POINTER(ctypes.c_int)), ctypes.c_int(0), ctypes.c_size_t(num_bytes))
+        runtime.core.memset_device(ptr, 0, num_bytes)
 
     if (ptr == None and num_bytes > 0):
         raise RuntimeError("Memory allocation failed on device: {} for {} bytes".format(device, num_bytes))
@@ -803,79 +1144,28 @@ def launch(kernel, dim: Tuple[int], inputs:List, outputs:List=[], adj_inputs:Lis
         params = []
         params.append(bounds)
 
-        # converts arguments to kernel's expected ctypes and packs into params
-        def pack_args(args, params):
-
-            for i, a in enumerate(args):
-
-                arg_type = kernel.adj.args[i].type
-                arg_name = kernel.adj.args[i].label
-
-                if (isinstance(arg_type, warp.types.array)):
-
-                    if (a is None):
-                        
-                        # allow for NULL arrays
-                        params.append(warp.types.array_t())
-
-                    else:
-
-                        # check for array value
-                        if (isinstance(a, warp.types.array) == False):
-                            raise RuntimeError(f"Error launching kernel '{kernel.key}', argument '{arg_name}' expects an array, but passed value has type {type(a)}.")
-                        
-                        # check subtype
-                        if (a.dtype != arg_type.dtype):
-                            raise RuntimeError(f"Error launching kernel '{kernel.key}', argument '{arg_name}' expects an array with dtype={arg_type.dtype} but passed array has dtype={a.dtype}.")
-
-                        # check dimensions
-                        if (a.ndim != arg_type.ndim):
-                            raise RuntimeError(f"Error launching kernel '{kernel.key}', argument '{arg_name}' expects an array with dimensions {arg_type.ndim} but the passed array has dimensions {a.ndim}.")
-
-                        # check device
-                        if (a.device != device):
-                            raise RuntimeError(f"Error launching kernel '{kernel.key}', trying to launch on device='{device}', but input array for argument '{arg_name}' is on device={a.device}.")
-                        
-                        params.append(a.__ctype__())
-
-                # try to convert to a value type (vec3, mat33, etc)
-                elif issubclass(arg_type, ctypes.Array):
-
-                    # force conversion to ndarray first (handles tuple / list, Gf.Vec3 case)
-                    a = np.array(a)
-
-                    # flatten to 1D array
-                    v = a.flatten()
-                    if (len(v) != arg_type._length_):
-                        raise RuntimeError(f"Error launching kernel '{kernel.key}', parameter for argument '{arg_name}' has length {len(v)}, but expected {arg_type._length_}. Could not convert parameter to {arg_type}.")
+        # converts arguments to kernel's expected ctypes and packs into params, start is the
+        # index of the first argument so outputs can be packed without concatenating lists
+        def pack_args(args, params, start=0):
 
-                    # wrap the arg_type (which is an ctypes.Array) in a structure
-                    # to ensure parameter is passed to the .dll by value rather than reference
-                    class ValueArg(ctypes.Structure):
-                        _fields_ = [ ('value', arg_type)]
+            packers = kernel.get_arg_packers()
 
-                    x = ValueArg()
-                    for i in range(arg_type._length_):
-                        x.value[i] = v[i]
+            for i, a in enumerate(args, start):
+                params.append(packers[i](a, device))
 
-                    params.append(x)
 
-                else:
-                    try:
-                        # try to pack as a scalar type
-                        params.append(arg_type._type_(a))
-                    except:
-                        raise RuntimeError(f"Error launching kernel, unable to pack kernel parameter type {type(a)} for param {arg_name}, expected {arg_type}")
+        num_args = len(inputs) + len(outputs)
 
+        if (num_args != len(kernel.adj.args)): 
+            raise RuntimeError(f"Error launching kernel '{kernel.key}', passed {num_args} arguments but kernel requires {len(kernel.adj.args)}.")
 
-        fwd_args = inputs + outputs
-        adj_args = adj_inputs + adj_outputs
+        pack_args(inputs, params)
+        pack_args(outputs, params, len(inputs))
 
-        if (len(fwd_args)) != (len(kernel.adj.args)): 
-            raise RuntimeError(f"Error launching kernel '{kernel.key}', passed {len(fwd_args)} arguments but kernel requires {len(kernel.adj.args)}.")
-
-        pack_args(fwd_args, params)
-        pack_args(adj_args, params)
+        # forward kernels only take the forward arguments, so adjoints are only packed for backward launches
+        if (adjoint):
+            pack_args(adj_inputs, params)
+            pack_args(adj_outputs, params, len(adj_inputs))
 
         # late bind
         if (kernel.forward_cpu == None or kernel.forward_cuda == None):
@@ -892,19 +1182,22 @@ def launch(kernel, dim: Tuple[int], inputs:List, outputs:List=[], adj_inputs:Lis
         
         elif device == "cuda":
 
-            kernel_args = [ctypes.c_void_p(ctypes.addressof(x)) for x in params]
-            kernel_params = (ctypes.c_void_p * len(kernel_args))(*kernel_args)
+            # cuLaunchKernel() copies the parameter values at launch, so a temporary
+            # array of raw addresses is enough, no per-argument c_void_p objects needed
+            kernel_params = (ctypes.c_void_p * len(params))()
+            kernel_params[:] = [ctypes.addressof(x) for x in params]
 
             if (adjoint):
                 runtime.core.cuda_launch_kernel(kernel.backward_cuda, bounds.size, kernel_params)
             else:
                 runtime.core.cuda_launch_kernel(kernel.forward_cuda, bounds.size, kernel_params)
 
-            try:
-                runtime.verify_device()            
-            except Exception as e:
-                print(f"Error launching kernel: {kernel.key} on device {device}")
-                raise e
+            if warp.config.verify_cuda:
+                try:
+                    runtime.verify_device()
+                except Exception as e:
+                    print(f"Error launching kernel: {kernel.key} on device {device}")
+                    raise e
 
     # record on tape if one is active
     if (runtime.tape):
@@ -924,10 +1217,30 @@ def force_load():
     """Force all user-defined kernels to be compiled
     """
 
-    for m in user_modules.values():
+    for m in list(unloaded_modules.values()):
         if (m.loaded == False):
             m.load()
 
+        if (m.loaded):
+            del unloaded_modules[m.name]
+
+def load_module(module=None):
+    """Force the user-defined kernels of a single module to be compiled
+
+    Args:
+        module: The Python module, or its name, to load kernels for, defaults to the calling module
+    """
+
+    if module is None:
+        module = sys._getframe(1).f_globals["__name__"]
+    elif not isinstance(module, str):
+        module = module.__name__
+
+    m = get_module(module)
+    
+    if (m.loaded == False):
+        m.load()
+
 def set_module_options(options: Dict[str, Any]):
     """Set options for the current module.
 
@@ -936,24 +1249,24 @@ def set_module_options(options: Dict[str, Any]):
 
     * **mode**: The compilation mode to use, can be "debug", or "release", defaults to the value of ``warp.config.mode``.
     * **max_unroll**: The maximum fixed-size loop to unroll (default 16)
+    * **enable_expect**: Generate code for ``expect_eq()`` and ``expect_near()`` checks, when False the calls are compiled out of the kernels entirely, defaults to the value of ``warp.config.enable_expect``
 
     Args:
 
         options: Set of key-value option pairs
     """
    
-    import inspect
-    m = inspect.getmodule(inspect.stack()[1][0])
+    # only the caller's frame is needed, so avoid inspect.stack() which builds the whole stack
+    m = sys._getframe(1).f_globals["__name__"]
 
-    get_module(m.__name__).options.update(options)
+    get_module(m).options.update(options)
 
 def get_module_options() -> Dict[str, Any]:
     """Returns a list of options for the current module.
     """
-    import inspect
-    m = inspect.getmodule(inspect.stack()[1][0])
+    m = sys._getframe(1).f_globals["__name__"]
 
-    return get_module(m.__name__).options
+    return get_module(m).options
 
 
 def capture_begin():
@@ -993,7 +1306,16 @@ def capture_launch(graph: int):
         graph: A handle to the graph as returned by :func:`~warp.capture_end`
     """
 
-    runtime.core.cuda_graph_launch(ctypes.c_void_p(graph))
+    runtime.core.cuda_graph_launch(graph)
+
+def capture_destroy(graph: int):
+    """Destroy a previously captured CUDA graph and release its resources
+
+    Args:
+        graph: A handle to the graph as returned by :func:`~warp.capture_end`
+    """
+
+    runtime.core.cuda_graph_destroy(graph)
 
 
 def copy(dest: warp.array, src: warp.array, dest_offset: int = 0, src_offset: int = 0, count: int = 0):
@@ -1011,13 +1333,16 @@ def copy(dest: warp.array, src: warp.array, dest_offset: int = 0, src_offset: in
     if count <= 0:
         count = src.size
 
-    bytes_to_copy = count * type_size_in_bytes(src.dtype)
+    src_type_size = src.itemsize
+    dst_type_size = dest.itemsize
+
+    bytes_to_copy = count * src_type_size
 
-    src_size_in_bytes = src.size * type_size_in_bytes(src.dtype)
-    dst_size_in_bytes = dest.size * type_size_in_bytes(dest.dtype)
+    src_size_in_bytes = src.size * src_type_size
+    dst_size_in_bytes = dest.size * dst_type_size
 
-    src_offset_in_bytes = src_offset * type_size_in_bytes(src.dtype)
-    dst_offset_in_bytes = dest_offset * type_size_in_bytes(dest.dtype)
+    src_offset_in_bytes = src_offset * src_type_size
+    dst_offset_in_bytes = dest_offset * dst_type_size
 
     src_ptr = src.ptr + src_offset_in_bytes
     dst_ptr = dest.ptr + dst_offset_in_bytes
@@ -1028,21 +1353,13 @@ def copy(dest: warp.array, src: warp.array, dest_offset: int = 0, src_offset: in
     if dst_offset_in_bytes + bytes_to_copy > dst_size_in_bytes:
         raise RuntimeError(f"Trying to copy source buffer with size ({bytes_to_copy}) to offset ({dst_offset_in_bytes}) is larger than destination size ({dst_size_in_bytes})")
 
-    if (src.device == "cpu" and dest.device == "cuda"):
-        runtime.core.memcpy_h2d(ctypes.c_void_p(dst_ptr), ctypes.c_void_p(src_ptr), ctypes.c_size_t(bytes_to_copy))
+    memcpy = runtime.memcpy_funcs.get((src.device, dest.device))
 
-    elif (src.device == "cuda" and dest.device == "cpu"):
-        runtime.core.memcpy_d2h(ctypes.c_void_p(dst_ptr), ctypes.c_void_p(src_ptr), ctypes.c_size_t(bytes_to_copy))
-
-    elif (src.device == "cpu" and dest.device == "cpu"):
-        runtime.core.memcpy_h2h(ctypes.c_void_p(dst_ptr), ctypes.c_void_p(src_ptr), ctypes.c_size_t(bytes_to_copy))
-
-    elif (src.device == "cuda" and dest.device == "cuda"):
-        runtime.core.memcpy_d2d(ctypes.c_void_p(dst_ptr), ctypes.c_void_p(src_ptr), ctypes.c_size_t(bytes_to_copy))
-    
-    else:
+    if memcpy is None:
         raise RuntimeError("Unexpected source and destination combination")
 
+    memcpy(dst_ptr, src_ptr, bytes_to_copy)
+
 
 def type_str(t):
     if (t == None):
@@ -138,6 +138,51 @@ template<typename T> inline CUDA_CALLABLE T atomic_sub(const array_t<T>& buf, in
 template<typename T> inline CUDA_CALLABLE T atomic_sub(const array_t<T>& buf, int i, int j, int k, int l, T value) { return atomic_add(&index(buf, i, j, k, l), -value); }
 
 
+// warp-aggregated atomic add, the threads of a warp that target the same address first combine
+// their values with shuffles so that only one of them issues the atomic, this cuts serialization
+// on heavily contended addresses (e.g.: particle to grid scatter), requires sm_70 for __match_any_sync,
+// the aggregated path is disabled until it has been verified on sm_70+ hardware
+#ifndef WP_AGGREGATED_ATOMICS
+#define WP_AGGREGATED_ATOMICS 0
+#endif
+
+inline CUDA_CALLABLE float atomic_add_aggregated(const array_t<float>& buf, int i, float value)
+{
+    float* addr = &index(buf, i);
+
+#if WP_AGGREGATED_ATOMICS && defined(__CUDA_ARCH__) && __CUDA_ARCH__ >= 700
+    const unsigned int peers = __match_any_sync(__activemask(), (unsigned long long)addr);
+    const int lane = threadIdx.x & 31;
+    const int leader = __ffs(peers) - 1;
+
+    // every peer walks the same lanes in the same order, so the shuffles stay converged,
+    // the prefix over lower lanes gives each thread the value it would have seen serially
+    float sum = 0.0f;
+    float prefix = 0.0f;
+
+    for (unsigned int rest = peers; rest; rest &= rest - 1)
+    {
+        const int src = __ffs(rest) - 1;
+        const float v = __shfl_sync(peers, value, src);
+
+        if (src < lane)
+            prefix += v;
+
+        sum += v;
+    }
+
+    float old = 0.0f;
+    if (lane == leader)
+        old = atomic_add(addr, sum);
+
+    return __shfl_sync(peers, old, leader) + prefix;
+#else
+    return atomic_add(addr, value);
+#endif
+}
+
+inline CUDA_CALLABLE void adj_atomic_add_aggregated(const array_t<float>& buf, int i, float value, const array_t<float>& adj_buf, int& adj_i, float& adj_value, const float& adj_ret) { if(adj_buf.data) adj_value += index(adj_buf, i); }
+
 template<typename T> inline CUDA_CALLABLE T load(const array_t<T>& buf, int i) { return index(buf, i); }
 template<typename T> inline CUDA_CALLABLE T load(const array_t<T>& buf, int i, int j) { return index(buf, i, j); }
 template<typename T> inline CUDA_CALLABLE T load(const array_t<T>& buf, int i, int j, int k) { return index(buf, i, j, k); }
@@ -154,7 +199,7 @@ template<typename T> inline CUDA_CALLABLE void store(const array_t<T>& buf, int
 template <typename T>
 CUDA_CALLABLE inline void adj_atomic_add(T* buf, T value) { atomic_add(buf, value); }
 
-// for integral types (and doubles) we do not accumulate gradients
+// for integral types (and halfs, doubles) we do not accumulate gradients
 CUDA_CALLABLE inline void adj_atomic_add(int8* buf, int8 value) { }
 CUDA_CALLABLE inline void adj_atomic_add(uint8* buf, uint8 value) { }
 CUDA_CALLABLE inline void adj_atomic_add(int16* buf, int16 value) { }
@@ -163,6 +208,7 @@ CUDA_CALLABLE inline void adj_atomic_add(int32* buf, int32 value) { }
 CUDA_CALLABLE inline void adj_atomic_add(uint32* buf, uint32 value) { }
 CUDA_CALLABLE inline void adj_atomic_add(int64* buf, int64 value) { }
 CUDA_CALLABLE inline void adj_atomic_add(uint64* buf, uint64 value) { }
+CUDA_CALLABLE inline void adj_atomic_add(float16* buf, float16 value) { }
 CUDA_CALLABLE inline void adj_atomic_add(float64* buf, float64 value) { }
 
 // only generate gradients for T types
@@ -57,6 +57,112 @@ typedef uint64_t uint64;
 // matches Python string type for constant strings
 typedef char* str;
 
+// IEEE 754 binary16 <-> binary32 conversion, round to nearest even
+inline CUDA_CALLABLE uint16 float_to_half_bits(float x)
+{
+#if defined(__CUDA_ARCH__)
+    uint16 h;
+    asm("cvt.rn.f16.f32 %0, %1;" : "=h"(h) : "f"(x));
+    return h;
+#else
+    union { float f; uint32 u; } v;
+    v.f = x;
+
+    const uint32 sign = (v.u >> 16) & 0x8000;
+    uint32 u = v.u & 0x7fffffff;
+
+    // inf or nan
+    if (u >= 0x7f800000)
+        return uint16(sign | 0x7c00 | (u > 0x7f800000 ? 0x200 : 0));
+
+    // overflow to inf
+    if (u >= 0x47800000)
+        return uint16(sign | 0x7c00);
+
+    // normal
+    if (u >= 0x38800000)
+    {
+        u -= 0x38000000;
+        return uint16(sign | ((u + 0x0fff + ((u >> 13) & 1)) >> 13));
+    }
+
+    // underflow to zero
+    if (u < 0x33000000)
+        return uint16(sign);
+
+    // subnormal
+    const uint32 shift = 126 - (u >> 23);
+    const uint32 m = (u & 0x7fffff) | 0x800000;
+    const uint32 rem = m & ((1u << shift) - 1);
+    const uint32 halfway = 1u << (shift - 1);
+
+    uint32 r = m >> shift;
+    if (rem > halfway || (rem == halfway && (r & 1)))
+        ++r;
+
+    return uint16(sign | r);
+#endif
+}
+
+inline CUDA_CALLABLE float half_bits_to_float(uint16 h)
+{
+#if defined(__CUDA_ARCH__)
+    float f;
+    asm("cvt.f32.f16 %0, %1;" : "=f"(f) : "h"(h));
+    return f;
+#else
+    const uint32 sign = uint32(h & 0x8000) << 16;
+    const uint32 exp = (h >> 10) & 0x1f;
+    uint32 mant = h & 0x3ff;
+
+    union { uint32 u; float f; } v;
+
+    if (exp == 0x1f)
+    {
+        // inf or nan
+        v.u = sign | 0x7f800000 | (mant << 13);
+    }
+    else if (exp != 0)
+    {
+        v.u = sign | ((exp + 112) << 23) | (mant << 13);
+    }
+    else if (mant == 0)
+    {
+        v.u = sign;
+    }
+    else
+    {
+        // subnormal, renormalize
+        uint32 e = 113;
+        while ((mant & 0x400) == 0)
+        {
+            mant <<= 1;
+            --e;
+        }
+
+        v.u = sign | (e << 23) | ((mant & 0x3ff) << 13);
+    }
+
+    return v.f;
+#endif
+}
+
+// 16-bit floating point storage type, arithmetic is performed in 32-bit
+struct half
+{
+    inline CUDA_CALLABLE half() : u(0) {}
+    inline CUDA_CALLABLE half(float f) : u(float_to_half_bits(f)) {}
+    inline CUDA_CALLABLE half(int i) : u(float_to_half_bits(float(i))) {}
+
+    inline CUDA_CALLABLE operator float() const { return half_bits_to_float(u); }
+
+    inline CUDA_CALLABLE half& operator+=(float f) { u = float_to_half_bits(half_bits_to_float(u) + f); return *this; }
+
+    uint16 u;
+};
+
+typedef half float16;
+
 
 template <typename T>
 CUDA_CALLABLE float cast_float(T x) { return (float)(x); }
@@ -87,6 +193,8 @@ CUDA_CALLABLE inline void adj_int64(T, T&, int64) {}
 template <typename T>
 CUDA_CALLABLE inline void adj_uint64(T, T&, uint64) {}
 
+template <typename T>
+CUDA_CALLABLE inline void adj_float16(T x, T& adj_x, float16 adj_ret) { adj_x += float(adj_ret); }
 template <typename T>
 CUDA_CALLABLE inline void adj_float32(T x, T& adj_x, float32 adj_ret) { adj_x += adj_ret; }
 template <typename T>
@@ -104,7 +212,7 @@ inline CUDA_CALLABLE int mod(int a, int b) { return a%b; }
 inline CUDA_CALLABLE int min(int a, int b) { return a<b?a:b; }
 inline CUDA_CALLABLE int max(int a, int b) { return a>b?a:b; }
 inline CUDA_CALLABLE int abs(int x) { return ::abs(x); }
-inline CUDA_CALLABLE int sign(int x) { return x < 0 ? -1 : 1; }
+inline CUDA_CALLABLE int sign(int x) { return (x >> 31) | 1; }
 inline CUDA_CALLABLE int clamp(int x, int a, int b) { return min(max(a, x), b); }
 inline CUDA_CALLABLE int floordiv(int a, int b) { return a/b; }
 
@@ -138,8 +246,9 @@ inline CUDA_CALLABLE float floordiv(float a, float b) { return float(int(a/b));
 inline CUDA_CALLABLE float leaky_min(float a, float b, float r) { return min(a, b); }
 inline CUDA_CALLABLE float leaky_max(float a, float b, float r) { return max(a, b); }
 inline CUDA_CALLABLE float clamp(float x, float a, float b) { return min(max(a, x), b); }
-inline CUDA_CALLABLE float step(float x) { return x < 0.0f ? 1.0f : 0.0f; }
-inline CUDA_CALLABLE float sign(float x) { return x < 0.0f ? -1.0f : 1.0f; }
+// branchless, note -0.0 compares equal to zero so step(-0.0) = 0 and sign(-0.0) = 1
+inline CUDA_CALLABLE float step(float x) { return float(x < 0.0f); }
+inline CUDA_CALLABLE float sign(float x) { return 1.0f - 2.0f*float(x < 0.0f); }
 inline CUDA_CALLABLE float abs(float x) { return ::fabs(x); }
 inline CUDA_CALLABLE float nonzero(float x) { return x == 0.0f ? 0.0f : 1.0f; }
 
@@ -150,6 +259,22 @@ inline CUDA_CALLABLE float atan2(float y, float x) { return ::atan2(y, x); }
 inline CUDA_CALLABLE float sin(float x) { return ::sin(x); }
 inline CUDA_CALLABLE float cos(float x) { return ::cos(x); }
 inline CUDA_CALLABLE float sqrt(float x) { return ::sqrt(x); }
+
+// reciprocal square root, maps to the single MUFU.RSQ instruction on device
+#if defined(__CUDA_ARCH__)
+inline CUDA_CALLABLE float rsqrt(float x) { return ::rsqrtf(x); }
+#else
+inline CUDA_CALLABLE float rsqrt(float x) { return 1.0f/::sqrt(x); }
+#endif
+
+// a*b + c, issued as a single FFMA on device independent of the compiler's contraction heuristics,
+// on the host it stays an unfused multiply-add since fmaf() is a library call without -mfma
+#if defined(__CUDA_ARCH__)
+inline CUDA_CALLABLE float mul_add(float a, float b, float c) { return __fmaf_rn(a, b, c); }
+#else
+inline CUDA_CALLABLE float mul_add(float a, float b, float c) { return a*b + c; }
+#endif
+
 inline CUDA_CALLABLE float tan(float x) { return ::tan(x); }
 inline CUDA_CALLABLE float sinh(float x) { return ::sinhf(x);}
 inline CUDA_CALLABLE float cosh(float x) { return ::coshf(x);}
@@ -335,6 +460,23 @@ inline CUDA_CALLABLE void adj_ceil(float x, float& adj_x, float adj_ret)
 template <typename T>
 CUDA_CALLABLE inline T select(bool cond, const T& a, const T& b) { return cond?b:a; }
 
+#if !defined(__CUDA_ARCH__)
+// host compilers often lower a float select to a conditional jump, blend the bits
+// instead so unpredictable conditions do not cost a misprediction, on device the
+// generic version already compiles to a predicated selp
+inline float select(bool cond, const float& a, const float& b)
+{
+    union { float f; uint32 u; } va, vb;
+    va.f = a;
+    vb.f = b;
+
+    const uint32 mask = 0u - uint32(cond);
+    va.u ^= (va.u ^ vb.u) & mask;
+
+    return va.f;
+}
+#endif
+
 template <typename T>
 CUDA_CALLABLE inline void adj_select(bool cond, const T& a, const T& b, bool& adj_cond, T& adj_a, T& adj_b, const T& adj_ret)
 {
@@ -506,6 +648,7 @@ inline CUDA_CALLABLE T atomic_add(T* buf, T value)
 #include "quat.h"
 #include "mat44.h"
 #include "matnn.h"
+#include "soa.h"
 #include "spatial.h"
 #include "intersect.h"
 #include "mesh.h"
@@ -30,29 +30,36 @@ struct HashGrid
     int max_points;
 };
 
-// convert a virtual (world) cell coordinate to a physical one
-CUDA_CALLABLE inline int hash_grid_index(const HashGrid& grid, int x, int y, int z)
+// convert a virtual (world) cell coordinate along one axis to a physical one
+CUDA_CALLABLE inline int hash_grid_cell(int x, int dim)
 {
     // offset to ensure positive coordinates (means grid dim should be less than 4096^3)
     const int origin = 1<<20;
 
     x += origin;
-    y += origin;
-    z += origin;
 
     assert(x >= 0);
-    assert(y >= 0);
-    assert(z >= 0);
 
     // compute physical cell (assume pow2 grid dims)
-    // int cx = x & (grid.dim_x-1);
-    // int cy = y & (grid.dim_y-1);
-    // int cz = z & (grid.dim_z-1);
+    // return x & (dim-1);
 
     // compute physical cell (arbitrary grid dims)
-    int cx = x%grid.dim_x;
-    int cy = y%grid.dim_y;
-    int cz = z%grid.dim_z;
+    return x%dim;
+}
+
+// advance a physical cell coordinate by one, wrapping without a modulo
+CUDA_CALLABLE inline int hash_grid_cell_next(int c, int dim)
+{
+    c += 1;
+    return c == dim ? 0 : c;
+}
+
+// convert a virtual (world) cell coordinate to a physical one
+CUDA_CALLABLE inline int hash_grid_index(const HashGrid& grid, int x, int y, int z)
+{
+    const int cx = hash_grid_cell(x, grid.dim_x);
+    const int cy = hash_grid_cell(y, grid.dim_y);
+    const int cz = hash_grid_cell(z, grid.dim_z);
 
     return cz*(grid.dim_x*grid.dim_y) + cy*grid.dim_x + cx;
 }
@@ -83,6 +90,14 @@ struct hash_grid_query_t
     int y;
     int z;
 
+    // physical cell coordinates of x_start, y_start and x, y, z
+    int cell_x_start;
+    int cell_y_start;
+
+    int cell_x;
+    int cell_y;
+    int cell_z;
+
     int cell;
     int cell_index;     // offset in the current cell (index into cell_indices)
     int cell_end;       // index following the end of this cell 
@@ -113,7 +128,14 @@ CUDA_CALLABLE inline hash_grid_query_t hash_grid_query(uint64_t id, wp::vec3 pos
     query.y = query.y_start;
     query.z = query.z_start;
 
-    const int cell = hash_grid_index(query.grid, query.x, query.y, query.z);
+    query.cell_x_start = hash_grid_cell(query.x_start, query.grid.dim_x);
+    query.cell_y_start = hash_grid_cell(query.y_start, query.grid.dim_y);
+
+    query.cell_x = query.cell_x_start;
+    query.cell_y = query.cell_y_start;
+    query.cell_z = hash_grid_cell(query.z_start, query.grid.dim_z);
+
+    const int cell = query.cell_z*(query.grid.dim_x*query.grid.dim_y) + query.cell_y*query.grid.dim_x + query.cell_x;
     query.cell_index = query.grid.cell_starts[cell];
     query.cell_end = query.grid.cell_ends[cell];
 
@@ -135,17 +157,27 @@ CUDA_CALLABLE inline bool hash_grid_query_next(hash_grid_query_t& query, int& in
         }
         else
         {
+            // step virtual and physical coordinates together, so the physical
+            // cell is tracked incrementally rather than with a modulo per axis
             query.x++;
+            query.cell_x = hash_grid_cell_next(query.cell_x, grid.dim_x);
+
             if (query.x > query.x_end)
             {
                 query.x = query.x_start;
+                query.cell_x = query.cell_x_start;
+
                 query.y++;
+                query.cell_y = hash_grid_cell_next(query.cell_y, grid.dim_y);
             }
 
             if (query.y > query.y_end)
             {
                 query.y = query.y_start;
+                query.cell_y = query.cell_y_start;
+
                 query.z++;
+                query.cell_z = hash_grid_cell_next(query.cell_z, grid.dim_z);
             }
 
             if (query.z > query.z_end)
@@ -155,7 +187,7 @@ CUDA_CALLABLE inline bool hash_grid_query_next(hash_grid_query_t& query, int& in
             }
 
             // update cell pointers
-            const int cell = hash_grid_index(grid, query.x, query.y, query.z);
+            const int cell = query.cell_z*(grid.dim_x*grid.dim_y) + query.cell_y*grid.dim_x + query.cell_x;
 
             query.cell_index = grid.cell_starts[cell];
             query.cell_end = grid.cell_ends[cell];        
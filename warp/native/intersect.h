@@ -572,6 +572,62 @@ CUDA_CALLABLE inline void adj_intersect_tri_tri(const vec3& var_v0,
 												vec3& adj_u2,
 												int adj_ret) {}
 
+// compressed triangle, the base vertex is kept at full precision and the
+// two edges relative to it are stored as half, 24 bytes instead of 36
+struct rt_triangle_t
+{
+    CUDA_CALLABLE rt_triangle_t() {}
+    CUDA_CALLABLE rt_triangle_t(int) {} // for backward pass
+
+    // triangles are not differentiable, accumulating adjoints is a no-op
+    CUDA_CALLABLE rt_triangle_t& operator+=(const rt_triangle_t&) { return *this; }
+
+    float v0[3];
+    half e1[3];
+    half e2[3];
+};
+
+CUDA_CALLABLE inline void adj_atomic_add(rt_triangle_t* buf, rt_triangle_t value) { }
+
+CUDA_CALLABLE inline rt_triangle_t pack_triangle(const vec3& v0, const vec3& v1, const vec3& v2)
+{
+    rt_triangle_t t;
+
+    for (int i=0; i < 3; ++i)
+    {
+        t.v0[i] = v0[i];
+        t.e1[i] = half(v1[i] - v0[i]);
+        t.e2[i] = half(v2[i] - v0[i]);
+    }
+
+    return t;
+}
+
+CUDA_CALLABLE inline void adj_pack_triangle(const vec3& v0, const vec3& v1, const vec3& v2, vec3& adj_v0, vec3& adj_v1, vec3& adj_v2, const rt_triangle_t& adj_ret) {}
+
+CUDA_CALLABLE inline void unpack_triangle(const rt_triangle_t& t, float v0[3], float v1[3], float v2[3])
+{
+    for (int i=0; i < 3; ++i)
+    {
+        v0[i] = t.v0[i];
+        v1[i] = t.v0[i] + float(t.e1[i]);
+        v2[i] = t.v0[i] + float(t.e2[i]);
+    }
+}
+
+CUDA_CALLABLE inline int intersect_tri_tri(const rt_triangle_t& a, const rt_triangle_t& b)
+{
+    float v0[3], v1[3], v2[3];
+    float u0[3], u1[3], u2[3];
+
+    unpack_triangle(a, v0, v1, v2);
+    unpack_triangle(b, u0, u1, u2);
+
+    return NoDivTriTriIsect(v0, v1, v2, u0, u1, u2);
+}
+
+CUDA_CALLABLE inline void adj_intersect_tri_tri(const rt_triangle_t& a, const rt_triangle_t& b, rt_triangle_t& adj_a, rt_triangle_t& adj_b, int adj_ret) {}
+
 
 CUDA_CALLABLE inline void adj_closest_point_to_triangle(
 	const vec3& var_a, const vec3& var_b, const vec3& var_c, const vec3& var_p,
@@ -56,14 +56,13 @@
             dest[1]=v1[1]-v2[1]; \
             dest[2]=v1[2]-v2[2];}
 
-/* sort so that a<=b */
-#define SORT(a,b)       \
-             if(a>b)    \
-             {          \
-               float c; \
-               c=a;     \
-               a=b;     \
-               b=c;     \
+/* sort so that a<=b, using selects instead of a branch */
+#define SORT(a,b)                 \
+             {                    \
+               float c=a;         \
+               int swap=a>b;      \
+               a=swap?b:a;        \
+               b=swap?c:b;        \
              }
 
 
@@ -214,6 +213,29 @@ CUDA_CALLABLE inline int coplanar_tri_tri(float N[3],float V0[3],float V1[3],flo
 
 
 
+/* signed distances of P0,P1,P2 to the plane N.X+d=0, with the coplanarity
+   robustness check applied; returns 1 if all three are non-zero and have the
+   same sign, i.e.: the triangle lies strictly on one side of the plane */
+CUDA_CALLABLE inline int plane_distances_reject(const float N[3],float d,const float P0[3],const float P1[3],const float P2[3],
+                     float& d0,float& d1,float& d2)
+{
+  d0=DOT(N,P0)+d;
+  d1=DOT(N,P1)+d;
+  d2=DOT(N,P2)+d;
+
+  /* coplanarity robustness check, written as selects so that no thread
+     branches before the early-out below */
+#if USE_EPSILON_TEST==TRUE
+  d0=FABS(d0)<EPSILON?0.0f:d0;
+  d1=FABS(d1)<EPSILON?0.0f:d1;
+  d2=FABS(d2)<EPSILON?0.0f:d2;
+#endif
+
+  /* non-short-circuit & so both products are always evaluated; a zero
+     distance makes its product zero and never counts towards a reject */
+  return (d0*d1>0.0f)&(d0*d2>0.0f);
+}
+
 CUDA_CALLABLE inline int NoDivTriTriIsect(float V0[3],float V1[3],float V2[3],
                      float U0[3],float U1[3],float U2[3])
 {
@@ -236,22 +258,12 @@ CUDA_CALLABLE inline int NoDivTriTriIsect(float V0[3],float V1[3],float V2[3],
   /* plane equation 1: N1.X+d1=0 */
 
   /* put U0,U1,U2 into plane equation 1 to compute signed distances to the plane*/
-  du0=DOT(N1,U0)+d1;
-  du1=DOT(N1,U1)+d1;
-  du2=DOT(N1,U2)+d1;
+  if(plane_distances_reject(N1,d1,U0,U1,U2,du0,du1,du2)) /* same sign on all of them + not equal 0 ? */
+    return 0;                                            /* no intersection occurs */
 
-  /* coplanarity robustness check */
-#if USE_EPSILON_TEST==TRUE
-  if(FABS(du0)<EPSILON) du0=0.0;
-  if(FABS(du1)<EPSILON) du1=0.0;
-  if(FABS(du2)<EPSILON) du2=0.0;
-#endif
   du0du1=du0*du1;
   du0du2=du0*du2;
 
-  if(du0du1>0.0f && du0du2>0.0f) /* same sign on all of them + not equal 0 ? */
-    return 0;                    /* no intersection occurs */
-
   /* compute plane of triangle (U0,U1,U2) */
   SUB(E1,U1,U0);
   SUB(E2,U2,U0);
@@ -260,22 +272,12 @@ CUDA_CALLABLE inline int NoDivTriTriIsect(float V0[3],float V1[3],float V2[3],
   /* plane equation 2: N2.X+d2=0 */
 
   /* put V0,V1,V2 into plane equation 2 */
-  dv0=DOT(N2,V0)+d2;
-  dv1=DOT(N2,V1)+d2;
-  dv2=DOT(N2,V2)+d2;
-
-#if USE_EPSILON_TEST==TRUE
-  if(FABS(dv0)<EPSILON) dv0=0.0;
-  if(FABS(dv1)<EPSILON) dv1=0.0;
-  if(FABS(dv2)<EPSILON) dv2=0.0;
-#endif
+  if(plane_distances_reject(N2,d2,V0,V1,V2,dv0,dv1,dv2)) /* same sign on all of them + not equal 0 ? */
+    return 0;                                            /* no intersection occurs */
 
   dv0dv1=dv0*dv1;
   dv0dv2=dv0*dv2;
 
-  if(dv0dv1>0.0f && dv0dv2>0.0f) /* same sign on all of them + not equal 0 ? */
-    return 0;                    /* no intersection occurs */
-
   /* compute direction of intersection line */
   CROSS(D,N1,N2);
 
@@ -135,10 +135,9 @@ inline CUDA_CALLABLE mat22 mul(const mat22& a, float b)
 }
 inline CUDA_CALLABLE vec2 mul(const mat22& a, const vec2& b)
 {
-    vec2 r = a.get_col(0)*b.x +
-             a.get_col(1)*b.y;
-    
-    return r;
+    // row-wise, accumulated in the same order as summing the scaled columns
+    return vec2(mul_add(a.data[0][1], b.y, a.data[0][0]*b.x),
+                mul_add(a.data[1][1], b.y, a.data[1][0]*b.x));
 }
 
 
@@ -182,11 +182,10 @@ inline CUDA_CALLABLE mat33 mul(const mat33& a, float b)
 
 inline CUDA_CALLABLE vec3 mul(const mat33& a, const vec3& b)
 {
-    vec3 r = a.get_col(0)*b.x +
-               a.get_col(1)*b.y +
-               a.get_col(2)*b.z;
-    
-    return r;
+    // row-wise, accumulated in the same order as summing the scaled columns
+    return vec3(mul_add(a.data[0][2], b.z, mul_add(a.data[0][1], b.y, a.data[0][0]*b.x)),
+                mul_add(a.data[1][2], b.z, mul_add(a.data[1][1], b.y, a.data[1][0]*b.x)),
+                mul_add(a.data[2][2], b.z, mul_add(a.data[2][1], b.y, a.data[2][0]*b.x)));
 }
 
 inline CUDA_CALLABLE mat33 mul(const mat33& a, const mat33& b)
@@ -254,12 +254,11 @@ inline CUDA_CALLABLE mat44 mul(const mat44& a, float b)
 
 inline CUDA_CALLABLE vec4 mul(const mat44& a, const vec4& b)
 {
-    vec4 r = a.get_col(0)*b.x +
-             a.get_col(1)*b.y +
-             a.get_col(2)*b.z +
-             a.get_col(3)*b.w;
-    
-    return r;
+    // row-wise, accumulated in the same order as summing the scaled columns
+    return vec4(mul_add(a.data[0][3], b.w, mul_add(a.data[0][2], b.z, mul_add(a.data[0][1], b.y, a.data[0][0]*b.x))),
+                mul_add(a.data[1][3], b.w, mul_add(a.data[1][2], b.z, mul_add(a.data[1][1], b.y, a.data[1][0]*b.x))),
+                mul_add(a.data[2][3], b.w, mul_add(a.data[2][2], b.z, mul_add(a.data[2][1], b.y, a.data[2][0]*b.x))),
+                mul_add(a.data[3][3], b.w, mul_add(a.data[3][2], b.z, mul_add(a.data[3][1], b.y, a.data[3][0]*b.x))));
 }
 
 inline CUDA_CALLABLE mat44 mul(const mat44& a, const mat44& b)
@@ -293,6 +292,14 @@ inline CUDA_CALLABLE mat44 transpose(const mat44& a)
     return t;
 }
 
+// the cofactor expansions below accumulate the 2x2 minors at higher precision on
+// the host, on device double throughput is a small fraction of float so use float there
+#if defined(__CUDA_ARCH__)
+typedef float mat44_minor_t;
+#else
+typedef double mat44_minor_t;
+#endif
+
 inline CUDA_CALLABLE float determinant(const mat44& m)
 {
     // adapted from USD GfMatrix4f::Inverse()
@@ -300,10 +307,11 @@ inline CUDA_CALLABLE float determinant(const mat44& m)
     float x10, x11, x12, x13;
     float x20, x21, x22, x23;
     float x30, x31, x32, x33;
-    double y01, y02, y03, y12, y13, y23;
+    mat44_minor_t y01, y02, y03, y12, y13, y23;
     float z00, z10, z20, z30;
 
-    // Pickle 1st two columns of matrix into registers
+    // Pickle 1st two columns of matrix into registers, only the
+    // cofactors of these are needed for the determinant
     x00 = m.data[0][0];
     x01 = m.data[0][1];
     x10 = m.data[1][0];
@@ -313,14 +321,6 @@ inline CUDA_CALLABLE float determinant(const mat44& m)
     x30 = m.data[3][0];
     x31 = m.data[3][1];
 
-    // Compute all six 2x2 determinants of 1st two columns
-    y01 = x00*x11 - x10*x01;
-    y02 = x00*x21 - x20*x01;
-    y03 = x00*x31 - x30*x01;
-    y12 = x10*x21 - x20*x11;
-    y13 = x10*x31 - x30*x11;
-    y23 = x20*x31 - x30*x21;
-
     // Pickle 2nd two columns of matrix into registers
     x02 = m.data[0][2];
     x03 = m.data[0][3];
@@ -346,7 +346,7 @@ inline CUDA_CALLABLE float determinant(const mat44& m)
     z00 = x11*y23 - x21*y13 + x31*y12;
 
     // compute 4x4 determinant & its reciprocal
-    double det = x30*z30 + x20*z20 + x10*z10 + x00*z00;
+    mat44_minor_t det = x30*z30 + x20*z20 + x10*z10 + x00*z00;
     return det;
 }
 
@@ -357,10 +357,10 @@ inline CUDA_CALLABLE void adj_determinant(const mat44& m, mat44& adj_m, float ad
     float x10, x11, x12, x13;
     float x20, x21, x22, x23;
     float x30, x31, x32, x33;
-    double y01, y02, y03, y12, y13, y23;
+    mat44_minor_t y01, y02, y03, y12, y13, y23;
     float z00, z10, z20, z30;
     float z01, z11, z21, z31;
-    double z02, z03, z12, z13, z22, z23, z32, z33;
+    mat44_minor_t z02, z03, z12, z13, z22, z23, z32, z33;
 
     // Pickle 1st two columns of matrix into registers
     x00 = m.data[0][0];
@@ -445,10 +445,10 @@ inline CUDA_CALLABLE mat44 inverse(const mat44& m)
     float x10, x11, x12, x13;
     float x20, x21, x22, x23;
     float x30, x31, x32, x33;
-    double y01, y02, y03, y12, y13, y23;
+    mat44_minor_t y01, y02, y03, y12, y13, y23;
     float z00, z10, z20, z30;
     float z01, z11, z21, z31;
-    double z02, z03, z12, z13, z22, z23, z32, z33;
+    mat44_minor_t z02, z03, z12, z13, z22, z23, z32, z33;
 
     // Pickle 1st two columns of matrix into registers
     x00 = m.data[0][0];
@@ -507,14 +507,13 @@ inline CUDA_CALLABLE mat44 inverse(const mat44& m)
     z01 = x20*y13 - x30*y12 - x10*y23;
 
     // compute 4x4 determinant & its reciprocal
-    double det = x30*z30 + x20*z20 + x10*z10 + x00*z00;
+    mat44_minor_t det = x30*z30 + x20*z20 + x10*z10 + x00*z00;
     
     if (fabsf(float(det)) > kEps) 
     {
         mat44 invm;
 
-        // todo: should we switch to float only?
-        double rcp = 1.0 / det;
+        mat44_minor_t rcp = mat44_minor_t(1.0) / det;
 
         // Multiply all 3x3 cofactors by reciprocal & transpose
         invm.data[0][0] = float(z00*rcp);
@@ -553,14 +552,18 @@ inline CUDA_CALLABLE void adj_inverse(const mat44& m, mat44& adj_m, const mat44&
 
 inline CUDA_CALLABLE vec3 transform_point(const mat44& m, const vec3& v)
 {
-    vec4 out = mul(m, vec4(v.x, v.y, v.z, 1.0));
-    return vec3(out.x, out.y, out.z);
+    // expanded so only the top three rows are evaluated, the translation
+    // is the first term so each row contracts to a chain of three FMAs
+    return vec3(m.data[0][3] + m.data[0][0]*v.x + m.data[0][1]*v.y + m.data[0][2]*v.z,
+                m.data[1][3] + m.data[1][0]*v.x + m.data[1][1]*v.y + m.data[1][2]*v.z,
+                m.data[2][3] + m.data[2][0]*v.x + m.data[2][1]*v.y + m.data[2][2]*v.z);
 }
 
 inline CUDA_CALLABLE vec3 transform_vector(const mat44& m, const vec3& v)
 {
-    vec4 out = mul(m, vec4(v.x, v.y, v.z, 0.0));
-    return vec3(out.x, out.y, out.z);
+    return vec3(m.data[0][0]*v.x + m.data[0][1]*v.y + m.data[0][2]*v.z,
+                m.data[1][0]*v.x + m.data[1][1]*v.y + m.data[1][2]*v.z,
+                m.data[2][0]*v.x + m.data[2][1]*v.y + m.data[2][2]*v.z);
 }
 
 inline CUDA_CALLABLE mat44 outer(const vec4& a, const vec4& b)
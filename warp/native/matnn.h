@@ -52,90 +52,136 @@ CUDA_CALLABLE inline void dense_gemm_impl(int m, int n, int p, const float* __re
 
 
 template <bool add=false>
-CUDA_CALLABLE inline void dense_gemm(int m, int n, int p, int t1, int t2, const array_t<float>& A, const array_t<float>& B, array_t<float>& C)
+CUDA_CALLABLE inline void dense_gemm(int m, int n, int p, int t1, int t2, const float* __restrict__ A, const float* __restrict__ B, float* __restrict__ C)
 {
     if (t1 == 0 && t2 == 0)
-        dense_gemm_impl<false, false, add>(m, n, p, A.data, B.data, C.data);
+        dense_gemm_impl<false, false, add>(m, n, p, A, B, C);
     else if (t1 == 1 && t2 == 0)
-        dense_gemm_impl<true, false, add>(m, n, p, A.data, B.data, C.data);
+        dense_gemm_impl<true, false, add>(m, n, p, A, B, C);
     else if (t1 == 0 && t2 == 1)
-        dense_gemm_impl<false, true, add>(m, n, p, A.data, B.data, C.data);
+        dense_gemm_impl<false, true, add>(m, n, p, A, B, C);
     else if (t1 == 1 && t2 == 1)
-        dense_gemm_impl<true, true, add>(m, n, p, A.data, B.data, C.data);
+        dense_gemm_impl<true, true, add>(m, n, p, A, B, C);
 }
 
+template <bool add=false>
+CUDA_CALLABLE inline void dense_gemm(int m, int n, int p, int t1, int t2, const array_t<float>& A, const array_t<float>& B, array_t<float>& C)
+{
+    dense_gemm<add>(m, n, p, t1, t2, A.data, B.data, C.data);
+}
 
+// each thread multiplies the matrices of the batch item given by its thread index,
+// matrix dimensions and offsets into the packed A, B, C arrays are stored per item
+CUDA_CALLABLE inline void dense_gemm_batched(const array_t<int>& m, const array_t<int>& n, const array_t<int>& p, int t1, int t2,
+                                             const array_t<int>& A_start, const array_t<int>& B_start, const array_t<int>& C_start,
+                                             const array_t<float>& A, const array_t<float>& B, array_t<float>& C)
+{
+    const int batch = tid();
+
+    dense_gemm(m.data[batch], n.data[batch], p.data[batch], t1, t2,
+               A.data + A_start.data[batch],
+               B.data + B_start.data[batch],
+               C.data + C_start.data[batch]);
+}
 
 
-void  CUDA_CALLABLE inline dense_chol(int n, const array_t<float>& A, float regularization, array_t<float>& L)
+
+
+CUDA_CALLABLE inline void dense_chol(int n, const float* A, float regularization, float* L)
 {
     for (int j=0; j < n; ++j)
     {
-        float s = A.data[dense_index(n, j, j)] + regularization;
+        float s = A[dense_index(n, j, j)] + regularization;
 
         for (int k=0; k < j; ++k)
         {
-            float r = L.data[dense_index(n, j, k)];
+            float r = L[dense_index(n, j, k)];
             s -= r*r;
         }
 
         s = sqrt(s);
         const float invS = 1.0f/s;
 
-        L.data[dense_index(n, j, j)] = s;
+        L[dense_index(n, j, j)] = s;
 
         for (int i=j+1; i < n; ++i)
         {
-            s = A.data[dense_index(n, i, j)];
+            s = A[dense_index(n, i, j)];
             
             for (int k=0; k < j; ++k)
             {
-                s -= L.data[dense_index(n, i, k)]*L.data[dense_index(n, j, k)];
+                s -= L[dense_index(n, i, k)]*L[dense_index(n, j, k)];
             }
 
-            L.data[dense_index(n, i, j)] = s*invS;
+            L[dense_index(n, i, j)] = s*invS;
         }
     }
 }
 
+void  CUDA_CALLABLE inline dense_chol(int n, const array_t<float>& A, float regularization, array_t<float>& L)
+{
+    dense_chol(n, A.data, regularization, L.data);
+}
+
+// each thread factorizes the matrix of the batch item given by its thread index,
+// L is packed with the same layout as A
+CUDA_CALLABLE inline void dense_chol_batched(const array_t<int>& A_start, const array_t<int>& A_dim, const array_t<float>& A, float regularization, array_t<float>& L)
+{
+    const int batch = tid();
+    const int offset = A_start.data[batch];
 
+    dense_chol(A_dim.data[batch], A.data + offset, regularization, L.data + offset);
+}
 
 
 // Solves (L*L^T)x = b given the Cholesky factor L 
-CUDA_CALLABLE inline void dense_subs(int n, const array_t<float>& L, const array_t<float>& b, array_t<float>& x)
+CUDA_CALLABLE inline void dense_subs(int n, const float* L, const float* b, float* x)
 {
     // forward substitution
     for (int i=0; i < n; ++i)
     {
-        float s = b.data[i];
+        float s = b[i];
 
         for (int j=0; j < i; ++j)
         {
-            s -= L.data[dense_index(n, i, j)]*x.data[j];
+            s -= L[dense_index(n, i, j)]*x[j];
         }
 
-        x.data[i] = s/L.data[dense_index(n, i, i)];
+        x[i] = s/L[dense_index(n, i, i)];
     }
 
     // backward substitution
     for (int i=n-1; i >= 0; --i)
     {
-        float s = x.data[i];
+        float s = x[i];
 
         for (int j=i+1; j < n; ++j)
         {
-            s -= L.data[dense_index(n, j, i)]*x.data[j];
+            s -= L[dense_index(n, j, i)]*x[j];
         }
 
-        x.data[i] = s/L.data[dense_index(n, i, i)];
+        x[i] = s/L[dense_index(n, i, i)];
     }
 }
 
+CUDA_CALLABLE inline void dense_subs(int n, const array_t<float>& L, const array_t<float>& b, array_t<float>& x)
+{
+    dense_subs(n, L.data, b.data, x.data);
+}
+
 CUDA_CALLABLE inline void dense_solve(int n, const array_t<float>& A, const array_t<float>& L, const array_t<float>& b, array_t<float>& x)
 {
     dense_subs(n, L, b, x);
 }
 
+CUDA_CALLABLE inline void dense_solve_batched(const array_t<int>& b_start, const array_t<int>& A_start, const array_t<int>& A_dim,
+                                              const array_t<float>& A, const array_t<float>& L, const array_t<float>& b, array_t<float>& x)
+{
+    const int batch = tid();
+
+    dense_subs(A_dim.data[batch], L.data + A_start.data[batch], b.data + b_start.data[batch], x.data + b_start.data[batch]);
+}
+
 
 // CUDA_CALLABLE inline void print_matrix(const char* name, int m, int n, const float* data)
 // {
@@ -155,15 +201,8 @@ CUDA_CALLABLE inline void dense_solve(int n, const array_t<float>& A, const arra
 // }
 
 // adjoint methods
-CUDA_CALLABLE inline void adj_dense_gemm(
-    int m, int n, int p, int t1, int t2, const array_t<float>& A, const array_t<float>& B, array_t<float>& C,
-    int adj_m, int adj_n, int adj_p, int adj_t1, int adj_t2, array_t<float>& adj_A, array_t<float>& adj_B, const array_t<float>& adj_C)
+CUDA_CALLABLE inline void adj_dense_gemm(int m, int n, int p, int t1, int t2, const float* A, const float* B, float* adj_A, float* adj_B, const float* adj_C)
 {
-
-    // print_matrix("A", m, p, A);
-    // print_matrix("B", p, n, B);
-    // printf("t1: %d t2: %d\n", t1, t2);
-
     if (t1)
     {
         dense_gemm<true>(p, m, n, 0, 1, B, adj_C, adj_A);
@@ -176,6 +215,36 @@ CUDA_CALLABLE inline void adj_dense_gemm(
     }
 }
 
+CUDA_CALLABLE inline void adj_dense_gemm(
+    int m, int n, int p, int t1, int t2, const array_t<float>& A, const array_t<float>& B, array_t<float>& C,
+    int adj_m, int adj_n, int adj_p, int adj_t1, int adj_t2, array_t<float>& adj_A, array_t<float>& adj_B, const array_t<float>& adj_C)
+{
+
+    // print_matrix("A", m, p, A);
+    // print_matrix("B", p, n, B);
+    // printf("t1: %d t2: %d\n", t1, t2);
+
+    adj_dense_gemm(m, n, p, t1, t2, A.data, B.data, adj_A.data, adj_B.data, adj_C.data);
+}
+
+CUDA_CALLABLE inline void adj_dense_gemm_batched(
+    const array_t<int>& m, const array_t<int>& n, const array_t<int>& p, int t1, int t2,
+    const array_t<int>& A_start, const array_t<int>& B_start, const array_t<int>& C_start,
+    const array_t<float>& A, const array_t<float>& B, array_t<float>& C,
+    array_t<int>& adj_m, array_t<int>& adj_n, array_t<int>& adj_p, int adj_t1, int adj_t2,
+    array_t<int>& adj_A_start, array_t<int>& adj_B_start, array_t<int>& adj_C_start,
+    array_t<float>& adj_A, array_t<float>& adj_B, const array_t<float>& adj_C)
+{
+    const int batch = tid();
+
+    adj_dense_gemm(m.data[batch], n.data[batch], p.data[batch], t1, t2,
+                   A.data + A_start.data[batch],
+                   B.data + B_start.data[batch],
+                   adj_A.data + A_start.data[batch],
+                   adj_B.data + B_start.data[batch],
+                   adj_C.data + C_start.data[batch]);
+}
+
 
 CUDA_CALLABLE inline void adj_dense_chol(
     int n, const array_t<float>& A, float regularization, array_t<float>& L,
@@ -192,9 +261,14 @@ CUDA_CALLABLE inline void adj_dense_subs(
 }
 
 
-CUDA_CALLABLE inline void adj_dense_solve(int n,
-    const array_t<float>& A, const array_t<float>& L, const array_t<float>& b, const array_t<float>& x,
-    int adj_n, array_t<float>& adj_A, array_t<float>& adj_L, array_t<float>& adj_b, const array_t<float>& adj_x)
+CUDA_CALLABLE inline void adj_dense_chol_batched(
+    const array_t<int>& A_start, const array_t<int>& A_dim, const array_t<float>& A, float regularization, array_t<float>& L,
+    array_t<int>& adj_A_start, array_t<int>& adj_A_dim, const array_t<float>& adj_A, float adj_regularization, array_t<float>& adj_L)
+{
+    // nop, use dense_solve_batched to differentiate through (A^-1)b = x
+}
+
+CUDA_CALLABLE inline void adj_dense_solve(int n, const float* L, const float* x, float* adj_A, float* adj_b, const float* adj_x)
 {
     // see https://people.maths.ox.ac.uk/gilesm/files/NA-08-01.pwp, section 2.3.1
     dense_subs(n, L, adj_x, adj_b);
@@ -204,11 +278,31 @@ CUDA_CALLABLE inline void adj_dense_solve(int n,
     {
         for (int j=0; j < n; ++j)
         {
-            adj_A.data[dense_index(n, i, j)] += -adj_b.data[i]*x.data[j];
+            adj_A[dense_index(n, i, j)] += -adj_b[i]*x[j];
         }
     }
 }
 
+CUDA_CALLABLE inline void adj_dense_solve(int n,
+    const array_t<float>& A, const array_t<float>& L, const array_t<float>& b, const array_t<float>& x,
+    int adj_n, array_t<float>& adj_A, array_t<float>& adj_L, array_t<float>& adj_b, const array_t<float>& adj_x)
+{
+    adj_dense_solve(n, L.data, x.data, adj_A.data, adj_b.data, adj_x.data);
+}
+
+CUDA_CALLABLE inline void adj_dense_solve_batched(
+    const array_t<int>& b_start, const array_t<int>& A_start, const array_t<int>& A_dim,
+    const array_t<float>& A, const array_t<float>& L, const array_t<float>& b, const array_t<float>& x,
+    array_t<int>& adj_b_start, array_t<int>& adj_A_start, array_t<int>& adj_A_dim,
+    array_t<float>& adj_A, array_t<float>& adj_L, array_t<float>& adj_b, const array_t<float>& adj_x)
+{
+    const int batch = tid();
+    const int A_offset = A_start.data[batch];
+    const int b_offset = b_start.data[batch];
+
+    adj_dense_solve(A_dim.data[batch], L.data + A_offset, x.data + b_offset, adj_A.data + A_offset, adj_b.data + b_offset, adj_x.data + b_offset);
+}
+
 
 template <typename F>
 CUDA_CALLABLE inline void mlp(const array_t<float>& weights, const array_t<float>& bias, F activation, int index, const array_t<float>& x, array_t<float>& out)
@@ -217,16 +311,24 @@ CUDA_CALLABLE inline void mlp(const array_t<float>& weights, const array_t<float
     const int n = weights.shape[1];
     const int b = x.shape[1];
 
+    // weights and bias are read by every thread in the batch, marking the inputs as
+    // non-aliasing with the output lets the compiler route them through the read-only cache
+    const float* __restrict__ w = weights.data;
+    const float* __restrict__ x_col = x.data + index;
+    float* __restrict__ out_col = out.data + index;
+
     for (int i=0; i < m; ++i)
     {
+        const float* __restrict__ w_row = w + i*n;
+        
         float tmp = bias.data[i];
 
         for(int j=0; j < n; ++j)
         {
-            tmp += weights.data[i*n + j]*x.data[index + b*j];
+            tmp += w_row[j]*x_col[b*j];
         }
 
-        out.data[index + b*i] = activation(tmp);
+        out_col[b*i] = activation(tmp);
     }
 }
 
@@ -49,6 +49,19 @@ inline CUDA_CALLABLE float interpolate_gradient(float a0, float a1, float t, flo
     // return (d_a1 - d_a0) * t + (a1 - a0) * d_t + d_a0;
 }
 
+// interpolation with the fade weight s = smootherstep(t) and its derivative
+// ds = smootherstep_gradient(t) precomputed, so that several fields sampled
+// at the same point can share them
+inline CUDA_CALLABLE float lerp_fade(float a0, float a1, float s)
+{
+    return (a1 - a0) * s + a0;
+}
+
+inline CUDA_CALLABLE float lerp_fade_gradient(float a0, float a1, float s, float ds, float d_a0, float d_a1, float d_t)
+{
+    return (d_a1 - d_a0) * s + (a1 - a0) * ds * d_t + d_a0;
+}
+
 inline CUDA_CALLABLE float random_gradient_1d(uint32 state, int ix)
 {
     const uint32_t p1 = 73856093;
@@ -97,52 +110,44 @@ inline CUDA_CALLABLE vec4 random_gradient_4d(uint32 state, int ix, int iy, int i
     return normalize(vec4(x, y, z, t));
 }
 
-inline CUDA_CALLABLE float dot_grid_gradient_1d(uint32 state, int ix, float dx)
+inline CUDA_CALLABLE float dot_grid_gradient_1d(float gradient, float dx)
 {
-    float gradient = random_gradient_1d(state, ix);
     return dx*gradient;
 }
 
-inline CUDA_CALLABLE float dot_grid_gradient_1d_gradient(uint32 state, int ix, float d_dx)
+inline CUDA_CALLABLE float dot_grid_gradient_1d(uint32 state, int ix, float dx)
 {
-    float gradient = random_gradient_1d(state, ix);
-    return d_dx*gradient;
+    return dot_grid_gradient_1d(random_gradient_1d(state, ix), dx);
 }
 
-inline CUDA_CALLABLE float dot_grid_gradient_2d(uint32 state, int ix, int iy, float dx, float dy)
+inline CUDA_CALLABLE float dot_grid_gradient_2d(const vec2& gradient, float dx, float dy)
 {
-    vec2 gradient = random_gradient_2d(state, ix, iy);
     return (dx*gradient.x + dy*gradient.y);
 }
 
-inline CUDA_CALLABLE float dot_grid_gradient_2d_gradient(uint32 state, int ix, int iy, float d_dx, float d_dy)
+inline CUDA_CALLABLE float dot_grid_gradient_2d(uint32 state, int ix, int iy, float dx, float dy)
 {
-    vec2 gradient = random_gradient_2d(state, ix, iy);
-    return (d_dx*gradient.x + d_dy*gradient.y);
+    return dot_grid_gradient_2d(random_gradient_2d(state, ix, iy), dx, dy);
 }
 
-inline CUDA_CALLABLE float dot_grid_gradient_3d(uint32 state, int ix, int iy, int iz, float dx, float dy, float dz)
+inline CUDA_CALLABLE float dot_grid_gradient_3d(const vec3& gradient, float dx, float dy, float dz)
 {
-    vec3 gradient = random_gradient_3d(state, ix, iy, iz);
     return (dx*gradient.x + dy*gradient.y + dz*gradient.z);
 }
 
-inline CUDA_CALLABLE float dot_grid_gradient_3d_gradient(uint32 state, int ix, int iy, int iz, float d_dx, float d_dy, float d_dz)
+inline CUDA_CALLABLE float dot_grid_gradient_3d(uint32 state, int ix, int iy, int iz, float dx, float dy, float dz)
 {
-    vec3 gradient = random_gradient_3d(state, ix, iy, iz);
-    return (d_dx*gradient.x + d_dy*gradient.y + d_dz*gradient.z);
+    return dot_grid_gradient_3d(random_gradient_3d(state, ix, iy, iz), dx, dy, dz);
 }
 
-inline CUDA_CALLABLE float dot_grid_gradient_4d(uint32 state, int ix, int iy, int iz, int it, float dx, float dy, float dz, float dt)
+inline CUDA_CALLABLE float dot_grid_gradient_4d(const vec4& gradient, float dx, float dy, float dz, float dt)
 {
-    vec4 gradient = random_gradient_4d(state, ix, iy, iz, it);
     return (dx*gradient.x + dy*gradient.y + dz*gradient.z + dt*gradient.w);
 }
 
-inline CUDA_CALLABLE float dot_grid_gradient_4d_gradient(uint32 state, int ix, int iy, int iz, int it, float d_dx, float d_dy, float d_dz, float d_dt)
+inline CUDA_CALLABLE float dot_grid_gradient_4d(uint32 state, int ix, int iy, int iz, int it, float dx, float dy, float dz, float dt)
 {
-    vec4 gradient = random_gradient_4d(state, ix, iy, iz, it);
-    return (d_dx*gradient.x + d_dy*gradient.y + d_dz*gradient.z + d_dt*gradient.w);    
+    return dot_grid_gradient_4d(random_gradient_4d(state, ix, iy, iz, it), dx, dy, dz, dt);
 }
 
 inline CUDA_CALLABLE float noise_1d(uint32 state, int x0, int x1, float dx)
@@ -156,11 +161,13 @@ inline CUDA_CALLABLE float noise_1d(uint32 state, int x0, int x1, float dx)
 
 inline CUDA_CALLABLE float noise_1d_gradient(uint32 state, int x0, int x1, float dx)
 {
-    float v0 = dot_grid_gradient_1d(state, x0, dx);
-    float d_v0_dx = dot_grid_gradient_1d_gradient(state, x0, 1.f);
+    float g0 = random_gradient_1d(state, x0);
+    float v0 = dot_grid_gradient_1d(g0, dx);
+    float d_v0_dx = g0;
 
-    float v1 = dot_grid_gradient_1d(state, x1, dx-1.f);
-    float d_v1_dx = dot_grid_gradient_1d_gradient(state, x1, 1.f);
+    float g1 = random_gradient_1d(state, x1);
+    float v1 = dot_grid_gradient_1d(g1, dx-1.f);
+    float d_v1_dx = g1;
 
     return interpolate_gradient(v0, v1, dx, d_v0_dx, d_v1_dx, 1.f);
 }
@@ -181,21 +188,25 @@ inline CUDA_CALLABLE float noise_2d(uint32 state, int x0, int y0, int x1, int y1
 
 inline CUDA_CALLABLE vec2 noise_2d_gradient(uint32 state, int x0, int y0, int x1, int y1, float dx, float dy)
 {
-    float v00 = dot_grid_gradient_2d(state, x0, y0, dx, dy);
-    float d_v00_dx = dot_grid_gradient_2d_gradient(state, x0, y0, 1.f, 0.f);
-    float d_v00_dy = dot_grid_gradient_2d_gradient(state, x0, y0, 0.0, 1.f);
+    vec2 g00 = random_gradient_2d(state, x0, y0);
+    float v00 = dot_grid_gradient_2d(g00, dx, dy);
+    float d_v00_dx = g00.x;
+    float d_v00_dy = g00.y;
     
-    float v10 = dot_grid_gradient_2d(state, x1, y0, dx-1.f, dy);
-    float d_v10_dx = dot_grid_gradient_2d_gradient(state, x1, y0, 1.f, 0.f);
-    float d_v10_dy = dot_grid_gradient_2d_gradient(state, x1, y0, 0.0, 1.f);
+    vec2 g10 = random_gradient_2d(state, x1, y0);
+    float v10 = dot_grid_gradient_2d(g10, dx-1.f, dy);
+    float d_v10_dx = g10.x;
+    float d_v10_dy = g10.y;
 
-    float v01 = dot_grid_gradient_2d(state, x0, y1, dx, dy-1.f);
-    float d_v01_dx = dot_grid_gradient_2d_gradient(state, x0, y1, 1.f, 0.f);
-    float d_v01_dy = dot_grid_gradient_2d_gradient(state, x0, y1, 0.0, 1.f);
+    vec2 g01 = random_gradient_2d(state, x0, y1);
+    float v01 = dot_grid_gradient_2d(g01, dx, dy-1.f);
+    float d_v01_dx = g01.x;
+    float d_v01_dy = g01.y;
 
-    float v11 = dot_grid_gradient_2d(state, x1, y1, dx-1.f, dy-1.f);
-    float d_v11_dx = dot_grid_gradient_2d_gradient(state, x1, y1, 1.f, 0.f);
-    float d_v11_dy = dot_grid_gradient_2d_gradient(state, x1, y1, 0.0, 1.f);
+    vec2 g11 = random_gradient_2d(state, x1, y1);
+    float v11 = dot_grid_gradient_2d(g11, dx-1.f, dy-1.f);
+    float d_v11_dx = g11.x;
+    float d_v11_dy = g11.y;
 
     float xi0 = interpolate(v00, v10, dx);
     float d_xi0_dx = interpolate_gradient(v00, v10, dx, d_v00_dx, d_v10_dx, 1.f);
@@ -237,85 +248,98 @@ inline CUDA_CALLABLE float noise_3d(uint32 state, int x0, int y0, int z0, int x1
     return interpolate(yi0, yi1, dz);
 }
 
-inline CUDA_CALLABLE vec3 noise_3d_gradient(uint32 state, int x0, int y0, int z0, int x1, int y1, int z1, float dx, float dy, float dz)
+inline CUDA_CALLABLE vec3 noise_3d_gradient(uint32 state, int x0, int y0, int z0, int x1, int y1, int z1, float dx, float dy, float dz, const vec3& s, const vec3& ds)
 {
-    float v000 = dot_grid_gradient_3d(state, x0, y0, z0, dx, dy, dz);
-    float d_v000_dx = dot_grid_gradient_3d_gradient(state, x0, y0, z0, 1.f, 0.f, 0.f);
-    float d_v000_dy = dot_grid_gradient_3d_gradient(state, x0, y0, z0, 0.f, 1.f, 0.f);
-    float d_v000_dz = dot_grid_gradient_3d_gradient(state, x0, y0, z0, 0.f, 0.f, 1.f);
+    vec3 g000 = random_gradient_3d(state, x0, y0, z0);
+    float v000 = dot_grid_gradient_3d(g000, dx, dy, dz);
+    float d_v000_dx = g000.x;
+    float d_v000_dy = g000.y;
+    float d_v000_dz = g000.z;
 
-    float v100 = dot_grid_gradient_3d(state, x1, y0, z0, dx-1.f, dy, dz);
-    float d_v100_dx = dot_grid_gradient_3d_gradient(state, x1, y0, z0, 1.f, 0.f, 0.f);
-    float d_v100_dy = dot_grid_gradient_3d_gradient(state, x1, y0, z0, 0.f, 1.f, 0.f);
-    float d_v100_dz = dot_grid_gradient_3d_gradient(state, x1, y0, z0, 0.f, 0.f, 1.f);
+    vec3 g100 = random_gradient_3d(state, x1, y0, z0);
+    float v100 = dot_grid_gradient_3d(g100, dx-1.f, dy, dz);
+    float d_v100_dx = g100.x;
+    float d_v100_dy = g100.y;
+    float d_v100_dz = g100.z;
 
-    float v010 = dot_grid_gradient_3d(state, x0, y1, z0, dx, dy-1.f, dz);
-    float d_v010_dx = dot_grid_gradient_3d_gradient(state, x0, y1, z0, 1.f, 0.f, 0.f);
-    float d_v010_dy = dot_grid_gradient_3d_gradient(state, x0, y1, z0, 0.f, 1.f, 0.f);
-    float d_v010_dz = dot_grid_gradient_3d_gradient(state, x0, y1, z0, 0.f, 0.f, 1.f);
+    vec3 g010 = random_gradient_3d(state, x0, y1, z0);
+    float v010 = dot_grid_gradient_3d(g010, dx, dy-1.f, dz);
+    float d_v010_dx = g010.x;
+    float d_v010_dy = g010.y;
+    float d_v010_dz = g010.z;
         
-    float v110 = dot_grid_gradient_3d(state, x1, y1, z0, dx-1.f, dy-1.f, dz);
-    float d_v110_dx = dot_grid_gradient_3d_gradient(state, x1, y1, z0, 1.f, 0.f, 0.f);
-    float d_v110_dy = dot_grid_gradient_3d_gradient(state, x1, y1, z0, 0.f, 1.f, 0.f);
-    float d_v110_dz = dot_grid_gradient_3d_gradient(state, x1, y1, z0, 0.f, 0.f, 1.f);
-
-    float v001 = dot_grid_gradient_3d(state, x0, y0, z1, dx, dy, dz-1.f);
-    float d_v001_dx = dot_grid_gradient_3d_gradient(state, x0, y0, z1, 1.f, 0.f, 0.f);
-    float d_v001_dy = dot_grid_gradient_3d_gradient(state, x0, y0, z1, 0.f, 1.f, 0.f);
-    float d_v001_dz = dot_grid_gradient_3d_gradient(state, x0, y0, z1, 0.f, 0.f, 1.f);
-
-    float v101 = dot_grid_gradient_3d(state, x1, y0, z1, dx-1.f, dy, dz-1.f);
-    float d_v101_dx = dot_grid_gradient_3d_gradient(state, x1, y0, z1, 1.f, 0.f, 0.f);
-    float d_v101_dy = dot_grid_gradient_3d_gradient(state, x1, y0, z1, 0.f, 1.f, 0.f);
-    float d_v101_dz = dot_grid_gradient_3d_gradient(state, x1, y0, z1, 0.f, 0.f, 1.f);
-
-    float v011 = dot_grid_gradient_3d(state, x0, y1, z1, dx, dy-1.f, dz-1.f);
-    float d_v011_dx = dot_grid_gradient_3d_gradient(state, x0, y1, z1, 1.f, 0.f, 0.f);
-    float d_v011_dy = dot_grid_gradient_3d_gradient(state, x0, y1, z1, 0.f, 1.f, 0.f);
-    float d_v011_dz = dot_grid_gradient_3d_gradient(state, x0, y1, z1, 0.f, 0.f, 1.f);
-
-    float v111 = dot_grid_gradient_3d(state, x1, y1, z1, dx-1.f, dy-1.f, dz-1.f);
-    float d_v111_dx = dot_grid_gradient_3d_gradient(state, x1, y1, z1, 1.f, 0.f, 0.f);
-    float d_v111_dy = dot_grid_gradient_3d_gradient(state, x1, y1, z1, 0.f, 1.f, 0.f);
-    float d_v111_dz = dot_grid_gradient_3d_gradient(state, x1, y1, z1, 0.f, 0.f, 1.f);
-
-    float xi00 = interpolate(v000, v100, dx);
-    float d_xi00_dx = interpolate_gradient(v000, v100, dx, d_v000_dx, d_v100_dx, 1.f);
-    float d_xi00_dy = interpolate_gradient(v000, v100, dx, d_v000_dy, d_v100_dy, 0.f);
-    float d_xi00_dz = interpolate_gradient(v000, v100, dx, d_v000_dz, d_v100_dz, 0.f);
-
-    float xi10 = interpolate(v010, v110, dx);
-    float d_xi10_dx = interpolate_gradient(v010, v110, dx, d_v010_dx, d_v110_dx, 1.f);
-    float d_xi10_dy = interpolate_gradient(v010, v110, dx, d_v010_dy, d_v110_dy, 0.f);
-    float d_xi10_dz = interpolate_gradient(v010, v110, dx, d_v010_dz, d_v110_dz, 0.f);
+    vec3 g110 = random_gradient_3d(state, x1, y1, z0);
+    float v110 = dot_grid_gradient_3d(g110, dx-1.f, dy-1.f, dz);
+    float d_v110_dx = g110.x;
+    float d_v110_dy = g110.y;
+    float d_v110_dz = g110.z;
+
+    vec3 g001 = random_gradient_3d(state, x0, y0, z1);
+    float v001 = dot_grid_gradient_3d(g001, dx, dy, dz-1.f);
+    float d_v001_dx = g001.x;
+    float d_v001_dy = g001.y;
+    float d_v001_dz = g001.z;
+
+    vec3 g101 = random_gradient_3d(state, x1, y0, z1);
+    float v101 = dot_grid_gradient_3d(g101, dx-1.f, dy, dz-1.f);
+    float d_v101_dx = g101.x;
+    float d_v101_dy = g101.y;
+    float d_v101_dz = g101.z;
+
+    vec3 g011 = random_gradient_3d(state, x0, y1, z1);
+    float v011 = dot_grid_gradient_3d(g011, dx, dy-1.f, dz-1.f);
+    float d_v011_dx = g011.x;
+    float d_v011_dy = g011.y;
+    float d_v011_dz = g011.z;
+
+    vec3 g111 = random_gradient_3d(state, x1, y1, z1);
+    float v111 = dot_grid_gradient_3d(g111, dx-1.f, dy-1.f, dz-1.f);
+    float d_v111_dx = g111.x;
+    float d_v111_dy = g111.y;
+    float d_v111_dz = g111.z;
+
+    float xi00 = lerp_fade(v000, v100, s.x);
+    float d_xi00_dx = lerp_fade_gradient(v000, v100, s.x, ds.x, d_v000_dx, d_v100_dx, 1.f);
+    float d_xi00_dy = lerp_fade_gradient(v000, v100, s.x, ds.x, d_v000_dy, d_v100_dy, 0.f);
+    float d_xi00_dz = lerp_fade_gradient(v000, v100, s.x, ds.x, d_v000_dz, d_v100_dz, 0.f);
+
+    float xi10 = lerp_fade(v010, v110, s.x);
+    float d_xi10_dx = lerp_fade_gradient(v010, v110, s.x, ds.x, d_v010_dx, d_v110_dx, 1.f);
+    float d_xi10_dy = lerp_fade_gradient(v010, v110, s.x, ds.x, d_v010_dy, d_v110_dy, 0.f);
+    float d_xi10_dz = lerp_fade_gradient(v010, v110, s.x, ds.x, d_v010_dz, d_v110_dz, 0.f);
     
-    float xi01 = interpolate(v001, v101, dx);
-    float d_xi01_dx = interpolate_gradient(v001, v101, dx, d_v001_dx, d_v101_dx, 1.f);
-    float d_xi01_dy = interpolate_gradient(v001, v101, dx, d_v001_dy, d_v101_dy, 0.f);
-    float d_xi01_dz = interpolate_gradient(v001, v101, dx, d_v001_dz, d_v101_dz, 0.f);  
+    float xi01 = lerp_fade(v001, v101, s.x);
+    float d_xi01_dx = lerp_fade_gradient(v001, v101, s.x, ds.x, d_v001_dx, d_v101_dx, 1.f);
+    float d_xi01_dy = lerp_fade_gradient(v001, v101, s.x, ds.x, d_v001_dy, d_v101_dy, 0.f);
+    float d_xi01_dz = lerp_fade_gradient(v001, v101, s.x, ds.x, d_v001_dz, d_v101_dz, 0.f);  
     
-    float xi11 = interpolate(v011, v111, dx);
-    float d_xi11_dx = interpolate_gradient(v011, v111, dx, d_v011_dx, d_v111_dx, 1.f);
-    float d_xi11_dy = interpolate_gradient(v011, v111, dx, d_v011_dy, d_v111_dy, 0.f);
-    float d_xi11_dz = interpolate_gradient(v011, v111, dx, d_v011_dz, d_v111_dz, 0.f);
+    float xi11 = lerp_fade(v011, v111, s.x);
+    float d_xi11_dx = lerp_fade_gradient(v011, v111, s.x, ds.x, d_v011_dx, d_v111_dx, 1.f);
+    float d_xi11_dy = lerp_fade_gradient(v011, v111, s.x, ds.x, d_v011_dy, d_v111_dy, 0.f);
+    float d_xi11_dz = lerp_fade_gradient(v011, v111, s.x, ds.x, d_v011_dz, d_v111_dz, 0.f);
 
-    float yi0 = interpolate(xi00, xi10, dy);
-    float d_yi0_dx = interpolate_gradient(xi00, xi10, dy, d_xi00_dx, d_xi10_dx, 0.f);
-    float d_yi0_dy = interpolate_gradient(xi00, xi10, dy, d_xi00_dy, d_xi10_dy, 1.f);
-    float d_yi0_dz = interpolate_gradient(xi00, xi10, dy, d_xi00_dz, d_xi10_dz, 0.f);
+    float yi0 = lerp_fade(xi00, xi10, s.y);
+    float d_yi0_dx = lerp_fade_gradient(xi00, xi10, s.y, ds.y, d_xi00_dx, d_xi10_dx, 0.f);
+    float d_yi0_dy = lerp_fade_gradient(xi00, xi10, s.y, ds.y, d_xi00_dy, d_xi10_dy, 1.f);
+    float d_yi0_dz = lerp_fade_gradient(xi00, xi10, s.y, ds.y, d_xi00_dz, d_xi10_dz, 0.f);
 
-    float yi1 = interpolate(xi01, xi11, dy);    
-    float d_yi1_dx = interpolate_gradient(xi01, xi11, dy, d_xi01_dx, d_xi11_dx, 0.f);
-    float d_yi1_dy = interpolate_gradient(xi01, xi11, dy, d_xi01_dy, d_xi11_dy, 1.f);
-    float d_yi1_dz = interpolate_gradient(xi01, xi11, dy, d_xi01_dz, d_xi11_dz, 0.f);
+    float yi1 = lerp_fade(xi01, xi11, s.y);    
+    float d_yi1_dx = lerp_fade_gradient(xi01, xi11, s.y, ds.y, d_xi01_dx, d_xi11_dx, 0.f);
+    float d_yi1_dy = lerp_fade_gradient(xi01, xi11, s.y, ds.y, d_xi01_dy, d_xi11_dy, 1.f);
+    float d_yi1_dz = lerp_fade_gradient(xi01, xi11, s.y, ds.y, d_xi01_dz, d_xi11_dz, 0.f);
 
-    float gradient_x = interpolate_gradient(yi0, yi1, dz, d_yi0_dy, d_yi1_dy, 0.f);
-    float gradient_y = interpolate_gradient(yi0, yi1, dz, d_yi0_dx, d_yi1_dx, 0.f);
-    float gradient_z = interpolate_gradient(yi0, yi1, dz, d_yi0_dz, d_yi1_dz, 1.f);
+    float gradient_x = lerp_fade_gradient(yi0, yi1, s.z, ds.z, d_yi0_dy, d_yi1_dy, 0.f);
+    float gradient_y = lerp_fade_gradient(yi0, yi1, s.z, ds.z, d_yi0_dx, d_yi1_dx, 0.f);
+    float gradient_z = lerp_fade_gradient(yi0, yi1, s.z, ds.z, d_yi0_dz, d_yi1_dz, 1.f);
 
     return vec3(gradient_x, gradient_y, gradient_z);
 }
 
+inline CUDA_CALLABLE vec3 noise_3d_gradient(uint32 state, int x0, int y0, int z0, int x1, int y1, int z1, float dx, float dy, float dz)
+{
+    return noise_3d_gradient(state, x0, y0, z0, x1, y1, z1, dx, dy, dz, vec3(smootherstep(dx), smootherstep(dy), smootherstep(dz)), vec3(smootherstep_gradient(dx), smootherstep_gradient(dy), smootherstep_gradient(dz)));
+}
+
 inline CUDA_CALLABLE float noise_4d(uint32 state, int x0, int y0, int z0, int t0, int x1, int y1, int z1, int t1, float dx, float dy, float dz, float dt)
 {
     //vXYZT
@@ -366,196 +390,217 @@ inline CUDA_CALLABLE float noise_4d(uint32 state, int x0, int y0, int z0, int t0
     return interpolate(zi0, zi1, dt);
 }
 
-inline CUDA_CALLABLE vec4 noise_4d_gradient(uint32 state, int x0, int y0, int z0, int t0, int x1, int y1, int z1, int t1, float dx, float dy, float dz, float dt)
-{
-    float v0000 = dot_grid_gradient_4d(state, x0, y0, z0, t0, dx, dy, dz, dt);
-    float d_v0000_dx = dot_grid_gradient_4d_gradient(state, x0, y0, z0, t0, 1.f, 0.f, 0.f, 0.f);
-    float d_v0000_dy = dot_grid_gradient_4d_gradient(state, x0, y0, z0, t0, 0.f, 1.f, 0.f, 0.f);
-    float d_v0000_dz = dot_grid_gradient_4d_gradient(state, x0, y0, z0, t0, 0.f, 0.f, 1.f, 0.f);
-    float d_v0000_dt = dot_grid_gradient_4d_gradient(state, x0, y0, z0, t0, 0.f, 0.f, 0.f, 1.f);
-
-    float v1000 = dot_grid_gradient_4d(state, x1, y0, z0, t0, dx-1.f, dy, dz, dt);
-    float d_v1000_dx = dot_grid_gradient_4d_gradient(state, x1, y0, z0, t0, 1.f, 0.f, 0.f, 0.f);
-    float d_v1000_dy = dot_grid_gradient_4d_gradient(state, x1, y0, z0, t0, 0.f, 1.f, 0.f, 0.f);
-    float d_v1000_dz = dot_grid_gradient_4d_gradient(state, x1, y0, z0, t0, 0.f, 0.f, 1.f, 0.f);
-    float d_v1000_dt = dot_grid_gradient_4d_gradient(state, x1, y0, z0, t0, 0.f, 0.f, 0.f, 1.f);
-
-    float v0100 = dot_grid_gradient_4d(state, x0, y1, z0, t0, dx, dy-1.f, dz, dt);
-    float d_v0100_dx = dot_grid_gradient_4d_gradient(state, x0, y1, z0, t0, 1.f, 0.f, 0.f, 0.f);
-    float d_v0100_dy = dot_grid_gradient_4d_gradient(state, x0, y1, z0, t0, 0.f, 1.f, 0.f, 0.f);
-    float d_v0100_dz = dot_grid_gradient_4d_gradient(state, x0, y1, z0, t0, 0.f, 0.f, 1.f, 0.f);
-    float d_v0100_dt = dot_grid_gradient_4d_gradient(state, x0, y1, z0, t0, 0.f, 0.f, 0.f, 1.f);
-
-    float v1100 = dot_grid_gradient_4d(state, x1, y1, z0, t0, dx-1.f, dy-1.f, dz, dt);
-    float d_v1100_dx = dot_grid_gradient_4d_gradient(state, x1, y1, z0, t0, 1.f, 0.f, 0.f, 0.f);
-    float d_v1100_dy = dot_grid_gradient_4d_gradient(state, x1, y1, z0, t0, 0.f, 1.f, 0.f, 0.f);
-    float d_v1100_dz = dot_grid_gradient_4d_gradient(state, x1, y1, z0, t0, 0.f, 0.f, 1.f, 0.f);
-    float d_v1100_dt = dot_grid_gradient_4d_gradient(state, x1, y1, z0, t0, 0.f, 0.f, 0.f, 1.f);
-
-    float v0010 = dot_grid_gradient_4d(state, x0, y0, z1, t0, dx, dy, dz-1.f, dt);
-    float d_v0010_dx = dot_grid_gradient_4d_gradient(state, x0, y0, z1, t0, 1.f, 0.f, 0.f, 0.f);
-    float d_v0010_dy = dot_grid_gradient_4d_gradient(state, x0, y0, z1, t0, 0.f, 1.f, 0.f, 0.f);
-    float d_v0010_dz = dot_grid_gradient_4d_gradient(state, x0, y0, z1, t0, 0.f, 0.f, 1.f, 0.f);
-    float d_v0010_dt = dot_grid_gradient_4d_gradient(state, x0, y0, z1, t0, 0.f, 0.f, 0.f, 1.f);
-
-    float v1010 = dot_grid_gradient_4d(state, x1, y0, z1, t0, dx-1.f, dy, dz-1.f, dt);
-    float d_v1010_dx = dot_grid_gradient_4d_gradient(state, x1, y0, z1, t0, 1.f, 0.f, 0.f, 0.f);
-    float d_v1010_dy = dot_grid_gradient_4d_gradient(state, x1, y0, z1, t0, 0.f, 1.f, 0.f, 0.f);
-    float d_v1010_dz = dot_grid_gradient_4d_gradient(state, x1, y0, z1, t0, 0.f, 0.f, 1.f, 0.f);
-    float d_v1010_dt = dot_grid_gradient_4d_gradient(state, x1, y0, z1, t0, 0.f, 0.f, 0.f, 1.f);
+inline CUDA_CALLABLE vec4 noise_4d_gradient(uint32 state, int x0, int y0, int z0, int t0, int x1, int y1, int z1, int t1, float dx, float dy, float dz, float dt, const vec4& s, const vec4& ds)
+{
+    vec4 g0000 = random_gradient_4d(state, x0, y0, z0, t0);
+    float v0000 = dot_grid_gradient_4d(g0000, dx, dy, dz, dt);
+    float d_v0000_dx = g0000.x;
+    float d_v0000_dy = g0000.y;
+    float d_v0000_dz = g0000.z;
+    float d_v0000_dt = g0000.w;
+
+    vec4 g1000 = random_gradient_4d(state, x1, y0, z0, t0);
+    float v1000 = dot_grid_gradient_4d(g1000, dx-1.f, dy, dz, dt);
+    float d_v1000_dx = g1000.x;
+    float d_v1000_dy = g1000.y;
+    float d_v1000_dz = g1000.z;
+    float d_v1000_dt = g1000.w;
+
+    vec4 g0100 = random_gradient_4d(state, x0, y1, z0, t0);
+    float v0100 = dot_grid_gradient_4d(g0100, dx, dy-1.f, dz, dt);
+    float d_v0100_dx = g0100.x;
+    float d_v0100_dy = g0100.y;
+    float d_v0100_dz = g0100.z;
+    float d_v0100_dt = g0100.w;
+
+    vec4 g1100 = random_gradient_4d(state, x1, y1, z0, t0);
+    float v1100 = dot_grid_gradient_4d(g1100, dx-1.f, dy-1.f, dz, dt);
+    float d_v1100_dx = g1100.x;
+    float d_v1100_dy = g1100.y;
+    float d_v1100_dz = g1100.z;
+    float d_v1100_dt = g1100.w;
+
+    vec4 g0010 = random_gradient_4d(state, x0, y0, z1, t0);
+    float v0010 = dot_grid_gradient_4d(g0010, dx, dy, dz-1.f, dt);
+    float d_v0010_dx = g0010.x;
+    float d_v0010_dy = g0010.y;
+    float d_v0010_dz = g0010.z;
+    float d_v0010_dt = g0010.w;
+
+    vec4 g1010 = random_gradient_4d(state, x1, y0, z1, t0);
+    float v1010 = dot_grid_gradient_4d(g1010, dx-1.f, dy, dz-1.f, dt);
+    float d_v1010_dx = g1010.x;
+    float d_v1010_dy = g1010.y;
+    float d_v1010_dz = g1010.z;
+    float d_v1010_dt = g1010.w;
     
-    float v0110 = dot_grid_gradient_4d(state, x0, y1, z1, t0, dx, dy-1.f, dz-1.f, dt);
-    float d_v0110_dx = dot_grid_gradient_4d_gradient(state, x0, y1, z1, t0, 1.f, 0.f, 0.f, 0.f);
-    float d_v0110_dy = dot_grid_gradient_4d_gradient(state, x0, y1, z1, t0, 0.f, 1.f, 0.f, 0.f);
-    float d_v0110_dz = dot_grid_gradient_4d_gradient(state, x0, y1, z1, t0, 0.f, 0.f, 1.f, 0.f);
-    float d_v0110_dt = dot_grid_gradient_4d_gradient(state, x0, y1, z1, t0, 0.f, 0.f, 0.f, 1.f);
-
-    float v1110 = dot_grid_gradient_4d(state, x1, y1, z1, t0, dx-1.f, dy-1.f, dz-1.f, dt);
-    float d_v1110_dx = dot_grid_gradient_4d_gradient(state, x1, y1, z1, t0, 1.f, 0.f, 0.f, 0.f);
-    float d_v1110_dy = dot_grid_gradient_4d_gradient(state, x1, y1, z1, t0, 0.f, 1.f, 0.f, 0.f);
-    float d_v1110_dz = dot_grid_gradient_4d_gradient(state, x1, y1, z1, t0, 0.f, 0.f, 1.f, 0.f);
-    float d_v1110_dt = dot_grid_gradient_4d_gradient(state, x1, y1, z1, t0, 0.f, 0.f, 0.f, 1.f);
+    vec4 g0110 = random_gradient_4d(state, x0, y1, z1, t0);
+    float v0110 = dot_grid_gradient_4d(g0110, dx, dy-1.f, dz-1.f, dt);
+    float d_v0110_dx = g0110.x;
+    float d_v0110_dy = g0110.y;
+    float d_v0110_dz = g0110.z;
+    float d_v0110_dt = g0110.w;
+
+    vec4 g1110 = random_gradient_4d(state, x1, y1, z1, t0);
+    float v1110 = dot_grid_gradient_4d(g1110, dx-1.f, dy-1.f, dz-1.f, dt);
+    float d_v1110_dx = g1110.x;
+    float d_v1110_dy = g1110.y;
+    float d_v1110_dz = g1110.z;
+    float d_v1110_dt = g1110.w;
     
-    float v0001 = dot_grid_gradient_4d(state, x0, y0, z0, t1, dx, dy, dz, dt-1.f);
-    float d_v0001_dx = dot_grid_gradient_4d_gradient(state, x0, y0, z0, t1, 1.f, 0.f, 0.f, 0.f);
-    float d_v0001_dy = dot_grid_gradient_4d_gradient(state, x0, y0, z0, t1, 0.f, 1.f, 0.f, 0.f);
-    float d_v0001_dz = dot_grid_gradient_4d_gradient(state, x0, y0, z0, t1, 0.f, 0.f, 1.f, 0.f);
-    float d_v0001_dt = dot_grid_gradient_4d_gradient(state, x0, y0, z0, t1, 0.f, 0.f, 0.f, 1.f);
-
-    float v1001 = dot_grid_gradient_4d(state, x1, y0, z0, t1, dx-1.f, dy, dz, dt-1.f);
-    float d_v1001_dx = dot_grid_gradient_4d_gradient(state, x1, y0, z0, t1, 1.f, 0.f, 0.f, 0.f);
-    float d_v1001_dy = dot_grid_gradient_4d_gradient(state, x1, y0, z0, t1, 0.f, 1.f, 0.f, 0.f);
-    float d_v1001_dz = dot_grid_gradient_4d_gradient(state, x1, y0, z0, t1, 0.f, 0.f, 1.f, 0.f);
-    float d_v1001_dt = dot_grid_gradient_4d_gradient(state, x1, y0, z0, t1, 0.f, 0.f, 0.f, 1.f);
+    vec4 g0001 = random_gradient_4d(state, x0, y0, z0, t1);
+    float v0001 = dot_grid_gradient_4d(g0001, dx, dy, dz, dt-1.f);
+    float d_v0001_dx = g0001.x;
+    float d_v0001_dy = g0001.y;
+    float d_v0001_dz = g0001.z;
+    float d_v0001_dt = g0001.w;
+
+    vec4 g1001 = random_gradient_4d(state, x1, y0, z0, t1);
+    float v1001 = dot_grid_gradient_4d(g1001, dx-1.f, dy, dz, dt-1.f);
+    float d_v1001_dx = g1001.x;
+    float d_v1001_dy = g1001.y;
+    float d_v1001_dz = g1001.z;
+    float d_v1001_dt = g1001.w;
     
-    float v0101 = dot_grid_gradient_4d(state, x0, y1, z0, t1, dx, dy-1.f, dz, dt-1.f);
-    float d_v0101_dx = dot_grid_gradient_4d_gradient(state, x0, y1, z0, t1, 1.f, 0.f, 0.f, 0.f);
-    float d_v0101_dy = dot_grid_gradient_4d_gradient(state, x0, y1, z0, t1, 0.f, 1.f, 0.f, 0.f);
-    float d_v0101_dz = dot_grid_gradient_4d_gradient(state, x0, y1, z0, t1, 0.f, 0.f, 1.f, 0.f);
-    float d_v0101_dt = dot_grid_gradient_4d_gradient(state, x0, y1, z0, t1, 0.f, 0.f, 0.f, 1.f);
-
-    float v1101 = dot_grid_gradient_4d(state, x1, y1, z0, t1, dx-1.f, dy-1.f, dz, dt-1.f);
-    float d_v1101_dx = dot_grid_gradient_4d_gradient(state, x1, y1, z0, t1, 1.f, 0.f, 0.f, 0.f);
-    float d_v1101_dy = dot_grid_gradient_4d_gradient(state, x1, y1, z0, t1, 0.f, 1.f, 0.f, 0.f);
-    float d_v1101_dz = dot_grid_gradient_4d_gradient(state, x1, y1, z0, t1, 0.f, 0.f, 1.f, 0.f);
-    float d_v1101_dt = dot_grid_gradient_4d_gradient(state, x1, y1, z0, t1, 0.f, 0.f, 0.f, 1.f);
+    vec4 g0101 = random_gradient_4d(state, x0, y1, z0, t1);
+    float v0101 = dot_grid_gradient_4d(g0101, dx, dy-1.f, dz, dt-1.f);
+    float d_v0101_dx = g0101.x;
+    float d_v0101_dy = g0101.y;
+    float d_v0101_dz = g0101.z;
+    float d_v0101_dt = g0101.w;
+
+    vec4 g1101 = random_gradient_4d(state, x1, y1, z0, t1);
+    float v1101 = dot_grid_gradient_4d(g1101, dx-1.f, dy-1.f, dz, dt-1.f);
+    float d_v1101_dx = g1101.x;
+    float d_v1101_dy = g1101.y;
+    float d_v1101_dz = g1101.z;
+    float d_v1101_dt = g1101.w;
     
-    float v0011 = dot_grid_gradient_4d(state, x0, y0, z1, t1, dx, dy, dz-1.f, dt-1.f);
-    float d_v0011_dx = dot_grid_gradient_4d_gradient(state, x0, y0, z1, t1, 1.f, 0.f, 0.f, 0.f);
-    float d_v0011_dy = dot_grid_gradient_4d_gradient(state, x0, y0, z1, t1, 0.f, 1.f, 0.f, 0.f);
-    float d_v0011_dz = dot_grid_gradient_4d_gradient(state, x0, y0, z1, t1, 0.f, 0.f, 1.f, 0.f);
-    float d_v0011_dt = dot_grid_gradient_4d_gradient(state, x0, y0, z1, t1, 0.f, 0.f, 0.f, 1.f);
-
-    float v1011 = dot_grid_gradient_4d(state, x1, y0, z1, t1, dx-1.f, dy, dz-1.f, dt-1.f);
-    float d_v1011_dx = dot_grid_gradient_4d_gradient(state, x1, y0, z1, t1, 1.f, 0.f, 0.f, 0.f);
-    float d_v1011_dy = dot_grid_gradient_4d_gradient(state, x1, y0, z1, t1, 0.f, 1.f, 0.f, 0.f);
-    float d_v1011_dz = dot_grid_gradient_4d_gradient(state, x1, y0, z1, t1, 0.f, 0.f, 1.f, 0.f);
-    float d_v1011_dt = dot_grid_gradient_4d_gradient(state, x1, y0, z1, t1, 0.f, 0.f, 0.f, 1.f);
-
-    float v0111 = dot_grid_gradient_4d(state, x0, y1, z1, t1, dx, dy-1.f, dz-1.f, dt-1.f);
-    float d_v0111_dx = dot_grid_gradient_4d_gradient(state, x0, y1, z1, t1, 1.f, 0.f, 0.f, 0.f);
-    float d_v0111_dy = dot_grid_gradient_4d_gradient(state, x0, y1, z1, t1, 0.f, 1.f, 0.f, 0.f);
-    float d_v0111_dz = dot_grid_gradient_4d_gradient(state, x0, y1, z1, t1, 0.f, 0.f, 1.f, 0.f);
-    float d_v0111_dt = dot_grid_gradient_4d_gradient(state, x0, y1, z1, t1, 0.f, 0.f, 0.f, 1.f);
-
-    float v1111 = dot_grid_gradient_4d(state, x1, y1, z1, t1, dx-1.f, dy-1.f, dz-1.f, dt-1.f);
-    float d_v1111_dx = dot_grid_gradient_4d_gradient(state, x1, y1, z1, t1, 1.f, 0.f, 0.f, 0.f);
-    float d_v1111_dy = dot_grid_gradient_4d_gradient(state, x1, y1, z1, t1, 0.f, 1.f, 0.f, 0.f);
-    float d_v1111_dz = dot_grid_gradient_4d_gradient(state, x1, y1, z1, t1, 0.f, 0.f, 1.f, 0.f);
-    float d_v1111_dt = dot_grid_gradient_4d_gradient(state, x1, y1, z1, t1, 0.f, 0.f, 0.f, 1.f);
-
-    float xi000 = interpolate(v0000, v1000, dx);
-    float d_xi000_dx = interpolate_gradient(v0000, v1000, dx, d_v0000_dx, d_v1000_dx, 1.f);
-    float d_xi000_dy = interpolate_gradient(v0000, v1000, dx, d_v0000_dy, d_v1000_dy, 0.f);
-    float d_xi000_dz = interpolate_gradient(v0000, v1000, dx, d_v0000_dz, d_v1000_dz, 0.f);
-    float d_xi000_dt = interpolate_gradient(v0000, v1000, dx, d_v0000_dt, d_v1000_dt, 0.f);
-
-    float xi100 = interpolate(v0100, v1100, dx);
-    float d_xi100_dx = interpolate_gradient(v0100, v1100, dx, d_v0100_dx, d_v1100_dx, 1.f);
-    float d_xi100_dy = interpolate_gradient(v0100, v1100, dx, d_v0100_dy, d_v1100_dy, 0.f);
-    float d_xi100_dz = interpolate_gradient(v0100, v1100, dx, d_v0100_dz, d_v1100_dz, 0.f);
-    float d_xi100_dt = interpolate_gradient(v0100, v1100, dx, d_v0100_dt, d_v1100_dt, 0.f);
-
-    float xi010 = interpolate(v0010, v1010, dx);
-    float d_xi010_dx = interpolate_gradient(v0010, v1010, dx, d_v0010_dx, d_v1010_dx, 1.f);
-    float d_xi010_dy = interpolate_gradient(v0010, v1010, dx, d_v0010_dy, d_v1010_dy, 0.f);
-    float d_xi010_dz = interpolate_gradient(v0010, v1010, dx, d_v0010_dz, d_v1010_dz, 0.f);
-    float d_xi010_dt = interpolate_gradient(v0010, v1010, dx, d_v0010_dt, d_v1010_dt, 0.f);
-
-    float xi110 = interpolate(v0110, v1110, dx);
-    float d_xi110_dx = interpolate_gradient(v0110, v1110, dx, d_v0110_dx, d_v1110_dx, 1.f);
-    float d_xi110_dy = interpolate_gradient(v0110, v1110, dx, d_v0110_dy, d_v1110_dy, 0.f);
-    float d_xi110_dz = interpolate_gradient(v0110, v1110, dx, d_v0110_dz, d_v1110_dz, 0.f);
-    float d_xi110_dt = interpolate_gradient(v0110, v1110, dx, d_v0110_dt, d_v1110_dt, 0.f);
-
-    float xi001 = interpolate(v0001, v1001, dx);
-    float d_xi001_dx = interpolate_gradient(v0001, v1001, dx, d_v0001_dx, d_v1001_dx, 1.f);
-    float d_xi001_dy = interpolate_gradient(v0001, v1001, dx, d_v0001_dy, d_v1001_dy, 0.f);
-    float d_xi001_dz = interpolate_gradient(v0001, v1001, dx, d_v0001_dz, d_v1001_dz, 0.f);
-    float d_xi001_dt = interpolate_gradient(v0001, v1001, dx, d_v0001_dt, d_v1001_dt, 0.f);
-
-    float xi101 = interpolate(v0101, v1101, dx);
-    float d_xi101_dx = interpolate_gradient(v0101, v1101, dx, d_v0101_dx, d_v1101_dx, 1.f);
-    float d_xi101_dy = interpolate_gradient(v0101, v1101, dx, d_v0101_dy, d_v1101_dy, 0.f);
-    float d_xi101_dz = interpolate_gradient(v0101, v1101, dx, d_v0101_dz, d_v1101_dz, 0.f);
-    float d_xi101_dt = interpolate_gradient(v0101, v1101, dx, d_v0101_dt, d_v1101_dt, 0.f);
-
-    float xi011 = interpolate(v0011, v1011, dx);
-    float d_xi011_dx = interpolate_gradient(v0011, v1011, dx, d_v0011_dx, d_v1011_dx, 1.f);
-    float d_xi011_dy = interpolate_gradient(v0011, v1011, dx, d_v0011_dy, d_v1011_dy, 0.f);
-    float d_xi011_dz = interpolate_gradient(v0011, v1011, dx, d_v0011_dz, d_v1011_dz, 0.f);
-    float d_xi011_dt = interpolate_gradient(v0011, v1011, dx, d_v0011_dt, d_v1011_dt, 0.f);
-
-    float xi111 = interpolate(v0111, v1111, dx);
-    float d_xi111_dx = interpolate_gradient(v0111, v1111, dx, d_v0111_dx, d_v1111_dx, 1.f);
-    float d_xi111_dy = interpolate_gradient(v0111, v1111, dx, d_v0111_dy, d_v1111_dy, 0.f);
-    float d_xi111_dz = interpolate_gradient(v0111, v1111, dx, d_v0111_dz, d_v1111_dz, 0.f);
-    float d_xi111_dt = interpolate_gradient(v0111, v1111, dx, d_v0111_dt, d_v1111_dt, 0.f);
-
-    float yi00 = interpolate(xi000, xi100, dy);
-    float d_yi00_dx = interpolate_gradient(xi000, xi100, dy, d_xi000_dx, d_xi100_dx, 0.f);
-    float d_yi00_dy = interpolate_gradient(xi000, xi100, dy, d_xi000_dy, d_xi100_dy, 1.f);
-    float d_yi00_dz = interpolate_gradient(xi000, xi100, dy, d_xi000_dz, d_xi100_dz, 0.f);
-    float d_yi00_dt = interpolate_gradient(xi000, xi100, dy, d_xi000_dt, d_xi100_dt, 0.f);
-
-    float yi10 = interpolate(xi010, xi110, dy);
-    float d_yi10_dx = interpolate_gradient(xi010, xi110, dy, d_xi010_dx, d_xi110_dx, 0.f);
-    float d_yi10_dy = interpolate_gradient(xi010, xi110, dy, d_xi010_dy, d_xi110_dy, 1.f);
-    float d_yi10_dz = interpolate_gradient(xi010, xi110, dy, d_xi010_dz, d_xi110_dz, 0.f);
-    float d_yi10_dt = interpolate_gradient(xi010, xi110, dy, d_xi010_dt, d_xi110_dt, 0.f);
-
-    float yi01 = interpolate(xi001, xi101, dy);
-    float d_yi01_dx = interpolate_gradient(xi001, xi101, dy, d_xi001_dx, d_xi101_dx, 0.f);
-    float d_yi01_dy = interpolate_gradient(xi001, xi101, dy, d_xi001_dy, d_xi101_dy, 1.f);
-    float d_yi01_dz = interpolate_gradient(xi001, xi101, dy, d_xi001_dz, d_xi101_dz, 0.f);
-    float d_yi01_dt = interpolate_gradient(xi001, xi101, dy, d_xi001_dt, d_xi101_dt, 0.f);
-
-    float yi11 = interpolate(xi011, xi111, dy);
-    float d_yi11_dx = interpolate_gradient(xi011, xi111, dy, d_xi011_dx, d_xi111_dx, 0.f);
-    float d_yi11_dy = interpolate_gradient(xi011, xi111, dy, d_xi011_dy, d_xi111_dy, 1.f);
-    float d_yi11_dz = interpolate_gradient(xi011, xi111, dy, d_xi011_dz, d_xi111_dz, 0.f);
-    float d_yi11_dt = interpolate_gradient(xi011, xi111, dy, d_xi011_dt, d_xi111_dt, 0.f);
-
-    float zi0 = interpolate(yi00, yi10, dz);
-    float d_zi0_dx = interpolate_gradient(yi00, yi10, dz, d_yi00_dx, d_yi10_dx, 0.f);
-    float d_zi0_dy = interpolate_gradient(yi00, yi10, dz, d_yi00_dy, d_yi10_dy, 0.f);
-    float d_zi0_dz = interpolate_gradient(yi00, yi10, dz, d_yi00_dz, d_yi10_dz, 1.f);
-    float d_zi0_dt = interpolate_gradient(yi00, yi10, dz, d_yi00_dt, d_yi10_dt, 0.f);
-
-    float zi1 = interpolate(yi01, yi11, dz);
-    float d_zi1_dx = interpolate_gradient(yi01, yi11, dz, d_yi01_dx, d_yi11_dx, 0.f);
-    float d_zi1_dy = interpolate_gradient(yi01, yi11, dz, d_yi01_dy, d_yi11_dy, 0.f);
-    float d_zi1_dz = interpolate_gradient(yi01, yi11, dz, d_yi01_dz, d_yi11_dz, 1.f);
-    float d_zi1_dt = interpolate_gradient(yi01, yi11, dz, d_yi01_dt, d_yi11_dt, 0.f);
-
-    float gradient_x = interpolate_gradient(zi0, zi1, dt, d_zi0_dx, d_zi1_dx, 0.f);
-    float gradient_y = interpolate_gradient(zi0, zi1, dt, d_zi0_dy, d_zi1_dy, 0.f);
-    float gradient_z = interpolate_gradient(zi0, zi1, dt, d_zi0_dz, d_zi1_dz, 0.f);
-    float gradient_t = interpolate_gradient(zi0, zi1, dt, d_zi0_dt, d_zi1_dt, 1.f);
+    vec4 g0011 = random_gradient_4d(state, x0, y0, z1, t1);
+    float v0011 = dot_grid_gradient_4d(g0011, dx, dy, dz-1.f, dt-1.f);
+    float d_v0011_dx = g0011.x;
+    float d_v0011_dy = g0011.y;
+    float d_v0011_dz = g0011.z;
+    float d_v0011_dt = g0011.w;
+
+    vec4 g1011 = random_gradient_4d(state, x1, y0, z1, t1);
+    float v1011 = dot_grid_gradient_4d(g1011, dx-1.f, dy, dz-1.f, dt-1.f);
+    float d_v1011_dx = g1011.x;
+    float d_v1011_dy = g1011.y;
+    float d_v1011_dz = g1011.z;
+    float d_v1011_dt = g1011.w;
+
+    vec4 g0111 = random_gradient_4d(state, x0, y1, z1, t1);
+    float v0111 = dot_grid_gradient_4d(g0111, dx, dy-1.f, dz-1.f, dt-1.f);
+    float d_v0111_dx = g0111.x;
+    float d_v0111_dy = g0111.y;
+    float d_v0111_dz = g0111.z;
+    float d_v0111_dt = g0111.w;
+
+    vec4 g1111 = random_gradient_4d(state, x1, y1, z1, t1);
+    float v1111 = dot_grid_gradient_4d(g1111, dx-1.f, dy-1.f, dz-1.f, dt-1.f);
+    float d_v1111_dx = g1111.x;
+    float d_v1111_dy = g1111.y;
+    float d_v1111_dz = g1111.z;
+    float d_v1111_dt = g1111.w;
+
+    float xi000 = lerp_fade(v0000, v1000, s.x);
+    float d_xi000_dx = lerp_fade_gradient(v0000, v1000, s.x, ds.x, d_v0000_dx, d_v1000_dx, 1.f);
+    float d_xi000_dy = lerp_fade_gradient(v0000, v1000, s.x, ds.x, d_v0000_dy, d_v1000_dy, 0.f);
+    float d_xi000_dz = lerp_fade_gradient(v0000, v1000, s.x, ds.x, d_v0000_dz, d_v1000_dz, 0.f);
+    float d_xi000_dt = lerp_fade_gradient(v0000, v1000, s.x, ds.x, d_v0000_dt, d_v1000_dt, 0.f);
+
+    float xi100 = lerp_fade(v0100, v1100, s.x);
+    float d_xi100_dx = lerp_fade_gradient(v0100, v1100, s.x, ds.x, d_v0100_dx, d_v1100_dx, 1.f);
+    float d_xi100_dy = lerp_fade_gradient(v0100, v1100, s.x, ds.x, d_v0100_dy, d_v1100_dy, 0.f);
+    float d_xi100_dz = lerp_fade_gradient(v0100, v1100, s.x, ds.x, d_v0100_dz, d_v1100_dz, 0.f);
+    float d_xi100_dt = lerp_fade_gradient(v0100, v1100, s.x, ds.x, d_v0100_dt, d_v1100_dt, 0.f);
+
+    float xi010 = lerp_fade(v0010, v1010, s.x);
+    float d_xi010_dx = lerp_fade_gradient(v0010, v1010, s.x, ds.x, d_v0010_dx, d_v1010_dx, 1.f);
+    float d_xi010_dy = lerp_fade_gradient(v0010, v1010, s.x, ds.x, d_v0010_dy, d_v1010_dy, 0.f);
+    float d_xi010_dz = lerp_fade_gradient(v0010, v1010, s.x, ds.x, d_v0010_dz, d_v1010_dz, 0.f);
+    float d_xi010_dt = lerp_fade_gradient(v0010, v1010, s.x, ds.x, d_v0010_dt, d_v1010_dt, 0.f);
+
+    float xi110 = lerp_fade(v0110, v1110, s.x);
+    float d_xi110_dx = lerp_fade_gradient(v0110, v1110, s.x, ds.x, d_v0110_dx, d_v1110_dx, 1.f);
+    float d_xi110_dy = lerp_fade_gradient(v0110, v1110, s.x, ds.x, d_v0110_dy, d_v1110_dy, 0.f);
+    float d_xi110_dz = lerp_fade_gradient(v0110, v1110, s.x, ds.x, d_v0110_dz, d_v1110_dz, 0.f);
+    float d_xi110_dt = lerp_fade_gradient(v0110, v1110, s.x, ds.x, d_v0110_dt, d_v1110_dt, 0.f);
+
+    float xi001 = lerp_fade(v0001, v1001, s.x);
+    float d_xi001_dx = lerp_fade_gradient(v0001, v1001, s.x, ds.x, d_v0001_dx, d_v1001_dx, 1.f);
+    float d_xi001_dy = lerp_fade_gradient(v0001, v1001, s.x, ds.x, d_v0001_dy, d_v1001_dy, 0.f);
+    float d_xi001_dz = lerp_fade_gradient(v0001, v1001, s.x, ds.x, d_v0001_dz, d_v1001_dz, 0.f);
+    float d_xi001_dt = lerp_fade_gradient(v0001, v1001, s.x, ds.x, d_v0001_dt, d_v1001_dt, 0.f);
+
+    float xi101 = lerp_fade(v0101, v1101, s.x);
+    float d_xi101_dx = lerp_fade_gradient(v0101, v1101, s.x, ds.x, d_v0101_dx, d_v1101_dx, 1.f);
+    float d_xi101_dy = lerp_fade_gradient(v0101, v1101, s.x, ds.x, d_v0101_dy, d_v1101_dy, 0.f);
+    float d_xi101_dz = lerp_fade_gradient(v0101, v1101, s.x, ds.x, d_v0101_dz, d_v1101_dz, 0.f);
+    float d_xi101_dt = lerp_fade_gradient(v0101, v1101, s.x, ds.x, d_v0101_dt, d_v1101_dt, 0.f);
+
+    float xi011 = lerp_fade(v0011, v1011, s.x);
+    float d_xi011_dx = lerp_fade_gradient(v0011, v1011, s.x, ds.x, d_v0011_dx, d_v1011_dx, 1.f);
+    float d_xi011_dy = lerp_fade_gradient(v0011, v1011, s.x, ds.x, d_v0011_dy, d_v1011_dy, 0.f);
+    float d_xi011_dz = lerp_fade_gradient(v0011, v1011, s.x, ds.x, d_v0011_dz, d_v1011_dz, 0.f);
+    float d_xi011_dt = lerp_fade_gradient(v0011, v1011, s.x, ds.x, d_v0011_dt, d_v1011_dt, 0.f);
+
+    float xi111 = lerp_fade(v0111, v1111, s.x);
+    float d_xi111_dx = lerp_fade_gradient(v0111, v1111, s.x, ds.x, d_v0111_dx, d_v1111_dx, 1.f);
+    float d_xi111_dy = lerp_fade_gradient(v0111, v1111, s.x, ds.x, d_v0111_dy, d_v1111_dy, 0.f);
+    float d_xi111_dz = lerp_fade_gradient(v0111, v1111, s.x, ds.x, d_v0111_dz, d_v1111_dz, 0.f);
+    float d_xi111_dt = lerp_fade_gradient(v0111, v1111, s.x, ds.x, d_v0111_dt, d_v1111_dt, 0.f);
+
+    float yi00 = lerp_fade(xi000, xi100, s.y);
+    float d_yi00_dx = lerp_fade_gradient(xi000, xi100, s.y, ds.y, d_xi000_dx, d_xi100_dx, 0.f);
+    float d_yi00_dy = lerp_fade_gradient(xi000, xi100, s.y, ds.y, d_xi000_dy, d_xi100_dy, 1.f);
+    float d_yi00_dz = lerp_fade_gradient(xi000, xi100, s.y, ds.y, d_xi000_dz, d_xi100_dz, 0.f);
+    float d_yi00_dt = lerp_fade_gradient(xi000, xi100, s.y, ds.y, d_xi000_dt, d_xi100_dt, 0.f);
+
+    float yi10 = lerp_fade(xi010, xi110, s.y);
+    float d_yi10_dx = lerp_fade_gradient(xi010, xi110, s.y, ds.y, d_xi010_dx, d_xi110_dx, 0.f);
+    float d_yi10_dy = lerp_fade_gradient(xi010, xi110, s.y, ds.y, d_xi010_dy, d_xi110_dy, 1.f);
+    float d_yi10_dz = lerp_fade_gradient(xi010, xi110, s.y, ds.y, d_xi010_dz, d_xi110_dz, 0.f);
+    float d_yi10_dt = lerp_fade_gradient(xi010, xi110, s.y, ds.y, d_xi010_dt, d_xi110_dt, 0.f);
+
+    float yi01 = lerp_fade(xi001, xi101, s.y);
+    float d_yi01_dx = lerp_fade_gradient(xi001, xi101, s.y, ds.y, d_xi001_dx, d_xi101_dx, 0.f);
+    float d_yi01_dy = lerp_fade_gradient(xi001, xi101, s.y, ds.y, d_xi001_dy, d_xi101_dy, 1.f);
+    float d_yi01_dz = lerp_fade_gradient(xi001, xi101, s.y, ds.y, d_xi001_dz, d_xi101_dz, 0.f);
+    float d_yi01_dt = lerp_fade_gradient(xi001, xi101, s.y, ds.y, d_xi001_dt, d_xi101_dt, 0.f);
+
+    float yi11 = lerp_fade(xi011, xi111, s.y);
+    float d_yi11_dx = lerp_fade_gradient(xi011, xi111, s.y, ds.y, d_xi011_dx, d_xi111_dx, 0.f);
+    float d_yi11_dy = lerp_fade_gradient(xi011, xi111, s.y, ds.y, d_xi011_dy, d_xi111_dy, 1.f);
+    float d_yi11_dz = lerp_fade_gradient(xi011, xi111, s.y, ds.y, d_xi011_dz, d_xi111_dz, 0.f);
+    float d_yi11_dt = lerp_fade_gradient(xi011, xi111, s.y, ds.y, d_xi011_dt, d_xi111_dt, 0.f);
+
+    float zi0 = lerp_fade(yi00, yi10, s.z);
+    float d_zi0_dx = lerp_fade_gradient(yi00, yi10, s.z, ds.z, d_yi00_dx, d_yi10_dx, 0.f);
+    float d_zi0_dy = lerp_fade_gradient(yi00, yi10, s.z, ds.z, d_yi00_dy, d_yi10_dy, 0.f);
+    float d_zi0_dz = lerp_fade_gradient(yi00, yi10, s.z, ds.z, d_yi00_dz, d_yi10_dz, 1.f);
+    float d_zi0_dt = lerp_fade_gradient(yi00, yi10, s.z, ds.z, d_yi00_dt, d_yi10_dt, 0.f);
+
+    float zi1 = lerp_fade(yi01, yi11, s.z);
+    float d_zi1_dx = lerp_fade_gradient(yi01, yi11, s.z, ds.z, d_yi01_dx, d_yi11_dx, 0.f);
+    float d_zi1_dy = lerp_fade_gradient(yi01, yi11, s.z, ds.z, d_yi01_dy, d_yi11_dy, 0.f);
+    float d_zi1_dz = lerp_fade_gradient(yi01, yi11, s.z, ds.z, d_yi01_dz, d_yi11_dz, 1.f);
+    float d_zi1_dt = lerp_fade_gradient(yi01, yi11, s.z, ds.z, d_yi01_dt, d_yi11_dt, 0.f);
+
+    float gradient_x = lerp_fade_gradient(zi0, zi1, s.w, ds.w, d_zi0_dx, d_zi1_dx, 0.f);
+    float gradient_y = lerp_fade_gradient(zi0, zi1, s.w, ds.w, d_zi0_dy, d_zi1_dy, 0.f);
+    float gradient_z = lerp_fade_gradient(zi0, zi1, s.w, ds.w, d_zi0_dz, d_zi1_dz, 0.f);
+    float gradient_t = lerp_fade_gradient(zi0, zi1, s.w, ds.w, d_zi0_dt, d_zi1_dt, 1.f);
 
     return vec4(gradient_x, gradient_y, gradient_z, gradient_t);
 }
 
+inline CUDA_CALLABLE vec4 noise_4d_gradient(uint32 state, int x0, int y0, int z0, int t0, int x1, int y1, int z1, int t1, float dx, float dy, float dz, float dt)
+{
+    return noise_4d_gradient(state, x0, y0, z0, t0, x1, y1, z1, t1, dx, dy, dz, dt, vec4(smootherstep(dx), smootherstep(dy), smootherstep(dz), smootherstep(dt)), vec4(smootherstep_gradient(dx), smootherstep_gradient(dy), smootherstep_gradient(dz), smootherstep_gradient(dt)));
+}
+
 // non-periodic Perlin noise
 
 inline CUDA_CALLABLE float noise(uint32 state, float x)
@@ -828,6 +873,62 @@ inline CUDA_CALLABLE void adj_pnoise(uint32 state, const vec4& xyzt, int px, int
     adj_xyzt.w += gradient.w * adj_ret;
 }
 
+// batched 1d Perlin noise, four independent samples per call
+
+inline CUDA_CALLABLE vec4 noise4(uint32 state, const vec4& x)
+{
+    vec4 f = vec4(floor(x.x), floor(x.y), floor(x.z), floor(x.w));
+    vec4 d = x - f;
+
+    return vec4(noise_1d(state, (int)f.x, (int)f.x + 1, d.x),
+                noise_1d(state, (int)f.y, (int)f.y + 1, d.y),
+                noise_1d(state, (int)f.z, (int)f.z + 1, d.z),
+                noise_1d(state, (int)f.w, (int)f.w + 1, d.w));
+}
+
+inline CUDA_CALLABLE void adj_noise4(uint32 state, const vec4& x, uint32& adj_state, vec4& adj_x, const vec4& adj_ret)
+{
+    vec4 f = vec4(floor(x.x), floor(x.y), floor(x.z), floor(x.w));
+    vec4 d = x - f;
+
+    adj_x.x += noise_1d_gradient(state, (int)f.x, (int)f.x + 1, d.x) * adj_ret.x;
+    adj_x.y += noise_1d_gradient(state, (int)f.y, (int)f.y + 1, d.y) * adj_ret.y;
+    adj_x.z += noise_1d_gradient(state, (int)f.z, (int)f.z + 1, d.z) * adj_ret.z;
+    adj_x.w += noise_1d_gradient(state, (int)f.w, (int)f.w + 1, d.w) * adj_ret.w;
+}
+
+inline CUDA_CALLABLE vec4 pnoise4(uint32 state, const vec4& x, int px)
+{
+    vec4 f = vec4(floor(x.x), floor(x.y), floor(x.z), floor(x.w));
+    vec4 d = x - f;
+
+    int x0 = mod((int)f.x, px);
+    int y0 = mod((int)f.y, px);
+    int z0 = mod((int)f.z, px);
+    int w0 = mod((int)f.w, px);
+
+    return vec4(noise_1d(state, x0, mod(x0 + 1, px), d.x),
+                noise_1d(state, y0, mod(y0 + 1, px), d.y),
+                noise_1d(state, z0, mod(z0 + 1, px), d.z),
+                noise_1d(state, w0, mod(w0 + 1, px), d.w));
+}
+
+inline CUDA_CALLABLE void adj_pnoise4(uint32 state, const vec4& x, int px, uint32& adj_state, vec4& adj_x, int& adj_px, const vec4& adj_ret)
+{
+    vec4 f = vec4(floor(x.x), floor(x.y), floor(x.z), floor(x.w));
+    vec4 d = x - f;
+
+    int x0 = mod((int)f.x, px);
+    int y0 = mod((int)f.y, px);
+    int z0 = mod((int)f.z, px);
+    int w0 = mod((int)f.w, px);
+
+    adj_x.x += noise_1d_gradient(state, x0, mod(x0 + 1, px), d.x) * adj_ret.x;
+    adj_x.y += noise_1d_gradient(state, y0, mod(y0 + 1, px), d.y) * adj_ret.y;
+    adj_x.z += noise_1d_gradient(state, z0, mod(z0 + 1, px), d.z) * adj_ret.z;
+    adj_x.w += noise_1d_gradient(state, w0, mod(w0 + 1, px), d.w) * adj_ret.w;
+}
+
 // curl noise
 
 inline CUDA_CALLABLE vec2 curlnoise(uint32 state, const vec2& xy)
@@ -860,13 +961,17 @@ inline CUDA_CALLABLE vec3 curlnoise(uint32 state, const vec3& xyz)
     int y1 = y0 + 1;
     int z1 = z0 + 1;
 
-    vec3 grad_field_1 = noise_3d_gradient(state, x0, y0, z0, x1, y1, z1, dx, dy, dz);
+    // the three fields share the lattice cell and fade weights, only the
+    // per-corner gradients differ between them
+    vec3 s = vec3(smootherstep(dx), smootherstep(dy), smootherstep(dz));
+    vec3 ds = vec3(smootherstep_gradient(dx), smootherstep_gradient(dy), smootherstep_gradient(dz));
+
+    vec3 grad_field_1 = noise_3d_gradient(state, x0, y0, z0, x1, y1, z1, dx, dy, dz, s, ds);
     state = rand_init(state, 10019689);
-    vec3 grad_field_2 = noise_3d_gradient(state, x0, y0, z0, x1, y1, z1, dx, dy, dz);
+    vec3 grad_field_2 = noise_3d_gradient(state, x0, y0, z0, x1, y1, z1, dx, dy, dz, s, ds);
     state = rand_init(state, 13112221);
-    vec3 grad_field_3 = noise_3d_gradient(state, x0, y0, z0, x1, y1, z1, dx, dy, dz);
+    vec3 grad_field_3 = noise_3d_gradient(state, x0, y0, z0, x1, y1, z1, dx, dy, dz, s, ds);
 
-    
     return vec3(
         grad_field_3.y - grad_field_2.z,
         grad_field_1.z - grad_field_3.x,
@@ -891,11 +996,14 @@ inline CUDA_CALLABLE vec3 curlnoise(uint32 state, const vec4& xyzt)
     int z1 = z0 + 1;
     int t1 = t0 + 1;
 
-    vec4 grad_field_1 = noise_4d_gradient(state, x0, y0, z0, t0, x1, y1, z1, t1, dx, dy, dz, dt);
+    vec4 s = vec4(smootherstep(dx), smootherstep(dy), smootherstep(dz), smootherstep(dt));
+    vec4 ds = vec4(smootherstep_gradient(dx), smootherstep_gradient(dy), smootherstep_gradient(dz), smootherstep_gradient(dt));
+
+    vec4 grad_field_1 = noise_4d_gradient(state, x0, y0, z0, t0, x1, y1, z1, t1, dx, dy, dz, dt, s, ds);
     state = rand_init(state, 10019689);
-    vec4 grad_field_2 = noise_4d_gradient(state, x0, y0, z0, t0, x1, y1, z1, t1, dx, dy, dz, dt);
+    vec4 grad_field_2 = noise_4d_gradient(state, x0, y0, z0, t0, x1, y1, z1, t1, dx, dy, dz, dt, s, ds);
     state = rand_init(state, 13112221);
-    vec4 grad_field_3 = noise_4d_gradient(state, x0, y0, z0, t0, x1, y1, z1, t1, dx, dy, dz, dt);
+    vec4 grad_field_3 = noise_4d_gradient(state, x0, y0, z0, t0, x1, y1, z1, t1, dx, dy, dz, dt, s, ds);
 
     return vec3(
         grad_field_3.y - grad_field_2.z,
@@ -90,10 +90,10 @@ inline CUDA_CALLABLE float length(const quat& q)
 
 inline CUDA_CALLABLE quat normalize(const quat& q)
 {
-    float l = length(q);
-    if (l > kEps)
+    float l_sq = dot(q, q);
+    if (l_sq > kEps*kEps)
     {
-        float inv_l = 1.0f/l;
+        float inv_l = rsqrt(l_sq);
 
         return quat(q.x*inv_l, q.y*inv_l, q.z*inv_l, q.w*inv_l);
     }
@@ -132,14 +132,29 @@ inline CUDA_CALLABLE quat mul(float s, const quat& a)
     return mul(a, s);
 }
 
+// evaluates x*(2w^2-1) + 2w*(v x x) + 2v*(v.x) with the scalar factors hoisted, so each
+// component is a short FMA chain rather than a series of vector temporaries scaled twice,
+// this is the same function the adjoints below are derived from (also for non-unit q)
 inline CUDA_CALLABLE vec3 quat_rotate(const quat& q, const vec3& x)
 {
-    return x*(2.0f*q.w*q.w-1.0f) + cross(vec3(&q.x), x)*q.w*2.0f + vec3(&q.x)*dot(vec3(&q.x), x)*2.0f;
+    const float c = 2.0f*q.w*q.w - 1.0f;
+    const float w2 = 2.0f*q.w;
+    const float d2 = 2.0f*(q.x*x.x + q.y*x.y + q.z*x.z);
+
+    return vec3(x.x*c + w2*(q.y*x.z - q.z*x.y) + q.x*d2,
+                x.y*c + w2*(q.z*x.x - q.x*x.z) + q.y*d2,
+                x.z*c + w2*(q.x*x.y - q.y*x.x) + q.z*d2);
 }
 
 inline CUDA_CALLABLE vec3 quat_rotate_inv(const quat& q, const vec3& x)
 {
-    return x*(2.0f*q.w*q.w-1.0f) - cross(vec3(&q.x), x)*q.w*2.0f + vec3(&q.x)*dot(vec3(&q.x), x)*2.0f;
+    const float c = 2.0f*q.w*q.w - 1.0f;
+    const float w2 = 2.0f*q.w;
+    const float d2 = 2.0f*(q.x*x.x + q.y*x.y + q.z*x.z);
+
+    return vec3(x.x*c - w2*(q.y*x.z - q.z*x.y) + q.x*d2,
+                x.y*c - w2*(q.z*x.x - q.x*x.z) + q.y*d2,
+                x.z*c - w2*(q.x*x.y - q.y*x.x) + q.z*d2);
 }
 
 inline CUDA_CALLABLE mat33 quat_to_matrix(const quat& q)
@@ -45,4 +45,161 @@ inline CUDA_CALLABLE void adj_randf(uint32& state, float min, float max, uint32&
 
 inline CUDA_CALLABLE void adj_randn(uint32& state, uint32& adj_state, float adj_ret) {}
 
+
+// Philox-4x32-10 counter-based generator (Salmon et al. 2011), each output is a pure
+// function of the key and counter, so threads may draw any number of values in any order
+struct philox_state_t
+{
+    CUDA_CALLABLE philox_state_t() {}
+    CUDA_CALLABLE philox_state_t(int) {} // for backward pass
+
+    uint32 key0;
+    uint32 key1;
+    uint32 offset;
+};
+
+inline CUDA_CALLABLE uint32 philox_mulhilo(uint32 a, uint32 b, uint32& hi)
+{
+#if defined(__CUDA_ARCH__)
+    hi = __umulhi(a, b);
+    return a*b;
+#else
+    const uint64 p = uint64(a)*uint64(b);
+    hi = uint32(p >> 32);
+    return uint32(p);
+#endif
+}
+
+inline CUDA_CALLABLE void philox_round(uint32& c0, uint32& c1, uint32& c2, uint32& c3, uint32 k0, uint32 k1)
+{
+    uint32 hi0, hi1;
+    const uint32 lo0 = philox_mulhilo(0xD2511F53u, c0, hi0);
+    const uint32 lo1 = philox_mulhilo(0xCD9E8D57u, c2, hi1);
+
+    c0 = hi1 ^ c1 ^ k0;
+    c1 = lo1;
+    c2 = hi0 ^ c3 ^ k1;
+    c3 = lo0;
+}
+
+inline CUDA_CALLABLE void philox4x32_10(uint32& c0, uint32& c1, uint32& c2, uint32& c3, uint32 k0, uint32 k1)
+{
+    // Weyl sequence key schedule
+    const uint32 w0 = 0x9E3779B9u;
+    const uint32 w1 = 0xBB67AE85u;
+
+    philox_round(c0, c1, c2, c3, k0, k1);
+    philox_round(c0, c1, c2, c3, k0 +   w0, k1 +   w1);
+    philox_round(c0, c1, c2, c3, k0 + 2*w0, k1 + 2*w1);
+    philox_round(c0, c1, c2, c3, k0 + 3*w0, k1 + 3*w1);
+    philox_round(c0, c1, c2, c3, k0 + 4*w0, k1 + 4*w1);
+    philox_round(c0, c1, c2, c3, k0 + 5*w0, k1 + 5*w1);
+    philox_round(c0, c1, c2, c3, k0 + 6*w0, k1 + 6*w1);
+    philox_round(c0, c1, c2, c3, k0 + 7*w0, k1 + 7*w1);
+    philox_round(c0, c1, c2, c3, k0 + 8*w0, k1 + 8*w1);
+    philox_round(c0, c1, c2, c3, k0 + 9*w0, k1 + 9*w1);
+}
+
+// maps the top 24 bits of x to [0, 1)
+inline CUDA_CALLABLE float philox_uniform(uint32 x) { return float(x >> 8)*(1.0f/16777216.0f); }
+
+inline CUDA_CALLABLE philox_state_t rand_init_philox(int seed, int offset)
+{
+    philox_state_t state;
+    state.key0 = uint32(seed);
+    state.key1 = 0;
+    state.offset = uint32(offset);
+
+    return state;
+}
+
+inline CUDA_CALLABLE vec4 randf4_philox(const philox_state_t& state, int counter)
+{
+    uint32 c0 = uint32(counter);
+    uint32 c1 = state.offset;
+    uint32 c2 = 0;
+    uint32 c3 = 0;
+
+    philox4x32_10(c0, c1, c2, c3, state.key0, state.key1);
+
+    return vec4(philox_uniform(c0), philox_uniform(c1), philox_uniform(c2), philox_uniform(c3));
+}
+
+// Box-Muller method on the first two outputs
+inline CUDA_CALLABLE float randn_philox(const philox_state_t& state, int counter)
+{
+    uint32 c0 = uint32(counter);
+    uint32 c1 = state.offset;
+    uint32 c2 = 0;
+    uint32 c3 = 0;
+
+    philox4x32_10(c0, c1, c2, c3, state.key0, state.key1);
+
+    // shift u1 into (0, 1] to keep log() finite
+    const float u1 = philox_uniform(c0) + (1.0f/16777216.0f);
+    const float u2 = philox_uniform(c1);
+
+    return sqrt(-2.f * log(u1)) * cos(2.f * M_PI * u2);
+}
+
+inline CUDA_CALLABLE void adj_rand_init_philox(int seed, int offset, int& adj_seed, int& adj_offset, philox_state_t& adj_ret) {}
+inline CUDA_CALLABLE void adj_randf4_philox(const philox_state_t& state, int counter, philox_state_t& adj_state, int& adj_counter, const vec4& adj_ret) {}
+inline CUDA_CALLABLE void adj_randn_philox(const philox_state_t& state, int counter, philox_state_t& adj_state, int& adj_counter, float adj_ret) {}
+
+
+// Combined Tausworthe generator (L'Ecuyer 1996) with an LCG as fourth component, see
+// GPU Gems 3, chapter 37. The state is four words per thread and has a period of ~2^121
+struct taus_state_t
+{
+    CUDA_CALLABLE taus_state_t() {}
+    CUDA_CALLABLE taus_state_t(int) {} // for backward pass
+
+    uint32 z1;
+    uint32 z2;
+    uint32 z3;
+    uint32 z4;
+};
+
+inline CUDA_CALLABLE uint32 taus_step(uint32 z, int s1, int s2, int s3, uint32 m)
+{
+    uint32 b = ((z << s1) ^ z) >> s2;
+    return ((z & m) << s3) ^ b;
+}
+
+inline CUDA_CALLABLE taus_state_t rand_init_taus(int seed, int offset)
+{
+    // the Tausworthe components must be seeded with z1 > 1, z2 > 7, z3 > 15
+    uint32 s = rand_init(seed, offset);
+
+    taus_state_t state;
+    state.z1 = (s = rand_pcg(s)) | 128u;
+    state.z2 = (s = rand_pcg(s)) | 128u;
+    state.z3 = (s = rand_pcg(s)) | 128u;
+    state.z4 = rand_pcg(s);
+
+    return state;
+}
+
+inline CUDA_CALLABLE uint32 rand_taus(taus_state_t& state)
+{
+    state.z1 = taus_step(state.z1, 13, 19, 12, 4294967294u);
+    state.z2 = taus_step(state.z2, 2, 25, 4, 4294967288u);
+    state.z3 = taus_step(state.z3, 3, 11, 17, 4294967280u);
+    state.z4 = 1664525u*state.z4 + 1013904223u;
+
+    return state.z1 ^ state.z2 ^ state.z3 ^ state.z4;
+}
+
+// places the top 23 bits in the mantissa of a float in [1, 2), avoids the int to float conversion
+inline CUDA_CALLABLE float randf_taus(taus_state_t& state)
+{
+    union { uint32 u; float f; } v;
+    v.u = (rand_taus(state) >> 9) | 0x3f800000u;
+
+    return v.f - 1.0f;
+}
+
+inline CUDA_CALLABLE void adj_rand_init_taus(int seed, int offset, int& adj_seed, int& adj_offset, taus_state_t& adj_ret) {}
+inline CUDA_CALLABLE void adj_randf_taus(taus_state_t& state, taus_state_t& adj_state, float adj_ret) {}
+
 } // namespace wp
\ No newline at end of file
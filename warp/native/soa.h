@@ -0,0 +1,91 @@
+/** Copyright (c) 2022 NVIDIA CORPORATION.  All rights reserved.
+ * NVIDIA CORPORATION and its licensors retain all intellectual property
+ * and proprietary rights in and to this software, related documentation
+ * and any modifications thereto.  Any use, reproduction, disclosure or
+ * distribution of this software and related documentation without an express
+ * license agreement from NVIDIA CORPORATION is strictly prohibited.
+ */
+
+#pragma once
+
+namespace wp
+{
+
+// struct-of-arrays access for vectors stored in a 2d float array of shape (components, n),
+// every component is a contiguous row so neighboring threads issue coalesced 4 byte loads
+// instead of strided 12 or 16 byte ones
+
+inline CUDA_CALLABLE vec2 load_soa_vec2(const array_t<float>& a, int i) { return vec2(index(a, 0, i), index(a, 1, i)); }
+inline CUDA_CALLABLE vec3 load_soa_vec3(const array_t<float>& a, int i) { return vec3(index(a, 0, i), index(a, 1, i), index(a, 2, i)); }
+inline CUDA_CALLABLE vec4 load_soa_vec4(const array_t<float>& a, int i) { return vec4(index(a, 0, i), index(a, 1, i), index(a, 2, i), index(a, 3, i)); }
+
+inline CUDA_CALLABLE void adj_load_soa_vec2(const array_t<float>& a, int i, const array_t<float>& adj_a, int& adj_i, const vec2& adj_ret)
+{
+    if (adj_a.data)
+    {
+        adj_atomic_add(&index(adj_a, 0, i), adj_ret.x);
+        adj_atomic_add(&index(adj_a, 1, i), adj_ret.y);
+    }
+}
+
+inline CUDA_CALLABLE void adj_load_soa_vec3(const array_t<float>& a, int i, const array_t<float>& adj_a, int& adj_i, const vec3& adj_ret)
+{
+    if (adj_a.data)
+    {
+        adj_atomic_add(&index(adj_a, 0, i), adj_ret.x);
+        adj_atomic_add(&index(adj_a, 1, i), adj_ret.y);
+        adj_atomic_add(&index(adj_a, 2, i), adj_ret.z);
+    }
+}
+
+inline CUDA_CALLABLE void adj_load_soa_vec4(const array_t<float>& a, int i, const array_t<float>& adj_a, int& adj_i, const vec4& adj_ret)
+{
+    if (adj_a.data)
+    {
+        adj_atomic_add(&index(adj_a, 0, i), adj_ret.x);
+        adj_atomic_add(&index(adj_a, 1, i), adj_ret.y);
+        adj_atomic_add(&index(adj_a, 2, i), adj_ret.z);
+        adj_atomic_add(&index(adj_a, 3, i), adj_ret.w);
+    }
+}
+
+inline CUDA_CALLABLE void store_soa(const array_t<float>& a, int i, const vec2& value)
+{
+    index(a, 0, i) = value.x;
+    index(a, 1, i) = value.y;
+}
+
+inline CUDA_CALLABLE void store_soa(const array_t<float>& a, int i, const vec3& value)
+{
+    index(a, 0, i) = value.x;
+    index(a, 1, i) = value.y;
+    index(a, 2, i) = value.z;
+}
+
+inline CUDA_CALLABLE void store_soa(const array_t<float>& a, int i, const vec4& value)
+{
+    index(a, 0, i) = value.x;
+    index(a, 1, i) = value.y;
+    index(a, 2, i) = value.z;
+    index(a, 3, i) = value.w;
+}
+
+inline CUDA_CALLABLE void adj_store_soa(const array_t<float>& a, int i, const vec2& value, const array_t<float>& adj_a, int& adj_i, vec2& adj_value)
+{
+    if (adj_a.data)
+        adj_value += vec2(index(adj_a, 0, i), index(adj_a, 1, i));
+}
+
+inline CUDA_CALLABLE void adj_store_soa(const array_t<float>& a, int i, const vec3& value, const array_t<float>& adj_a, int& adj_i, vec3& adj_value)
+{
+    if (adj_a.data)
+        adj_value += vec3(index(adj_a, 0, i), index(adj_a, 1, i), index(adj_a, 2, i));
+}
+
+inline CUDA_CALLABLE void adj_store_soa(const array_t<float>& a, int i, const vec4& value, const array_t<float>& adj_a, int& adj_i, vec4& adj_value)
+{
+    if (adj_a.data)
+        adj_value += vec4(index(adj_a, 0, i), index(adj_a, 1, i), index(adj_a, 2, i), index(adj_a, 3, i));
+}
+
+} // namespace wp
@@ -802,12 +802,17 @@ CUDA_CALLABLE inline void spatial_jacobian(
             {
                 const int col = (joint_dof_start-articulation_dof_start) + dof;
 
-                J[row_index(articulation_dof_count, row_start+0, col)] = S[col].w.x;
-                J[row_index(articulation_dof_count, row_start+1, col)] = S[col].w.y;
-                J[row_index(articulation_dof_count, row_start+2, col)] = S[col].w.z;
-                J[row_index(articulation_dof_count, row_start+3, col)] = S[col].v.x;
-                J[row_index(articulation_dof_count, row_start+4, col)] = S[col].v.y;
-                J[row_index(articulation_dof_count, row_start+5, col)] = S[col].v.z;
+                // load the motion subspace column once, the stores to J may alias S
+                // so indexing S per row would reload it after every store
+                const spatial_vector s = S[col];
+                float* J_col = J + row_index(articulation_dof_count, row_start, col);
+
+                J_col[0*articulation_dof_count] = s.w.x;
+                J_col[1*articulation_dof_count] = s.w.y;
+                J_col[2*articulation_dof_count] = s.w.z;
+                J_col[3*articulation_dof_count] = s.v.x;
+                J_col[4*articulation_dof_count] = s.v.y;
+                J_col[5*articulation_dof_count] = s.v.z;
             }
 
             j = joint_parents[j];
@@ -882,11 +887,17 @@ CUDA_CALLABLE inline void spatial_mass(const spatial_matrix* I_s, int joint_star
 
     for (int l=0; l < joint_count; ++l)
     {
+        // copy the inertia locally as stores to M may alias I_s, and write
+        // each row of the diagonal block through a single base pointer
+        const spatial_matrix I = I_s[joint_start + l];
+
         for (int i=0; i < 6; ++i)
         {
+            float* M_row = M + M_start + row_index(stride, l*6 + i, l*6);
+
             for (int j=0; j < 6; ++j)
             {
-                M[M_start + row_index(stride, l*6 + i, l*6 + j)] = I_s[joint_start + l].data[i][j];
+                M_row[j] = I.data[i][j];
             }
         }
     } 
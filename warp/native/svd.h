@@ -38,17 +38,17 @@
 namespace wp
 {
 
-#define _gamma 5.828427124 // FOUR_GAMMA_SQUARED = sqrt(8)+3;
-#define _cstar 0.923879532 // cos(pi/8)
-#define _sstar 0.3826834323 // sin(p/8)
-#define _EPSILON 1e-6
+#define _gamma 5.828427124f // FOUR_GAMMA_SQUARED = sqrt(8)+3;
+#define _cstar 0.923879532f // cos(pi/8)
+#define _sstar 0.3826834323f // sin(p/8)
+#define _EPSILON 1e-6f
 
-// TODO: replace sqrt with rsqrt
+// constants above are single precision so that none of the arithmetic below is promoted to double
 
 inline CUDA_CALLABLE
 float accurateSqrt(float x)
 {
-  return x / sqrt(x);
+  return x * rsqrt(x);
 }
 
 inline CUDA_CALLABLE
@@ -145,7 +145,7 @@ void approximateGivensQuaternion(float a11, float a12, float a22, float &ch, flo
     ch = 2*(a11-a22);
     sh = a12;
     bool b = _gamma*sh*sh < ch*ch;
-    float w = 1.0 / sqrt(ch*ch+sh*sh);
+    float w = rsqrt(ch*ch+sh*sh);
     ch=b?w*ch:_cstar;
     sh=b?w*sh:_sstar;
 }
@@ -220,6 +220,11 @@ void jacobiEigenanlysis( // symmetric matrix
                                 float * qV)
 {
     qV[3]=1; qV[0]=0;qV[1]=0;qV[2]=0; // follow same indexing convention as GLM
+
+    // fixed number of sweeps, fully unrolled on device so there is no divergent loop
+#if defined(__CUDA_ARCH__)
+    #pragma unroll
+#endif
     for (int i=0;i<4;i++)
     {
         // we wish to eliminate the maximum off-diagonal element
@@ -274,7 +279,7 @@ void QRGivensQuaternion(float a1, float a2, float &ch, float &sh)
     ch = fabs(a1) + fmax(rho,epsilon);
     bool b = a1 < 0;
     condSwap(b,sh,ch);
-    float w = 1.0 / sqrt(ch*ch+sh*sh);
+    float w = rsqrt(ch*ch+sh*sh);
     ch *= w;
     sh *= w;
 }
@@ -175,9 +175,10 @@ inline CUDA_CALLABLE float length_sq(vec3 a)
 
 inline CUDA_CALLABLE vec3 normalize(vec3 a)
 {
-    float l = length(a);
-    if (l > kEps)
-        return div(a,l);
+    // one rsqrt and a multiply instead of a sqrt and per-component divides
+    float l_sq = dot(a, a);
+    if (l_sq > kEps*kEps)
+        return mul(a, rsqrt(l_sq));
     else
         return vec3();
 }
@@ -129,9 +129,10 @@ inline CUDA_CALLABLE float length(vec4 a)
 
 inline CUDA_CALLABLE vec4 normalize(vec4 a)
 {
-    float l = length(a);
-    if (l > kEps)
-        return div(a,l);
+    // one rsqrt and a multiply instead of a sqrt and per-component divides
+    float l_sq = dot(a, a);
+    if (l_sq > kEps*kEps)
+        return mul(a, rsqrt(l_sq));
     else
         return vec4();
 }
@@ -29,6 +29,14 @@ import warp.tests.test_grad
 import warp.tests.test_intersect
 import warp.tests.test_array
 import warp.tests.test_launch
+import warp.tests.test_dense
+
+# torch is an optional dependency, its interop tests only run when it is installed
+try:
+    import warp.tests.test_torch
+    has_torch = True
+except ImportError:
+    has_torch = False
 
 def run():
 
@@ -54,6 +62,10 @@ def run():
     tests.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(warp.tests.test_intersect.register(unittest.TestCase)))
     tests.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(warp.tests.test_array.register(unittest.TestCase)))
     tests.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(warp.tests.test_launch.register(unittest.TestCase)))
+    tests.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(warp.tests.test_dense.register(unittest.TestCase)))
+
+    if has_torch:
+        tests.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(warp.tests.test_torch.register(unittest.TestCase)))
 
     # load all modules
     wp.force_load()
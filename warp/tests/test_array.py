@@ -151,6 +151,76 @@ def test_4d(test, device):
         
 
 
+@wp.kernel
+def kernel_soa(src: wp.array(dtype=float, ndim=2), dst: wp.array(dtype=float, ndim=2), loss: wp.array(dtype=float)):
+
+    i = wp.tid()
+
+    v = wp.load_soa_vec3(src, i)
+    wp.store_soa(dst, i, v*2.0)
+
+    wp.atomic_add(loss, 0, wp.dot(v, wp.vec3(1.0, 2.0, 3.0)))
+
+
+def test_soa(test, device):
+
+    n = 8
+
+    a = np.arange(0, 3*n, dtype=np.float32).reshape(3, n)
+
+    src = wp.array(a, dtype=float, device=device, requires_grad=True)
+    dst = wp.zeros((3, n), dtype=float, device=device)
+    loss = wp.zeros(1, dtype=float, device=device, requires_grad=True)
+
+    tape = wp.Tape()
+    with tape:
+        wp.launch(kernel_soa, dim=n, inputs=[src, dst, loss], device=device)
+
+    assert_np_equal(dst.numpy(), a*2.0)
+
+    tape.backward(loss=loss)
+
+    expected = np.repeat(np.array([[1.0], [2.0], [3.0]], dtype=np.float32), n, axis=1)
+    assert_np_equal(tape.gradients[src].numpy(), expected)
+
+
+@wp.kernel
+def kernel_scatter_aggregated(cells: wp.array(dtype=int), values: wp.array(dtype=float), grid: wp.array(dtype=float)):
+
+    i = wp.tid()
+
+    wp.atomic_add_aggregated(grid, cells[i], values[i])
+
+
+def test_atomic_add_aggregated(test, device):
+
+    n = 1024
+    num_cells = 7
+
+    rng = np.random.default_rng(42)
+    cells = rng.integers(0, num_cells, size=n).astype(np.int32)
+    values = rng.integers(0, 8, size=n).astype(np.float32)
+
+    grid = wp.zeros(num_cells, dtype=float, device=device)
+
+    wp.launch(kernel_scatter_aggregated, dim=n, inputs=[wp.array(cells, device=device), wp.array(values, device=device), grid], device=device)
+
+    expected = np.bincount(cells, weights=values, minlength=num_cells).astype(np.float32)
+    assert_np_equal(grid.numpy(), expected)
+
+
+
+def test_alloc_pool(test, device):
+
+    a = wp.array(np.ones(1000), dtype=float, device=device)
+    ptr = a.ptr
+    del a
+
+    # a similar size should reuse the freed allocation, and still be zero-initialized
+    b = wp.zeros(990, dtype=float, device=device)
+    test.assertEqual(b.ptr, ptr)
+    test.assertTrue((b.numpy() == 0.0).all())
+
 
 def register(parent):
 
@@ -163,6 +233,9 @@ def register(parent):
     add_function_test(TestArray, "test_2d_array", test_2d, devices=devices)
     add_function_test(TestArray, "test_3d_array", test_3d, devices=devices)
     add_function_test(TestArray, "test_4d_array", test_4d, devices=devices)
+    add_function_test(TestArray, "test_soa", test_soa, devices=devices)
+    add_function_test(TestArray, "test_atomic_add_aggregated", test_atomic_add_aggregated, devices=devices)
+    add_function_test(TestArray, "test_alloc_pool", test_alloc_pool, devices=devices)
 
     return TestArray
 
@@ -122,6 +122,29 @@ def test_range_static_sum(result: wp.array(dtype=int)):
     result[2] = c
 
 
+RANGE_CONSTANT = wp.constant(4)
+
+@wp.kernel
+def test_range_static_constant_sum(result: wp.array(dtype=int)):
+
+    # loop bounds that fold to compile-time integers are unrolled like literals
+    a = int(0)
+    for i in range(RANGE_CONSTANT):
+        a = a + 1
+
+    b = int(0)
+    for i in range(0, 2*RANGE_CONSTANT + 2):
+        b = b + 1
+
+    c = int(0)
+    for i in range(RANGE_CONSTANT*5, -RANGE_CONSTANT, -RANGE_CONSTANT):
+        c = c + 1
+
+    result[0] = a
+    result[1] = b
+    result[2] = c
+
+
 @wp.kernel
 def test_range_dynamic_sum(start: int, end: int, step: int, result: wp.array(dtype=int)):
 
@@ -189,6 +212,39 @@ def test_while(n: int):
     wp.expect_eq(i, n)
 
 
+def test_expect_disabled(test, device):
+
+    options = {"max_unroll": 16, "enable_expect": True}
+
+    adj = wp.codegen.Adjoint(test_rename.func)
+    adj.build(wp.context.builtin_functions, {}, options)
+    test.assertIn("wp::expect_eq", "\n".join(adj.blocks[0].body_forward))
+
+    # with expect disabled the checks should generate no code at all
+    options["enable_expect"] = False
+
+    adj = wp.codegen.Adjoint(test_rename.func)
+    adj.build(wp.context.builtin_functions, {}, options)
+    test.assertNotIn("expect_eq", "\n".join(adj.blocks[0].body_forward + adj.blocks[0].body_reverse))
+
+def test_range_static_constant_unrolled(test, device):
+
+    options = {"max_unroll": 16, "enable_expect": True}
+
+    # dynamic bounds generate a loop
+    adj = wp.codegen.Adjoint(test_range_dynamic_sum.func)
+    adj.build(wp.context.builtin_functions, {}, options)
+    test.assertIn("for_start", "\n".join(adj.blocks[0].body_forward))
+
+    # bounds that fold to constants should be fully unrolled with no loop left
+    adj = wp.codegen.Adjoint(test_range_static_constant_sum.func)
+    adj.build(wp.context.builtin_functions, {}, options)
+
+    body = "\n".join(adj.blocks[0].body_forward + adj.blocks[0].body_reverse)
+    test.assertNotIn("for_start", body)
+    test.assertNotIn("wp::range", body)
+
+
 def register(parent):
 
     class TestCodeGen(parent):
@@ -210,6 +266,7 @@ def register(parent):
     add_kernel_test(TestCodeGen, name="test_range_dynamic_reverse_step", kernel=test_range_dynamic, dim=1, inputs=[8, 0, -2], expect=[8, 6, 4, 2], devices=devices)
 
     add_kernel_test(TestCodeGen, name="test_range_static_sum", kernel=test_range_static_sum, dim=1, expect=[10, 10, 10], devices=devices)
+    add_kernel_test(TestCodeGen, name="test_range_static_constant_sum", kernel=test_range_static_constant_sum, dim=1, expect=[4, 10, 6], devices=devices)
     add_kernel_test(TestCodeGen, name="test_range_dynamic_sum", kernel=test_range_dynamic_sum, dim=1, inputs=[0, 10, 2], expect=[10, 10, 10, 10], devices=devices)
     add_kernel_test(TestCodeGen, name="test_range_dynamic_sum_zero", kernel=test_range_dynamic_sum, dim=1, inputs=[0, 0, 1], expect=[0, 0, 0, 0], devices=devices)
 
@@ -218,6 +275,9 @@ def register(parent):
     add_kernel_test(TestCodeGen, name="test_while_zero", kernel=test_while, dim=1, inputs=[0], devices=devices)
     add_kernel_test(TestCodeGen, name="test_while_positive", kernel=test_while, dim=1, inputs=[16], devices=devices)
 
+    add_function_test(TestCodeGen, "test_expect_disabled", test_expect_disabled, devices=devices)
+    add_function_test(TestCodeGen, "test_range_static_constant_unrolled", test_range_static_constant_unrolled, devices=devices)
+
     return TestCodeGen
 
 
@@ -242,6 +242,7 @@ def test_scalar_arg_types(i8: wp.int8,
                           u32: wp.uint32,
                           i64: wp.int64,
                           u64: wp.uint64,
+                          f16: wp.float16,
                           f32: wp.float32,
                           f64: wp.float64):
                   
@@ -253,8 +254,10 @@ def test_scalar_arg_types(i8: wp.int8,
     wp.expect_eq(int(u32), 255)
     wp.expect_eq(int(i64), -64)
     wp.expect_eq(int(u64), 255)
+    wp.expect_eq(int(f16), 3)
     wp.expect_eq(int(f32), 3)
     wp.expect_eq(int(f64), 3)
+    wp.expect_eq(float(f16), 3.140625)
     wp.expect_eq(float(f32), 3.14159)
     wp.expect_eq(float(f64), 3.14159)
 
@@ -268,6 +271,7 @@ def test_scalar_array_types_load(i8: wp.array(dtype=wp.int8),
                                  u32: wp.array(dtype=wp.uint32),
                                  i64: wp.array(dtype=wp.int64),
                                  u64: wp.array(dtype=wp.uint64),
+                                 f16: wp.array(dtype=wp.float16),
                                  f32: wp.array(dtype=wp.float32),
                                  f64: wp.array(dtype=wp.float64)):
                   
@@ -281,6 +285,7 @@ def test_scalar_array_types_load(i8: wp.array(dtype=wp.int8),
     wp.expect_eq(int(u32[tid]), tid)
     wp.expect_eq(int(i64[tid]), tid)
     wp.expect_eq(int(u64[tid]), tid)
+    wp.expect_eq(float(f16[tid]), float(tid))
     wp.expect_eq(float(f32[tid]), float(tid))
     wp.expect_eq(float(f64[tid]), float(tid))
     
@@ -293,6 +298,7 @@ def test_scalar_array_types_store(i8: wp.array(dtype=wp.int8),
                                   u32: wp.array(dtype=wp.uint32),
                                   i64: wp.array(dtype=wp.int64),
                                   u64: wp.array(dtype=wp.uint64),
+                                  f16: wp.array(dtype=wp.float16),
                                   f32: wp.array(dtype=wp.float32),
                                   f64: wp.array(dtype=wp.float64)):
                   
@@ -306,6 +312,7 @@ def test_scalar_array_types_store(i8: wp.array(dtype=wp.int8),
     u32[tid] = wp.uint32(tid)
     i64[tid] = wp.int64(tid)
     u64[tid] = wp.uint64(tid)
+    f16[tid] = wp.float16(tid)
     f32[tid] = wp.float32(tid)
     f64[tid] = wp.float64(tid)
 
@@ -318,6 +325,7 @@ def test_scalar_array_types_store(i8: wp.array(dtype=wp.int8),
     wp.expect_eq(int(u32[tid]), tid)
     wp.expect_eq(int(i64[tid]), tid)
     wp.expect_eq(int(u64[tid]), tid)
+    wp.expect_eq(float(f16[tid]), float(tid))
     wp.expect_eq(float(f32[tid]), float(tid))
     wp.expect_eq(float(f64[tid]), float(tid))
 
@@ -334,14 +342,15 @@ def test_scalar_array_types(test, device, load, store):
     u32 = wp.array(np.linspace(0, dim, dim, endpoint=False, dtype=np.uint32), device=device)
     i64 = wp.array(np.linspace(0, dim, dim, endpoint=False, dtype=np.int64), device=device)
     u64 = wp.array(np.linspace(0, dim, dim, endpoint=False, dtype=np.uint64), device=device)
+    f16 = wp.array(np.linspace(0, dim, dim, endpoint=False, dtype=np.float16), device=device)
     f32 = wp.array(np.linspace(0, dim, dim, endpoint=False, dtype=np.float32), device=device)
     f64 = wp.array(np.linspace(0, dim, dim, endpoint=False, dtype=np.float64), device=device)
 
     if load:
-        wp.launch(test_scalar_array_types_load, dim=dim, inputs=[i8, u8, i16, u16, i32, u32, i64, u64, f32, f64], device=device)
+        wp.launch(test_scalar_array_types_load, dim=dim, inputs=[i8, u8, i16, u16, i32, u32, i64, u64, f16, f32, f64], device=device)
 
     if store:
-        wp.launch(test_scalar_array_types_store, dim=dim, inputs=[i8, u8, i16, u16, i32, u32, i64, u64, f32, f64], device=device)
+        wp.launch(test_scalar_array_types_store, dim=dim, inputs=[i8, u8, i16, u16, i32, u32, i64, u64, f16, f32, f64], device=device)
 
 
 @wp.kernel
@@ -388,7 +397,7 @@ def register(parent):
     add_function_test(TestCTypes, "test_mat22", test_mat22, devices=devices)
     add_function_test(TestCTypes, "test_mat33", test_mat33, devices=devices)
     add_function_test(TestCTypes, "test_mat44", test_mat44, devices=devices)
-    add_kernel_test(TestCTypes, name="test_scalar_arg_types", kernel=test_scalar_arg_types, dim=1, inputs=[-64, 255, -64, 255, -64, 255, -64, 255, 3.14159, 3.14159], devices=devices)
+    add_kernel_test(TestCTypes, name="test_scalar_arg_types", kernel=test_scalar_arg_types, dim=1, inputs=[-64, 255, -64, 255, -64, 255, -64, 255, 3.14159, 3.14159, 3.14159], devices=devices)
     add_kernel_test(TestCTypes, name="test_vector_arg_types", kernel=test_vector_arg_types, dim=1, inputs=inputs, devices=devices)
     add_function_test(TestCTypes, "test_scalar_array_load", test_scalar_array_types, devices=devices, load=True, store=False)
     add_function_test(TestCTypes, "test_scalar_array_store", test_scalar_array_types, devices=devices, load=False, store=True)
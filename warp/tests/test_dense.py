@@ -14,6 +14,10 @@ wp.init()
 def eval_dense_gemm(m: int, n: int, p: int, t1: int, t2: int, A: wp.array(dtype=float), B: wp.array(dtype=float), C: wp.array(dtype=float)):
     wp.dense_gemm(m, n, p, t1, t2, A, B, C)
 
+@wp.kernel
+def eval_dense_gemm_batched(m: wp.array(dtype=int), n: wp.array(dtype=int), p: wp.array(dtype=int), t1: int, t2: int, A_start: wp.array(dtype=int), B_start: wp.array(dtype=int), C_start: wp.array(dtype=int), A: wp.array(dtype=float), B: wp.array(dtype=float), C: wp.array(dtype=float)):
+    wp.dense_gemm_batched(m, n, p, t1, t2, A_start, B_start, C_start, A, B, C)
+
 @wp.kernel
 def eval_dense_cholesky(n: int, A: wp.array(dtype=float), regularization: float, L: wp.array(dtype=float)):
     wp.dense_chol(n, A, regularization, L)
@@ -22,12 +26,106 @@ def eval_dense_cholesky(n: int, A: wp.array(dtype=float), regularization: float,
 def eval_dense_subs(n: int, L: wp.array(dtype=float), b: wp.array(dtype=float), x: wp.array(dtype=float)):
     wp.dense_subs(n, L, b, x)
 
+@wp.kernel
+def eval_dense_cholesky_batched(A_start: wp.array(dtype=int), A_dim: wp.array(dtype=int), A: wp.array(dtype=float), regularization: float, L: wp.array(dtype=float)):
+    wp.dense_chol_batched(A_start, A_dim, A, regularization, L)
+
 # helper that propagates gradients back to A, treating L as a constant / temporary variable
 # allows us to reuse the Cholesky decomposition from the forward pass
 @wp.kernel
 def eval_dense_solve(n: int, A: wp.array(dtype=float), L: wp.array(dtype=float), b: wp.array(dtype=float), x: wp.array(dtype=float)):
     wp.dense_solve(n, A, L, b, x)
 
+@wp.kernel
+def eval_dense_solve_batched(b_start: wp.array(dtype=int), A_start: wp.array(dtype=int), A_dim: wp.array(dtype=int), A: wp.array(dtype=float), L: wp.array(dtype=float), b: wp.array(dtype=float), x: wp.array(dtype=float)):
+    wp.dense_solve_batched(b_start, A_start, A_dim, A, L, b, x)
+
+
+def test_dense_gemm_batched(test, device):
+
+    rng = np.random.default_rng(42)
+
+    # (m, n, p) of each batch item, items are packed one after another in A, B, C
+    dims = [(2, 3, 4), (3, 1, 2), (1, 2, 2)]
+
+    A_np = [rng.standard_normal((m, p)).astype(np.float32) for m, n, p in dims]
+    B_np = [rng.standard_normal((p, n)).astype(np.float32) for m, n, p in dims]
+
+    A_start = np.cumsum([0] + [m*p for m, n, p in dims])[:-1]
+    B_start = np.cumsum([0] + [p*n for m, n, p in dims])[:-1]
+    C_start = np.cumsum([0] + [m*n for m, n, p in dims])[:-1]
+
+    A = wp.array(np.concatenate([a.flatten() for a in A_np]), dtype=float, device=device, requires_grad=True)
+    B = wp.array(np.concatenate([b.flatten() for b in B_np]), dtype=float, device=device, requires_grad=True)
+    C = wp.zeros(sum(m*n for m, n, p in dims), dtype=float, device=device, requires_grad=True)
+
+    tape = wp.Tape()
+    with tape:
+        wp.launch(eval_dense_gemm_batched, dim=len(dims), inputs=[
+            wp.array([d[0] for d in dims], dtype=int, device=device),
+            wp.array([d[1] for d in dims], dtype=int, device=device),
+            wp.array([d[2] for d in dims], dtype=int, device=device),
+            0, 0,
+            wp.array(A_start, dtype=int, device=device),
+            wp.array(B_start, dtype=int, device=device),
+            wp.array(C_start, dtype=int, device=device),
+            A, B, C], device=device)
+
+    C_expected = np.concatenate([(a@b).flatten() for a, b in zip(A_np, B_np)])
+    assert_np_equal(C.numpy(), C_expected, tol=1.e-5)
+
+    # loss = sum(C), so adj_C is all ones, adj_A = adj_C*B^T and adj_B = A^T*adj_C
+    tape.backward(grads={C: wp.array(np.ones(len(C_expected)), dtype=float, device=device)})
+
+    adj_A_expected = np.concatenate([(np.ones((a.shape[0], b.shape[1]))@b.T).flatten() for a, b in zip(A_np, B_np)])
+    adj_B_expected = np.concatenate([(a.T@np.ones((a.shape[0], b.shape[1]))).flatten() for a, b in zip(A_np, B_np)])
+
+    assert_np_equal(tape.gradients[A].numpy(), adj_A_expected, tol=1.e-5)
+    assert_np_equal(tape.gradients[B].numpy(), adj_B_expected, tol=1.e-5)
+
+
+def test_dense_solve_batched(test, device):
+
+    rng = np.random.default_rng(42)
+
+    # symmetric positive definite systems of different sizes, packed one after another
+    dims = [2, 3, 1]
+
+    A_np = []
+    for n in dims:
+        M = rng.standard_normal((n, n))
+        A_np.append((M@M.T + n*np.eye(n)).astype(np.float32))
+
+    b_np = [rng.standard_normal(n).astype(np.float32) for n in dims]
+
+    A_start = wp.array(np.cumsum([0] + [n*n for n in dims])[:-1], dtype=int, device=device)
+    b_start = wp.array(np.cumsum([0] + dims)[:-1], dtype=int, device=device)
+    A_dim = wp.array(dims, dtype=int, device=device)
+
+    A = wp.array(np.concatenate([a.flatten() for a in A_np]), dtype=float, device=device, requires_grad=True)
+    L = wp.zeros_like(A)
+    b = wp.array(np.concatenate(b_np), dtype=float, device=device, requires_grad=True)
+    x = wp.zeros_like(b)
+
+    tape = wp.Tape()
+    with tape:
+        wp.launch(eval_dense_cholesky_batched, dim=len(dims), inputs=[A_start, A_dim, A, 0.0, L], device=device)
+        wp.launch(eval_dense_solve_batched, dim=len(dims), inputs=[b_start, A_start, A_dim, A, L, b, x], device=device)
+
+    L_expected = np.concatenate([np.linalg.cholesky(a).flatten() for a in A_np])
+    x_expected = np.concatenate([np.linalg.solve(a, rhs) for a, rhs in zip(A_np, b_np)])
+
+    assert_np_equal(L.numpy(), L_expected, tol=1.e-5)
+    assert_np_equal(x.numpy(), x_expected, tol=1.e-5)
+
+    # loss = sum(x), so adj_b = A^-T*1 and adj_A = -adj_b*x^T
+    tape.backward(grads={x: wp.array(np.ones(len(x_expected)), dtype=float, device=device)})
+
+    adj_b_expected = [np.linalg.solve(a.T, np.ones(len(rhs))) for a, rhs in zip(A_np, b_np)]
+    adj_A_expected = [-np.outer(adj_b, np.linalg.solve(a, rhs)) for a, rhs, adj_b in zip(A_np, b_np, adj_b_expected)]
+
+    assert_np_equal(tape.gradients[b].numpy(), np.concatenate(adj_b_expected), tol=1.e-5)
+    assert_np_equal(tape.gradients[A].numpy(), np.concatenate([g.flatten() for g in adj_A_expected]), tol=1.e-5)
 
 
 def register(parent):
@@ -41,6 +139,9 @@ def register(parent):
     # most are deprecated / WIP
     wp.force_load()
 
+    add_function_test(TestDense, "test_dense_gemm_batched", test_dense_gemm_batched, devices=devices)
+    add_function_test(TestDense, "test_dense_solve_batched", test_dense_solve_batched, devices=devices)
+
     return TestDense
 
 if __name__ == '__main__':
@@ -36,6 +36,42 @@ def test_intersect_tri(test, device):
     assert_np_equal(result.numpy(), np.array([0]))
 
 
+@wp.kernel
+def pack_triangles(points: wp.array(dtype=wp.vec3),
+                   triangles: wp.array(dtype=wp.rt_triangle_t)):
+
+    tid = wp.tid()
+
+    triangles[tid] = wp.pack_triangle(points[tid*3+0], points[tid*3+1], points[tid*3+2])
+
+
+@wp.kernel
+def intersect_tri_compressed(triangles: wp.array(dtype=wp.rt_triangle_t),
+                             result: wp.array(dtype=int)):
+
+    tid = wp.tid()
+
+    result[tid] = wp.intersect_tri_tri(triangles[0], triangles[tid+1])
+
+
+def test_intersect_tri_compressed(test, device):
+
+    points = [wp.vec3(0.0, 0.0, 0.0), wp.vec3(1.0, 0.0, 0.0), wp.vec3(0.0, 0.0, 1.0),
+              wp.vec3(0.5, -0.5, 0.0), wp.vec3(0.5, -0.5, 1.0), wp.vec3(0.5, 0.5, 0.0),
+              wp.vec3(-0.5, -0.5, 0.0), wp.vec3(-0.5, -0.5, 1.0), wp.vec3(-0.5, 0.5, 0.0)]
+
+    points = wp.array(points, dtype=wp.vec3, device=device)
+    triangles = wp.zeros(3, dtype=wp.rt_triangle_t, device=device)
+    result = wp.zeros(2, dtype=int, device=device)
+
+    test.assertEqual(triangles.numpy().nbytes, 3*24)
+
+    wp.launch(pack_triangles, dim=3, inputs=[points, triangles], device=device)
+    wp.launch(intersect_tri_compressed, dim=2, inputs=[triangles, result], device=device)
+
+    assert_np_equal(result.numpy(), np.array([1, 0]))
+
+
 
 def register(parent):
 
@@ -45,6 +81,7 @@ def register(parent):
         pass
     
     add_function_test(TestIntersect, "test_intersect_tri", test_intersect_tri, devices=devices)
+    add_function_test(TestIntersect, "test_intersect_tri_compressed", test_intersect_tri_compressed, devices=devices)
     
     return TestIntersect
 
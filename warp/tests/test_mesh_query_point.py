@@ -162,21 +162,22 @@ def particle_grid(dim_x, dim_y, dim_z, lower, radius, jitter):
 
 # triangulate a list of polygon face indices
 def triangulate(face_counts, face_indices):
-    num_tris = np.sum(np.subtract(face_counts, 2))
-    num_tri_vtx = num_tris * 3
-    tri_indices = np.zeros(num_tri_vtx, dtype=int)
-    ctr = 0
-    wedgeIdx = 0
-
-    for nb in face_counts:
-        for i in range(nb-2):
-            tri_indices[ctr] = face_indices[wedgeIdx]
-            tri_indices[ctr + 1] = face_indices[wedgeIdx + i + 1]
-            tri_indices[ctr + 2] = face_indices[wedgeIdx + i + 2]
-            ctr+=3
-        wedgeIdx+=nb
-
-    return tri_indices
+    face_counts = np.asarray(face_counts, dtype=int)
+    face_indices = np.asarray(face_indices, dtype=int)
+
+    # each face is split into a fan of (count - 2) triangles around its first vertex
+    tris_per_face = face_counts - 2
+    face_starts = np.cumsum(face_counts) - face_counts
+
+    # offset of the first vertex of each triangle's face, and position of the triangle within the fan
+    tri_starts = np.repeat(face_starts, tris_per_face)
+    tri_fan = np.arange(len(tri_starts)) - np.repeat(np.cumsum(tris_per_face) - tris_per_face, tris_per_face)
+
+    tri_indices = np.stack((face_indices[tri_starts],
+                            face_indices[tri_starts + tri_fan + 1],
+                            face_indices[tri_starts + tri_fan + 2]), axis=1)
+
+    return tri_indices.flatten()
 
 
 def test_mesh_query_point(test, device):
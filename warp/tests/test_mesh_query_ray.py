@@ -19,21 +19,22 @@ wp.init()
 
 # triangulate a list of polygon face indices
 def triangulate(face_counts, face_indices):
-    num_tris = np.sum(np.subtract(face_counts, 2))
-    num_tri_vtx = num_tris * 3
-    tri_indices = np.zeros(num_tri_vtx, dtype=int)
-    ctr = 0
-    wedgeIdx = 0
+    face_counts = np.asarray(face_counts, dtype=int)
+    face_indices = np.asarray(face_indices, dtype=int)
 
-    for nb in face_counts:
-        for i in range(nb-2):
-            tri_indices[ctr] = face_indices[wedgeIdx]
-            tri_indices[ctr + 1] = face_indices[wedgeIdx + i + 1]
-            tri_indices[ctr + 2] = face_indices[wedgeIdx + i + 2]
-            ctr+=3
-        wedgeIdx+=nb
+    # each face is split into a fan of (count - 2) triangles around its first vertex
+    tris_per_face = face_counts - 2
+    face_starts = np.cumsum(face_counts) - face_counts
 
-    return tri_indices
+    # offset of the first vertex of each triangle's face, and position of the triangle within the fan
+    tri_starts = np.repeat(face_starts, tris_per_face)
+    tri_fan = np.arange(len(tri_starts)) - np.repeat(np.cumsum(tris_per_face) - tris_per_face, tris_per_face)
+
+    tri_indices = np.stack((face_indices[tri_starts],
+                            face_indices[tri_starts + tri_fan + 1],
+                            face_indices[tri_starts + tri_fan + 2]), axis=1)
+
+    return tri_indices.flatten()
 
 
 @wp.kernel
@@ -114,6 +115,41 @@ def test_adj_mesh_query_ray(test, device):
 
     # numeric gradients
 
+    # every finite difference sample launches the same kernel on the same buffers, so the
+    # buffers are allocated once and on CUDA the launch is captured once and replayed per sample
+    query_points = wp.zeros(n=1, dtype=wp.vec3, device=device)
+    query_dirs = wp.zeros(n=1, dtype=wp.vec3, device=device)
+    intersection_points = wp.zeros(n=1, dtype=wp.vec3, device=device)
+    loss = wp.zeros(n=1, dtype=float, device=device)
+
+    # host staging buffers, each sample is written through their ndarray views
+    query_points_host = wp.zeros(n=1, dtype=wp.vec3, device="cpu")
+    query_dirs_host = wp.zeros(n=1, dtype=wp.vec3, device="cpu")
+    query_points_host_np = query_points_host.numpy()
+    query_dirs_host_np = query_dirs_host.numpy()
+
+    use_graph = (device == "cuda")
+
+    if (use_graph):
+        wp.capture_begin()
+        wp.launch(kernel=mesh_query_ray_loss, dim=1, inputs=[mesh.id, query_points, query_dirs, intersection_points, loss], device=device)
+        graph = wp.capture_end()
+
+    def eval_loss(point, dir):
+
+        query_points_host_np[0] = point
+        query_dirs_host_np[0] = dir
+
+        wp.copy(query_points, query_points_host)
+        wp.copy(query_dirs, query_dirs_host)
+
+        if (use_graph):
+            wp.capture_launch(graph)
+        else:
+            wp.launch(kernel=mesh_query_ray_loss, dim=1, inputs=[mesh.id, query_points, query_dirs, intersection_points, loss], device=device)
+
+        return loss.numpy()[0]
+
     # ray origin
     eps = 1.e-3
     loss_values_p = []
@@ -125,16 +161,7 @@ def test_adj_mesh_query_ray(test, device):
         wp.vec3(p[0], p[1], p[2] - eps), wp.vec3(p[0], p[1], p[2] + eps)]
 
     for i in range(6):
-        q = offset_query_points[i]
-
-        query_points = wp.array(q, dtype=wp.vec3, device=device)
-        query_dirs = wp.array(D, dtype=wp.vec3, device=device)
-        intersection_points = wp.zeros(n=1, dtype=wp.vec3, device=device)
-        loss = wp.zeros(n=1, dtype=float, device=device)
-
-        wp.launch(kernel=mesh_query_ray_loss, dim=1, inputs=[mesh.id, query_points, query_dirs, intersection_points, loss], device=device)
-
-        loss_values_p.append(loss.numpy()[0])
+        loss_values_p.append(eval_loss(offset_query_points[i], D))
 
     for i in range(3):
         l_0 = loss_values_p[i*2]
@@ -152,22 +179,16 @@ def test_adj_mesh_query_ray(test, device):
         wp.vec3(D[0], D[1], D[2] - eps), wp.vec3(D[0], D[1], D[2] + eps)]
 
     for i in range(6):
-        q = offset_query_dirs[i]
-
-        query_points = wp.array(p, dtype=wp.vec3, device=device)
-        query_dirs = wp.array(q, dtype=wp.vec3, device=device)
-        intersection_points = wp.zeros(n=1, dtype=wp.vec3, device=device)
-        loss = wp.zeros(n=1, dtype=float, device=device)
-
-        wp.launch(kernel=mesh_query_ray_loss, dim=1, inputs=[mesh.id, query_points, query_dirs, intersection_points, loss], device=device)
-
-        loss_values_D.append(loss.numpy()[0])
+        loss_values_D.append(eval_loss(p, offset_query_dirs[i]))
 
     for i in range(3):
         l_0 = loss_values_D[i*2]
         l_1 = loss_values_D[i*2+1]
         gradient = (l_1 - l_0) / (2.0*eps)
         numeric_D[i] = gradient
+
+    if (use_graph):
+        wp.capture_destroy(graph)
     
     error_p = ((analytic_p - numeric_p) * (analytic_p - numeric_p)).sum(axis=0)
     error_D = ((analytic_D - numeric_D) * (analytic_D - numeric_D)).sum(axis=0)
@@ -247,6 +247,80 @@ def test_adj_noise(test, device):
     test.assertTrue(err < 1.e-8)
 
 
+@wp.kernel
+def noise4_kernel(
+    kernel_seed: int,
+    query_positions: wp.array(dtype=wp.vec4),
+    batched: wp.array(dtype=wp.vec4),
+    batched_periodic: wp.array(dtype=wp.vec4),
+    scalar: wp.array(dtype=wp.vec4),
+    scalar_periodic: wp.array(dtype=wp.vec4)):
+
+    tid = wp.tid()
+    state = wp.rand_init(kernel_seed)
+    p = query_positions[tid]
+
+    batched[tid] = wp.noise4(state, p)
+    batched_periodic[tid] = wp.pnoise4(state, p, 4)
+
+    scalar[tid] = wp.vec4(wp.noise(state, p[0]), wp.noise(state, p[1]), wp.noise(state, p[2]), wp.noise(state, p[3]))
+    scalar_periodic[tid] = wp.vec4(wp.pnoise(state, p[0], 4), wp.pnoise(state, p[1], 4), wp.pnoise(state, p[2], 4), wp.pnoise(state, p[3], 4))
+
+
+@wp.kernel
+def noise4_loss_kernel(
+    kernel_seed: int,
+    query_positions: wp.array(dtype=wp.vec4),
+    noise_loss: wp.array(dtype=float)):
+
+    tid = wp.tid()
+    state = wp.rand_init(kernel_seed)
+
+    n = wp.noise4(state, query_positions[tid])
+
+    wp.atomic_add(noise_loss, 0, n[0] + n[1] + n[2] + n[3])
+
+
+def test_noise4(test, device):
+    N = 64
+    seed = 42
+
+    rng = np.random.default_rng(123)
+    positions = rng.uniform(-10.0, 10.0, size=(N, 4)).astype(np.float32)
+
+    query_positions = wp.array(positions, dtype=wp.vec4, device=device, requires_grad=True)
+    batched = wp.zeros(N, dtype=wp.vec4, device=device)
+    batched_periodic = wp.zeros(N, dtype=wp.vec4, device=device)
+    scalar = wp.zeros(N, dtype=wp.vec4, device=device)
+    scalar_periodic = wp.zeros(N, dtype=wp.vec4, device=device)
+
+    wp.launch(kernel=noise4_kernel, dim=N, inputs=[seed, query_positions, batched, batched_periodic, scalar, scalar_periodic], device=device)
+
+    assert_np_equal(batched.numpy(), scalar.numpy())
+    assert_np_equal(batched_periodic.numpy(), scalar_periodic.numpy())
+
+    # analytic gradient against central differences of the scalar noise
+    tape = wp.Tape()
+    noise_loss = wp.zeros(n=1, dtype=float, device=device)
+
+    with tape:
+        wp.launch(kernel=noise4_loss_kernel, dim=N, inputs=[seed, query_positions, noise_loss], device=device)
+
+    tape.backward(loss=noise_loss)
+    analytic = tape.gradients[query_positions].numpy()
+
+    eps = 1.e-3
+    lo = wp.zeros(N, dtype=wp.vec4, device=device)
+    hi = wp.zeros(N, dtype=wp.vec4, device=device)
+    unused = wp.zeros(N, dtype=wp.vec4, device=device)
+
+    wp.launch(kernel=noise4_kernel, dim=N, inputs=[seed, wp.array(positions - eps, dtype=wp.vec4, device=device), lo, unused, unused, unused], device=device)
+    wp.launch(kernel=noise4_kernel, dim=N, inputs=[seed, wp.array(positions + eps, dtype=wp.vec4, device=device), hi, unused, unused, unused], device=device)
+
+    numeric = (hi.numpy() - lo.numpy()) / (2.0*eps)
+    assert_np_equal(analytic, numeric, tol=1.e-2)
+
+
 def register(parent):
 
     devices = wp.get_devices()
@@ -257,6 +331,7 @@ def register(parent):
     add_function_test(TestNoise, "test_pnoise", test_pnoise, devices=devices)
     add_function_test(TestNoise, "test_curlnoise", test_curlnoise, devices=devices)
     add_function_test(TestNoise, "test_adj_noise", test_adj_noise, devices=devices)
+    add_function_test(TestNoise, "test_noise4", test_noise4, devices=devices)
 
     return TestNoise
 
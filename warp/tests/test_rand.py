@@ -78,6 +78,107 @@ def test_rand(test, device):
     err = np.max(np.abs(float_ab - float_ab_true))
     test.assertTrue(err < 1e-04)
 
+@wp.kernel
+def test_kernel_philox(
+    kernel_seed: int,
+    float4_01: wp.array(dtype=wp.vec4)):
+
+    tid = wp.tid()
+
+    state = wp.rand_init_philox(kernel_seed, 7)
+
+    float4_01[tid] = wp.randf4_philox(state, tid)
+
+def test_rand_philox(test, device):
+
+    N = 10
+
+    float4_01_device = wp.zeros(N, dtype=wp.vec4, device=device)
+    float4_01_host = wp.zeros(N, dtype=wp.vec4, device="cpu")
+
+    seed = 42
+
+    wp.launch(
+        kernel=test_kernel_philox,
+        dim=N,
+        inputs=[seed, float4_01_device],
+        outputs=[],
+        device=device
+    )
+
+    wp.copy(float4_01_host, float4_01_device)
+    wp.synchronize()
+
+    float4_01 = float4_01_host.numpy()
+
+    # reference values from Philox-4x32-10 with key (42, 0) and counter (tid, 7, 0, 0)
+    float4_01_true = np.array([[0.77173424, 0.40588152, 0.75006104, 0.6321694 ],
+                               [0.8610071 , 0.1807546 , 0.27474624, 0.7791871 ],
+                               [0.14944535, 0.99623084, 0.01683027, 0.5928562 ],
+                               [0.0756647 , 0.386293  , 0.04309011, 0.9341687 ],
+                               [0.6377505 , 0.7191208 , 0.6773714 , 0.60427296],
+                               [0.5171472 , 0.23712808, 0.18259412, 0.5487598 ],
+                               [0.857725  , 0.33270556, 0.35587806, 0.38963193],
+                               [0.32519716, 0.6911451 , 0.82120764, 0.7506724 ],
+                               [0.76959586, 0.4632932 , 0.81844985, 0.70124954],
+                               [0.6846217 , 0.62030774, 0.28474844, 0.2404809 ]])
+
+    err = np.max(np.abs(float4_01 - float4_01_true))
+    test.assertTrue(err < 1e-04)
+
+@wp.kernel
+def test_kernel_taus(
+    kernel_seed: int,
+    float4_01: wp.array(dtype=wp.vec4)):
+
+    tid = wp.tid()
+
+    state = wp.rand_init_taus(kernel_seed, tid)
+
+    a = wp.randf_taus(state)
+    b = wp.randf_taus(state)
+    c = wp.randf_taus(state)
+    d = wp.randf_taus(state)
+
+    float4_01[tid] = wp.vec4(a, b, c, d)
+
+def test_rand_taus(test, device):
+
+    N = 10
+
+    float4_01_device = wp.zeros(N, dtype=wp.vec4, device=device)
+    float4_01_host = wp.zeros(N, dtype=wp.vec4, device="cpu")
+
+    seed = 42
+
+    wp.launch(
+        kernel=test_kernel_taus,
+        dim=N,
+        inputs=[seed, float4_01_device],
+        outputs=[],
+        device=device
+    )
+
+    wp.copy(float4_01_host, float4_01_device)
+    wp.synchronize()
+
+    float4_01 = float4_01_host.numpy()
+
+    # reference values from the first four draws of the combined Tausworthe generator seeded with rand_init(42, tid)
+    float4_01_true = np.array([[0.48392475, 0.967175  , 0.29995334, 0.88980603],
+                               [0.9731389 , 0.39171565, 0.49842012, 0.33650887],
+                               [0.43996787, 0.6795387 , 0.2427032 , 0.00503612],
+                               [0.06721818, 0.27366853, 0.8257824 , 0.18746269],
+                               [0.5444076 , 0.46259022, 0.21911788, 0.9046823 ],
+                               [0.36583197, 0.5744592 , 0.21155381, 0.19562662],
+                               [0.70805144, 0.5207586 , 0.23048925, 0.62531877],
+                               [0.4076302 , 0.4106995 , 0.8967433 , 0.15742707],
+                               [0.67753077, 0.02611148, 0.9650785 , 0.39260566],
+                               [0.9911467 , 0.50866985, 0.9318855 , 0.5104177 ]])
+
+    err = np.max(np.abs(float4_01 - float4_01_true))
+    test.assertTrue(err < 1e-04)
+
 def register(parent):
 
     devices = wp.get_devices()
@@ -86,6 +187,8 @@ def register(parent):
         pass
 
     add_function_test(TestNoise, "test_rand", test_rand, devices=devices)
+    add_function_test(TestNoise, "test_rand_philox", test_rand_philox, devices=devices)
+    add_function_test(TestNoise, "test_rand_taus", test_rand_taus, devices=devices)
 
     return TestNoise
 
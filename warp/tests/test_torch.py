@@ -13,8 +13,9 @@ import torch
 
 import warp as wp
 import warp.torch
+from warp.tests.test_base import *
 
-device = "cuda"
+import unittest
 
 wp.init()
 
@@ -41,11 +42,13 @@ class TestFunc(torch.autograd.Function):
         ctx.x = x
         ctx.y = y
 
+        device = x.device.type
+
         wp.launch(
             kernel=test_kernel, 
             dim=len(x), 
-            inputs=[wp.torch.from_torch(x)], 
-            outputs=[wp.torch.from_torch(y)], 
+            inputs=[wp.from_torch(x)], 
+            outputs=[wp.from_torch(y)], 
             device=device)
 
         return y
@@ -57,17 +60,19 @@ class TestFunc(torch.autograd.Function):
         adj_x = torch.zeros_like(ctx.x).contiguous()
         adj_y = adj_y.contiguous()
 
+        device = ctx.x.device.type
+
         wp.launch(
             kernel=test_kernel, 
             dim=len(ctx.x), 
 
             # fwd inputs
-            inputs=[wp.torch.from_torch(ctx.x)],
+            inputs=[wp.from_torch(ctx.x)],
             outputs=[None], 
 
             # adj inputs
-            adj_inputs=[wp.torch.from_torch(adj_x)],
-            adj_outputs=[wp.torch.from_torch(adj_y)],
+            adj_inputs=[wp.from_torch(adj_x)],
+            adj_outputs=[wp.from_torch(adj_y)],
 
             device=device,
             adjoint=True)
@@ -75,28 +80,102 @@ class TestFunc(torch.autograd.Function):
         return adj_x
 
 
-a = wp.array(np.ones(10), dtype=wp.float32, device="cuda")
-print(a)
-print(a.ptr)
+def test_torch_autograd(test, device):
+
+    a = wp.array(np.ones(10), dtype=wp.float32, device=device)
+    t = wp.to_torch(a)
+
+    test.assertEqual(a.ptr, t.data_ptr())
+
+    # input data
+    x = torch.ones(16, dtype=torch.float32, device=device, requires_grad=True).contiguous()
+
+    # execute op
+    y = TestFunc.apply(x)
+
+    # compute grads
+    l = y.sum()
+    l.backward()
+
+    test.assertTrue((x.grad == -2.0).all())
+
+
+def test_from_torch_float16(test, device):
+
+    t = torch.ones(8, dtype=torch.float16, device=device)
+    a = wp.from_torch(t)
+
+    test.assertEqual(a.dtype, wp.float16)
+    test.assertEqual(a.shape, (8,))
+    test.assertEqual(a.ptr, t.data_ptr())
+
+
+def test_from_torch_int32(test, device):
+
+    t = torch.arange(8, dtype=torch.int32, device=device)
+    a = wp.from_torch(t)
+
+    test.assertEqual(a.dtype, wp.int32)
+    test.assertEqual(a.shape, (8,))
+    assert_np_equal(a.numpy(), np.arange(8, dtype=np.int32))
+
+
+def test_from_torch_transform(test, device):
+
+    n = 5
+
+    # trailing dimension consumed by the dtype
+    t = torch.rand((n, 7), dtype=torch.float32, device=device)
+    a = wp.from_torch(t, dtype=wp.transform)
+
+    test.assertEqual(a.dtype, wp.transform)
+    test.assertEqual(a.shape, (n,))
+    test.assertEqual(a.ptr, t.data_ptr())
+    assert_np_equal(a.numpy(), t.cpu().numpy())
+
+    # flat tensor split into elements
+    t = torch.rand(n*7, dtype=torch.float32, device=device)
+    a = wp.from_torch(t, dtype=wp.transform)
+
+    test.assertEqual(a.dtype, wp.transform)
+    test.assertEqual(a.shape, (n,))
+    assert_np_equal(a.numpy(), t.cpu().numpy().reshape((n, 7)))
+
+
+def test_from_torch_type_mismatch(test, device):
+
+    t = torch.ones((4, 3), dtype=torch.int32, device=device)
+
+    with test.assertRaises(RuntimeError):
+        wp.from_torch(t, dtype=wp.vec3)
+
+    t = torch.ones(4, dtype=torch.float64, device=device)
+
+    with test.assertRaises(RuntimeError):
+        wp.from_torch(t, dtype=wp.float32)
+
+    # same storage ctype, different scalar types
+    t = torch.ones(4, dtype=torch.float16, device=device)
+
+    with test.assertRaises(RuntimeError):
+        wp.from_torch(t, dtype=wp.uint16)
 
-t = wp.torch.to_torch(a)
-print(t)
-print(t.data_ptr())
 
-assert(a.ptr == t.data_ptr())
+def register(parent):
 
-# input data
-x = torch.ones(16, dtype=torch.float32, device=device, requires_grad=True).contiguous()
+    devices = wp.get_devices()
 
-# execute op
-y = TestFunc.apply(x)
+    class TestTorch(parent):
+        pass
 
-# compute grads
-l = y.sum()
-l.backward()
+    add_function_test(TestTorch, "test_torch_autograd", test_torch_autograd, devices=devices)
+    add_function_test(TestTorch, "test_from_torch_float16", test_from_torch_float16, devices=devices)
+    add_function_test(TestTorch, "test_from_torch_int32", test_from_torch_int32, devices=devices)
+    add_function_test(TestTorch, "test_from_torch_transform", test_from_torch_transform, devices=devices)
+    add_function_test(TestTorch, "test_from_torch_type_mismatch", test_from_torch_type_mismatch, devices=devices)
 
-print(f"y = {y}")
-print(f"x.grad = {x.grad}")
+    return TestTorch
 
-passed = (x.grad == -2.0).all()
-print(f"Test passed: {passed.item()}")
\ No newline at end of file
+if __name__ == '__main__':
+    c = register(unittest.TestCase)
+    unittest.main(verbosity=2)
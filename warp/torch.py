@@ -10,21 +10,74 @@ import torch
 import numpy
 
 
+# torch dtypes that can be aliased by Warp arrays, mapped to the matching Warp scalar type
+_torch_to_warp_dtype = {
+    torch.float64: warp.types.float64,
+    torch.float32: warp.types.float32,
+    torch.float16: warp.types.float16,
+    torch.int64: warp.types.int64,
+    torch.int32: warp.types.int32,
+    torch.int16: warp.types.int16,
+    torch.int8: warp.types.int8,
+    torch.uint8: warp.types.uint8,
+}
+
 # wrap a torch tensor to a wp array, data is not copied
-def from_torch(t, dtype=warp.types.float32):
+def from_torch(t, dtype=None):
+    """Wrap a PyTorch tensor to a Warp array without copying the data
+
+    Args:
+        t: The contiguous tensor to wrap
+        dtype: The Warp type of the array elements, e.g.: :class:`warp.vec3` to view an (n, 3) tensor as n vectors,
+            defaults to the scalar type matching the tensor dtype, the scalar type of dtype must match the tensor
+
+    Returns:
+        A warp.array that aliases the tensor memory
+    """
+
     # ensure tensors are contiguous
     assert(t.is_contiguous())
 
-    # placeholder for warp.types.float16
-    assert dtype == warp.types.float32 or dtype == warp.types.float32, "Warp arrays can be constructed as wp.float32 only"
+    if (t.dtype not in _torch_to_warp_dtype):
+        raise RuntimeError(f"Error aliasing Torch tensor to Warp array. Torch tensor type {t.dtype} is not supported")
+
+    scalar_type = _torch_to_warp_dtype[t.dtype]
+    shape = tuple(t.shape)
+
+    if (dtype == None):
+        dtype = scalar_type
+    elif (dtype == float):
+        dtype = warp.types.float32
+    elif (dtype == int):
+        dtype = warp.types.int32
+
+    # vector and matrix types are built from float32 components, compare the Warp scalar types
+    # rather than their ctypes since e.g.: float16 and uint16 are both stored as c_uint16
+    if (dtype in warp.types.vector_types):
+        dtype_scalar_type = warp.types.float32
+    else:
+        dtype_scalar_type = dtype
+
+    if (dtype_scalar_type != scalar_type):
+        raise RuntimeError(f"Error aliasing Torch tensor to Warp array. Torch tensor type {t.dtype} does not match the scalar type of {dtype}")
+
+    # vector and matrix types consume the trailing dimensions of the tensor, a flat
+    # tensor is viewed as a sequence of elements like when constructing arrays from data
+    if hasattr(dtype, "_shape_"):
+
+        dtype_ndim = len(dtype._shape_)
 
-    if (t.dtype != torch.float32 and t.dtype != torch.int32):
-        raise RuntimeError("Error aliasing Torch tensor to Warp array. Torch tensor must be float32 or int32 type")
+        if (len(shape) == 1 and shape[0] % dtype._length_ == 0):
+            shape = (shape[0]//dtype._length_,)
+        elif (shape[-dtype_ndim:] == dtype._shape_):
+            shape = shape[0:-dtype_ndim]
+        else:
+            raise RuntimeError(f"Error aliasing Torch tensor to Warp array. Last dimensions of the tensor shape {shape} should match the dtype shape {dtype._shape_}")
 
     a = warp.types.array(
         ptr=t.data_ptr(),
         dtype=dtype,
-        shape=t.shape,
+        shape=shape,
         copy=False,
         owner=False,
         requires_grad=True,
@@ -42,7 +95,9 @@ def to_torch(a):
         # that support the __array_interface__ protocol
         # in this case we need to workaround by going
         # to an ndarray first, see https://pearu.github.io/array_interface_pytorch.html
-        return torch.as_tensor(numpy.asarray(a))
+        # the ndarray is a view of the Warp allocation that keeps a reference to the
+        # array, and torch.from_numpy() always aliases it rather than copying
+        return torch.from_numpy(numpy.asarray(a))
 
     elif a.device == "cuda":
         # Torch does support the __cuda_array_interface__
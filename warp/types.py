@@ -6,13 +6,14 @@
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 
 import ctypes 
+import functools
 import hashlib
 import inspect
 import struct
 import zlib
 import numpy as np
 
-from typing import Tuple
+from typing import Tuple, Any
 
 
 
@@ -125,6 +126,14 @@ class void:
     def __init__(self):
         pass
 
+class float16:
+
+    _length_ = 1
+    _type_ = ctypes.c_uint16
+
+    def __init__(self, x=0.0):
+        self.value = x
+
 class float32:
 
     _length_ = 1
@@ -206,7 +215,7 @@ class uint64:
         self.value = x
 
                
-scalar_types = [int8, uint8, int16, uint16, int32, uint32, int64, uint64, float32, float64]
+scalar_types = [int8, uint8, int16, uint16, int32, uint32, int64, uint64, float16, float32, float64]
 vector_types = [vec2, vec3, vec4, mat22, mat33, mat44, quat, transform, spatial_vector, spatial_matrix]
 
 
@@ -222,6 +231,7 @@ np_dtype_to_warp_type = {
     np.dtype(np.uint64): uint64,
     np.dtype(np.byte): int8,
     np.dtype(np.ubyte): uint8,
+    np.dtype(np.float16): float16,
     np.dtype(np.float32): float32,
     np.dtype(np.float64): float64
 }
@@ -244,6 +254,26 @@ class hash_grid_query_t:
     def __init__(self):
         pass
 
+# definition just for kernel type (cannot be a parameter), see rand.h
+class philox_state_t:
+
+    def __init__(self):
+        pass
+
+# definition just for kernel type (cannot be a parameter), see rand.h
+class taus_state_t:
+
+    def __init__(self):
+        pass
+
+# compressed triangle, raw storage for a float32 base vertex followed by two float16 edges (24 bytes),
+# build values with wp.pack_triangle() inside a kernel, see intersect.h
+class rt_triangle_t(ctypes.Array):
+
+    _length_ = 12
+    _shape_ = (12,)
+    _type_ = ctypes.c_uint16
+
 # maximum number of dimensions
 ARRAY_MAX_DIMS = 4
 LAUNCH_MAX_DIMS = 4
@@ -295,6 +325,8 @@ def type_length(dtype):
     else:
         return dtype._length_
 
+# called for every allocation and copy, dtypes are classes so results can be cached
+@functools.lru_cache(maxsize=None)
 def type_size_in_bytes(dtype):
     if (dtype == float or dtype == int):
         return 4
@@ -309,8 +341,14 @@ def type_ctype(dtype):
     else:
         return dtype._type_
 
-def type_typestr(ctype):
-   
+def type_typestr(dtype):
+
+    # float16 is stored as raw bits, so it cannot be identified by its ctype
+    if (dtype == float16):
+        return "<f2"
+
+    ctype = type_ctype(dtype)
+
     if (ctype == ctypes.c_float):
         return "<f4"
     elif (ctype == ctypes.c_double):
@@ -439,7 +477,7 @@ class array:
 
             try:
                 # try to convert src array to destination type
-                arr = arr.astype(dtype=type_typestr(dtype._type_))
+                arr = arr.astype(dtype=type_typestr(dtype))
             except:
                 raise RuntimeError(f"Could not convert input data with type {arr.dtype} to array with type {dtype._type_}")
             
@@ -527,6 +565,9 @@ class array:
         else:
             self.ndim = ndim
 
+        # size of a single element in bytes, generic arrays (dtype=Any) only appear in builtin signatures
+        self.itemsize = type_size_in_bytes(self.dtype) if self.dtype != Any else 0
+
         # update size (num elements)
         self.size = 1
         for d in self.shape:
@@ -536,8 +577,8 @@ class array:
         self.requires_grad = requires_grad
 
         # store flat shape (including type shape)
-        if dtype in vector_types:
-            # vector type, flatten the dimensions into one tuple
+        if hasattr(dtype, "_shape_"):
+            # vector or packed type, flatten the dimensions into one tuple
             arr_shape = (*self.shape, *self.dtype._shape_)
         else:
             # scalar type
@@ -549,7 +590,7 @@ class array:
             self.__array_interface__ = { 
                 "data": (self.ptr, False), 
                 "shape": arr_shape,  
-                "typestr": type_typestr(type_ctype(self.dtype)), 
+                "typestr": type_typestr(self.dtype), 
                 "version": 3 
             }
 
@@ -559,7 +600,7 @@ class array:
             self.__cuda_array_interface__ = {
                 "data": (self.ptr, False),
                 "shape": arr_shape,
-                "typestr": type_typestr(type_ctype(self.dtype)),
+                "typestr": type_typestr(self.dtype),
                 "version": 2
             }
 
@@ -615,10 +656,10 @@ class array:
         from warp.context import runtime
 
         if (self.device == "cpu"):
-            runtime.core.memset_host(ctypes.cast(self.ptr,ctypes.POINTER(ctypes.c_int)), ctypes.c_int(0), ctypes.c_size_t(self.size*type_size_in_bytes(self.dtype)))
+            runtime.core.memset_host(self.ptr, 0, self.size*self.itemsize)
 
         if(self.device == "cuda"):
-            runtime.core.memset_device(ctypes.cast(self.ptr,ctypes.POINTER(ctypes.c_int)), ctypes.c_int(0), ctypes.c_size_t(self.size*type_size_in_bytes(self.dtype)))
+            runtime.core.memset_device(self.ptr, 0, self.size*self.itemsize)
 
 
     # equivalent to wrapping src data in an array and copying to self